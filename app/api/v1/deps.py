@@ -0,0 +1,30 @@
+from fastapi import HTTPException, Query, status
+
+from app.domain.schemas.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    MAX_PAGE_LIMIT,
+    PageRequest,
+)
+from app.domain.schemas.reviews import ReviewFilter
+
+
+def get_page_request(
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT, description="Tamaño de la página"),
+    cursor: str | None = Query(None, description="Cursor opaco devuelto como next_cursor en la página anterior"),
+) -> PageRequest:
+    """Dependency común a los listados paginados por cursor."""
+    try:
+        return PageRequest.from_cursor(limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+
+def get_review_filter(
+    min_rating: int | None = Query(None, ge=1, le=5, description="Calificación mínima (dimensión principal)"),
+    max_rating: int | None = Query(None, ge=1, le=5, description="Calificación máxima (dimensión principal)"),
+    has_comment: bool | None = Query(None, description="True = solo con comentario, False = solo sin comentario"),
+) -> ReviewFilter:
+    """Dependency común a los feeds de reseñas."""
+    if min_rating is not None and max_rating is not None and min_rating > max_rating:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="min_rating no puede ser mayor que max_rating")
+    return ReviewFilter(min_rating=min_rating, max_rating=max_rating, has_comment=has_comment)
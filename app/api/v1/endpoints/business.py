@@ -1,8 +1,9 @@
 import uuid
 
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Header, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1.deps import get_page_request
 from app.application.command.Business import BusinessCommands
 from app.application.query.Business import BusinessQueries
 from app.domain.schemas.business import (
@@ -13,9 +14,11 @@ from app.domain.schemas.business import (
     BusinessRead,
     BusinessUpdate,
 )
+from app.domain.schemas.pagination import Page, PageRequest
+from app.domain.schemas.storefront import StorefrontMenu
 
 # Importación corregida a get_session
-from app.infrastructure.database.database import get_session
+from app.infrastructure.database.database import get_read_session, get_session
 
 router = APIRouter()
 
@@ -23,26 +26,56 @@ router = APIRouter()
 # QUERIES (Lecturas - GET)
 # ==========================================
 
-@router.get("/", response_model=list[BusinessRead], status_code=status.HTTP_200_OK)
-async def list_all_businesses(db: AsyncSession = Depends(get_session)): # Corregido aquí
-    """Lista todos los negocios registrados en la plataforma."""
+@router.get("/", response_model=Page[BusinessRead], status_code=status.HTTP_200_OK)
+async def list_all_businesses(
+    page: PageRequest = Depends(get_page_request),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """Lista los negocios registrados en la plataforma, paginados por cursor."""
     queries = BusinessQueries(db)
-    return await queries.list_all_businesses()
+    return await queries.list_all_businesses(page)
 
 @router.get("/owner/{owner_id}", response_model=list[BusinessRead], status_code=status.HTTP_200_OK)
-async def get_businesses_by_owner(owner_id: uuid.UUID, db: AsyncSession = Depends(get_session)): # Corregido aquí
+async def get_businesses_by_owner(owner_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)): # Corregido aquí
     """Obtiene todos los negocios que pertenecen a un administrador específico."""
     queries = BusinessQueries(db)
     return await queries.get_owner_businesses(owner_id)
 
 @router.get("/store/{slug}", response_model=BusinessRead, status_code=status.HTTP_200_OK)
-async def get_business_by_slug(slug: str, db: AsyncSession = Depends(get_session)): # Corregido aquí
+async def get_business_by_slug(slug: str, db: AsyncSession = Depends(get_read_session)): # Corregido aquí
     """Busca un negocio por su slug único (Ideal para cargar la tienda en el frontend)."""
     queries = BusinessQueries(db)
     return await queries.get_business_by_slug(slug)
 
+@router.get(
+    "/{slug}/menu",
+    status_code=status.HTTP_200_OK,
+    responses={200: {"model": StorefrontMenu}, 304: {"description": "El menú no cambió (ETag vigente)"}},
+)
+async def get_storefront_menu(
+    slug: str,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Devuelve en un solo documento la marca del negocio, sus categorías, productos y el
+    stock de hoy. Responde 304 si el ETag enviado en If-None-Match sigue vigente.
+    """
+    # Primario: una réplica con retraso dejaría un menú obsoleto en caché hasta el TTL
+    queries = BusinessQueries(db)
+    menu = await queries.get_storefront_menu(slug)
+    headers = {"ETag": menu.etag, "Cache-Control": "no-cache"}
+    if if_none_match and _etag_matches(if_none_match, menu.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=menu.body, media_type="application/json", headers=headers)
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Compara If-None-Match (puede traer varios ETags, débiles o '*') con el actual."""
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
 @router.get("/{business_id}", response_model=BusinessRead, status_code=status.HTTP_200_OK)
-async def get_business_by_id(business_id: uuid.UUID, db: AsyncSession = Depends(get_session)): # Corregido aquí
+async def get_business_by_id(business_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)): # Corregido aquí
     """Obtiene los detalles de un negocio por su ID interno."""
     queries = BusinessQueries(db)
     return await queries.get_business(business_id)
@@ -83,7 +116,7 @@ async def delete_business(business_id: uuid.UUID, db: AsyncSession = Depends(get
 
 
 @router.get("/{business_id}/hours", response_model=list[BusinessHourRead], status_code=status.HTTP_200_OK)
-async def get_business_hours(business_id: uuid.UUID, db: AsyncSession = Depends(get_session)):
+async def get_business_hours(business_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)):
     """Obtiene todos los horarios configurados para un negocio, ordenados por día."""
     queries = BusinessQueries(db)
     return await queries.get_business_hours(business_id)
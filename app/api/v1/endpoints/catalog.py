@@ -18,7 +18,7 @@ from app.domain.schemas.category import (
 )
 
 # Dependencia de la base de datos
-from app.infrastructure.database.database import get_session
+from app.infrastructure.database.database import get_read_session, get_session
 
 router = APIRouter()
 
@@ -27,13 +27,13 @@ router = APIRouter()
 # ==========================================
 
 @router.get("/categories/business/{business_id}", response_model=list[CategoryRead], status_code=status.HTTP_200_OK)
-async def get_categories_by_business(business_id: uuid.UUID, db: AsyncSession = Depends(get_session)):
+async def get_categories_by_business(business_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)):
     """Lista todas las categorías de un negocio (el menú principal)."""
     queries = CatalogQueries(db)
     return await queries.get_categories_by_business(business_id)
 
 @router.get("/categories/{category_id}", response_model=CategoryRead, status_code=status.HTTP_200_OK)
-async def get_category(category_id: uuid.UUID, db: AsyncSession = Depends(get_session)):
+async def get_category(category_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)):
     """Obtiene los detalles de una categoría específica."""
     queries = CatalogQueries(db)
     return await queries.get_category(category_id)
@@ -63,19 +63,19 @@ async def delete_category(category_id: uuid.UUID, db: AsyncSession = Depends(get
 # ==========================================
 
 @router.get("/items/business/{business_id}", response_model=list[ItemRead], status_code=status.HTTP_200_OK)
-async def get_items_by_business(business_id: uuid.UUID, db: AsyncSession = Depends(get_session)):
+async def get_items_by_business(business_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)):
     """Lista el catálogo completo de productos/servicios de un negocio."""
     queries = CatalogQueries(db)
     return await queries.get_items_by_business(business_id)
 
 @router.get("/items/category/{category_id}", response_model=list[ItemRead], status_code=status.HTTP_200_OK)
-async def get_items_by_category(category_id: uuid.UUID, db: AsyncSession = Depends(get_session)):
+async def get_items_by_category(category_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)):
     """Filtra los productos/servicios que pertenecen a una categoría."""
     queries = CatalogQueries(db)
     return await queries.get_items_by_category(category_id)
 
 @router.get("/items/{item_id}", response_model=ItemRead, status_code=status.HTTP_200_OK)
-async def get_item(item_id: uuid.UUID, db: AsyncSession = Depends(get_session)):
+async def get_item(item_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)):
     """Obtiene el detalle de un producto o servicio."""
     queries = CatalogQueries(db)
     return await queries.get_item(item_id)
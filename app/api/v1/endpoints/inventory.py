@@ -10,10 +10,27 @@ from app.application.command.Inventory import InventoryCommands
 from app.application.query.Inventory import InventoryQueries
 
 # Schemas
-from app.domain.schemas.inventory import InventoryCreate, InventoryRead, InventoryUpdate
+from app.core.config import settings
+from app.domain.schemas.inventory import (
+    MAX_MATRIX_DAYS,
+    MAX_PLAN_DAYS,
+    AvailabilityMatrix,
+    BulkStockResult,
+    BulkStockUpsert,
+    CartValidationRequest,
+    CartValidationResult,
+    InventoryCreate,
+    InventoryRead,
+    InventoryTemplateRead,
+    InventoryTemplateSet,
+    InventoryUpdate,
+    MaterializeResult,
+    ProductionPlan,
+    StockRangeUpsert,
+)
 
 # Dependencia de la base de datos
-from app.infrastructure.database.database import get_session
+from app.infrastructure.database.database import get_read_session, get_session
 
 router = APIRouter()
 
@@ -22,23 +39,51 @@ router = APIRouter()
 # ==========================================
 
 @router.get("/history/{item_id}", response_model=list[InventoryRead], status_code=status.HTTP_200_OK)
-async def get_item_history(item_id: uuid.UUID, db: AsyncSession = Depends(get_session)):
+async def get_item_history(item_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)):
     """Obtiene todo el historial de inventario de un producto (del más reciente al más antiguo)."""
     queries = InventoryQueries(db)
     return await queries.get_item_history(item_id)
 
 @router.get("/stock/{item_id}/{target_date}", response_model=InventoryRead, status_code=status.HTTP_200_OK)
-async def get_stock_for_date(item_id: uuid.UUID, target_date: date, db: AsyncSession = Depends(get_session)):
+async def get_stock_for_date(item_id: uuid.UUID, target_date: date, db: AsyncSession = Depends(get_read_session)):
     """Obtiene el registro exacto de stock de un producto para una fecha en particular."""
     queries = InventoryQueries(db)
     return await queries.get_stock_for_date(item_id, target_date)
 
+@router.get("/matrix/business/{business_id}", response_model=AvailabilityMatrix, status_code=status.HTTP_200_OK)
+async def get_availability_matrix(
+    business_id: uuid.UUID,
+    date_from: date | None = Query(None, description="Primer día (por defecto, hoy)"),
+    days: int = Query(7, ge=1, le=MAX_MATRIX_DAYS),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """
+    Stock de todos los productos del negocio durante `days` días en formato columnar:
+    available[i][j] corresponde a item_ids[i] en dates[j].
+    """
+    queries = InventoryQueries(db)
+    return await queries.get_availability_matrix(business_id, date_from or date.today(), days)
+
+@router.get("/planning/business/{business_id}", response_model=ProductionPlan, status_code=status.HTTP_200_OK)
+async def get_production_plan(
+    business_id: uuid.UUID,
+    date_from: date | None = Query(None, description="Primer día (por defecto, hoy)"),
+    days: int = Query(7, ge=1, le=MAX_PLAN_DAYS),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """
+    Planificación de cocina: cantidad requerida por producto y día (pedidos confirmados +
+    suscripciones proyectadas) y diferencia (gap) frente a la producción registrada.
+    """
+    queries = InventoryQueries(db)
+    return await queries.get_production_plan(business_id, date_from or date.today(), days)
+
 @router.get("/availability", status_code=status.HTTP_200_OK)
 async def check_availability(
     item_id: uuid.UUID = Query(...), 
     target_date: date = Query(...), 
     requested_qty: int = Query(...) ,
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ) -> dict[str, Any]:
     """
     Verifica si hay stock suficiente para cubrir una venta.
@@ -47,8 +92,23 @@ async def check_availability(
     queries = InventoryQueries(db)
     return await queries.check_item_availability(item_id, target_date, requested_qty)
 
+@router.post("/availability/batch", response_model=CartValidationResult, status_code=status.HTTP_200_OK)
+async def validate_cart(cart: CartValidationRequest, db: AsyncSession = Depends(get_read_session)):
+    """
+    Valida el carrito completo (productos, precios y stock por día) en una sola consulta
+    y devuelve el resultado por línea y el total. Es una lectura: no reserva stock.
+    """
+    queries = InventoryQueries(db)
+    return await queries.validate_cart(cart)
+
+@router.get("/templates/{item_id}", response_model=list[InventoryTemplateRead], status_code=status.HTTP_200_OK)
+async def get_item_templates(item_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)):
+    """Obtiene la plantilla semanal de producción de un producto."""
+    queries = InventoryQueries(db)
+    return await queries.get_item_templates(item_id)
+
 @router.get("/{inventory_id}", response_model=InventoryRead, status_code=status.HTTP_200_OK)
-async def get_inventory_record(inventory_id: uuid.UUID, db: AsyncSession = Depends(get_session)):
+async def get_inventory_record(inventory_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)):
     """Obtiene un registro específico de inventario por su ID interno."""
     queries = InventoryQueries(db)
     return await queries.get_inventory_record(inventory_id)
@@ -81,6 +141,39 @@ async def set_daily_stock(
     commands = InventoryCommands(db)
     return await commands.set_stock(item_id, target_date, quantity)
 
+@router.put("/set-stock/bulk", response_model=BulkStockResult, status_code=status.HTTP_200_OK)
+async def bulk_set_daily_stock(data: BulkStockUpsert, db: AsyncSession = Depends(get_session)):
+    """
+    Upsert masivo: fija el stock de muchos (producto, día) en una sola transacción.
+    Devuelve cuántos registros se crearon y cuántos se actualizaron.
+    """
+    commands = InventoryCommands(db)
+    return await commands.bulk_set_stock(data)
+
+@router.put("/set-stock/range", response_model=BulkStockResult, status_code=status.HTTP_200_OK)
+async def set_stock_for_range(data: StockRangeUpsert, db: AsyncSession = Depends(get_session)):
+    """Fija la misma cantidad para varios productos en todos los días de un rango de fechas."""
+    commands = InventoryCommands(db)
+    return await commands.set_stock_range(data)
+
+@router.put("/templates/{item_id}", response_model=list[InventoryTemplateRead], status_code=status.HTTP_200_OK)
+async def set_item_templates(item_id: uuid.UUID, data: InventoryTemplateSet, db: AsyncSession = Depends(get_session)):
+    """
+    Define la producción habitual de un producto por día de la semana.
+    Un job crea con antelación el stock diario a partir de esta plantilla.
+    """
+    commands = InventoryCommands(db)
+    return await commands.set_templates(item_id, data)
+
+@router.post("/templates/materialize", response_model=MaterializeResult, status_code=status.HTTP_200_OK)
+async def materialize_templates(
+    days_ahead: int = Query(settings.INVENTORY_TEMPLATES_DAYS_AHEAD, ge=1, le=92),
+    db: AsyncSession = Depends(get_session)
+):
+    """Ejecuta a demanda la materialización de plantillas (el job lo hace periódicamente)."""
+    commands = InventoryCommands(db)
+    return await commands.materialize_templates(days_ahead)
+
 @router.patch("/{inventory_id}", response_model=InventoryRead, status_code=status.HTTP_200_OK)
 async def update_inventory(
     inventory_id: uuid.UUID, 
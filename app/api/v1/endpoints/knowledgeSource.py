@@ -10,7 +10,7 @@ from app.domain.schemas.knowledge import (
     KnowledgeSourceRead,
     KnowledgeSourceUpdate,
 )
-from app.infrastructure.database.database import get_session
+from app.infrastructure.database.database import get_read_session, get_session
 
 router = APIRouter()
 
@@ -19,14 +19,14 @@ router = APIRouter()
 async def list_business_knowledge(
     business_id: uuid.UUID, 
     active_only: bool = Query(True),
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     """Obtiene todos los documentos y enlaces con los que se entrena al bot de un negocio."""
     queries = KnowledgeQueries(db)
     return await queries.get_business_knowledge(business_id, active_only)
 
 @router.get("/{source_id}", response_model=KnowledgeSourceRead)
-async def get_knowledge_source(source_id: uuid.UUID, db: AsyncSession = Depends(get_session)):
+async def get_knowledge_source(source_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)):
     queries = KnowledgeQueries(db)
     return await queries.get_source(source_id)
 
@@ -1,13 +1,22 @@
 import uuid
+from datetime import date
 
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1.deps import get_page_request
+from app.api.v1.export import ExportFormat, export_response
 from app.application.command.Order import OrderCommands
 from app.application.query.Order import OrderQueries
 from app.domain.models.models import OrderStatus
-from app.domain.schemas.orders import OrderCreate, OrderRead, OrderStatusUpdate
-from app.infrastructure.database.database import get_session
+from app.domain.schemas.orders import (
+    ORDER_EXPORT_FIELDS,
+    OrderCreate,
+    OrderRead,
+    OrderStatusUpdate,
+)
+from app.domain.schemas.pagination import Page, PageRequest
+from app.infrastructure.database.database import get_read_session, get_session
 
 router = APIRouter()
 
@@ -15,24 +24,43 @@ router = APIRouter()
 # QUERIES (Lecturas - GET)
 # ==========================================
 
-@router.get("/business/{business_id}", response_model=list[OrderRead], status_code=status.HTTP_200_OK)
+@router.get("/business/{business_id}", response_model=Page[OrderRead], status_code=status.HTTP_200_OK)
 async def get_orders_by_business(
     business_id: uuid.UUID, 
     status_filter: OrderStatus | None = Query(None, description="Filtrar por estado del pedido"),
-    db: AsyncSession = Depends(get_session)
+    page: PageRequest = Depends(get_page_request),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """Lista pedidos de un negocio, paginados por cursor. Opcionalmente filtrables por estado (ej. PENDING)."""
+    queries = OrderQueries(db)
+    return await queries.get_business_orders(business_id, page, status_filter)
+
+@router.get("/business/{business_id}/export", status_code=status.HTTP_200_OK)
+async def export_orders_by_business(
+    business_id: uuid.UUID,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    date_from: date | None = Query(None, description="Desde este día (incluido)"),
+    date_to: date | None = Query(None, description="Hasta este día (incluido)"),
+    status_filter: OrderStatus | None = Query(None, description="Filtrar por estado del pedido"),
+    db: AsyncSession = Depends(get_read_session)
 ):
-    """Lista pedidos de un negocio. Opcionalmente filtrables por estado (ej. PENDING)."""
+    """Exporta el historial de pedidos de un negocio como CSV o NDJSON, transmitido en streaming."""
     queries = OrderQueries(db)
-    return await queries.get_business_orders(business_id, status_filter)
+    rows = queries.export_business_orders(business_id, date_from, date_to, status_filter)
+    return export_response(rows, ORDER_EXPORT_FIELDS, export_format, f"orders-{business_id}")
 
-@router.get("/user/{user_id}", response_model=list[OrderRead], status_code=status.HTTP_200_OK)
-async def get_orders_by_user(user_id: uuid.UUID, db: AsyncSession = Depends(get_session)):
-    """Historial completo de compras de un cliente específico."""
+@router.get("/user/{user_id}", response_model=Page[OrderRead], status_code=status.HTTP_200_OK)
+async def get_orders_by_user(
+    user_id: uuid.UUID,
+    page: PageRequest = Depends(get_page_request),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """Historial de compras de un cliente específico, paginado por cursor."""
     queries = OrderQueries(db)
-    return await queries.get_user_orders(user_id)
+    return await queries.get_user_orders(user_id, page)
 
 @router.get("/{order_id}", response_model=OrderRead, status_code=status.HTTP_200_OK)
-async def get_order(order_id: uuid.UUID, db: AsyncSession = Depends(get_session)):
+async def get_order(order_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)):
     """Obtiene el detalle completo de un pedido, incluyendo los productos comprados."""
     queries = OrderQueries(db)
     return await queries.get_order_details(order_id)
@@ -4,20 +4,29 @@ import uuid
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1.deps import get_page_request, get_review_filter
+
 # Schemas
 from app.application.command.Review import ReviewCommands
 from app.application.query.Review import ReviewQueries
+from app.domain.models.models import RatingSubject
+from app.domain.schemas.pagination import PageRequest
 from app.domain.schemas.reviews import (
+    FullReviewCreate,
+    FullReviewRead,
     ItemReviewCreate,
     ItemReviewRead,
     OrderReviewCreate,
     OrderReviewRead,
+    RatingSummary,
+    ReviewFeed,
+    ReviewFilter,
     StaffReviewCreate,
     StaffReviewRead,
 )
 
 # Dependencia de la base de datos
-from app.infrastructure.database.database import get_session
+from app.infrastructure.database.database import get_read_session, get_session
 
 router = APIRouter()
 
@@ -31,11 +40,34 @@ async def create_order_review(review_in: OrderReviewCreate, db: AsyncSession = D
     commands = ReviewCommands(db)
     return await commands.create_order_review(review_in)
 
-@router.get("/business/{business_id}", response_model=list[OrderReviewRead], status_code=status.HTTP_200_OK)
-async def get_business_reviews(business_id: uuid.UUID, db: AsyncSession = Depends(get_session)):
-    """Obtiene las reseñas generales asociadas a un negocio."""
+@router.post("/order/{order_id}/full", response_model=FullReviewRead, status_code=status.HTTP_201_CREATED)
+async def create_full_review(order_id: uuid.UUID, review_in: FullReviewCreate, db: AsyncSession = Depends(get_session)):
+    """
+    Califica en una sola llamada el pedido, cada producto y cada miembro del staff asignado.
+    Todo se guarda en una transacción: si alguna reseña ya existía (409) no se guarda ninguna.
+    """
+    commands = ReviewCommands(db)
+    return await commands.create_full_review(order_id, review_in)
+
+@router.get("/business/{business_id}/summary", response_model=RatingSummary, status_code=status.HTTP_200_OK)
+async def get_business_rating_summary(business_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)):
+    """Promedio e histograma de las calificaciones del negocio por dimensión."""
+    queries = ReviewQueries(db)
+    return await queries.get_rating_summary(RatingSubject.BUSINESS, business_id)
+
+@router.get("/business/{business_id}", response_model=ReviewFeed[OrderReviewRead], status_code=status.HTTP_200_OK)
+async def get_business_reviews(
+    business_id: uuid.UUID,
+    page: PageRequest = Depends(get_page_request),
+    filters: ReviewFilter = Depends(get_review_filter),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """
+    Obtiene las reseñas generales asociadas a un negocio, con el resumen de calificaciones.
+    Filtros: min_rating/max_rating (calificación general) y has_comment.
+    """
     queries = ReviewQueries(db)
-    return await queries.get_business_reviews(business_id)
+    return await queries.get_business_reviews(business_id, page, filters)
 
 # ==========================================
 # RUTAS DE ITEM REVIEWS (Productos/Servicios)
@@ -47,11 +79,22 @@ async def create_item_review(review_in: ItemReviewCreate, db: AsyncSession = Dep
     commands = ReviewCommands(db)
     return await commands.create_item_review(review_in)
 
-@router.get("/item/{item_id}", response_model=list[ItemReviewRead], status_code=status.HTTP_200_OK)
-async def get_item_reviews(item_id: uuid.UUID, db: AsyncSession = Depends(get_session)):
+@router.get("/item/{item_id}/summary", response_model=RatingSummary, status_code=status.HTTP_200_OK)
+async def get_item_rating_summary(item_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)):
+    """Promedio e histograma de la calidad de un producto."""
+    queries = ReviewQueries(db)
+    return await queries.get_rating_summary(RatingSubject.ITEM, item_id)
+
+@router.get("/item/{item_id}", response_model=ReviewFeed[ItemReviewRead], status_code=status.HTTP_200_OK)
+async def get_item_reviews(
+    item_id: uuid.UUID,
+    page: PageRequest = Depends(get_page_request),
+    filters: ReviewFilter = Depends(get_review_filter),
+    db: AsyncSession = Depends(get_read_session)
+):
     """Obtiene las reseñas específicas de un artículo del catálogo."""
     queries = ReviewQueries(db)
-    return await queries.get_item_reviews(item_id)
+    return await queries.get_item_reviews(item_id, page, filters)
 
 # ==========================================
 # RUTAS DE STAFF REVIEWS (Personal)
@@ -63,8 +106,19 @@ async def create_staff_review(review_in: StaffReviewCreate, db: AsyncSession = D
     commands = ReviewCommands(db)
     return await commands.create_staff_review(review_in)
 
-@router.get("/staff/{staff_id}", response_model=list[StaffReviewRead], status_code=status.HTTP_200_OK)
-async def get_staff_reviews(staff_id: uuid.UUID, db: AsyncSession = Depends(get_session)):
+@router.get("/staff/{staff_id}/summary", response_model=RatingSummary, status_code=status.HTTP_200_OK)
+async def get_staff_rating_summary(staff_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)):
+    """Promedio e histograma de la atención de un miembro del staff."""
+    queries = ReviewQueries(db)
+    return await queries.get_rating_summary(RatingSubject.STAFF, staff_id)
+
+@router.get("/staff/{staff_id}", response_model=ReviewFeed[StaffReviewRead], status_code=status.HTTP_200_OK)
+async def get_staff_reviews(
+    staff_id: uuid.UUID,
+    page: PageRequest = Depends(get_page_request),
+    filters: ReviewFilter = Depends(get_review_filter),
+    db: AsyncSession = Depends(get_read_session)
+):
     """Obtiene las calificaciones de un empleado/profesional."""
     queries = ReviewQueries(db)
-    return await queries.get_staff_reviews(staff_id)
\ No newline at end of file
+    return await queries.get_staff_reviews(staff_id, page, filters)
\ No newline at end of file
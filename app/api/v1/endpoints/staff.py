@@ -11,7 +11,7 @@ from app.application.query.Staff import StaffQueries
 from app.domain.schemas.staff import StaffCreate, StaffRead, StaffUpdate
 
 # Importamos la dependencia de base de datos correcta
-from app.infrastructure.database.database import get_session
+from app.infrastructure.database.database import get_read_session, get_session
 
 router = APIRouter()
 
@@ -22,7 +22,7 @@ router = APIRouter()
 @router.get("/{staff_id}", response_model=StaffRead, status_code=status.HTTP_200_OK)
 async def get_staff_details(
     staff_id: uuid.UUID, 
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     """Obtiene el perfil detallado de un miembro del staff."""
     queries = StaffQueries(db)
@@ -31,7 +31,7 @@ async def get_staff_details(
 @router.get("/business/{business_id}", response_model=list[StaffRead], status_code=status.HTTP_200_OK)
 async def get_staff_by_business(
     business_id: uuid.UUID, 
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
     Lista todo el personal asociado a un negocio.
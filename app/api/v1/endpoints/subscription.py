@@ -1,40 +1,72 @@
 import uuid
+from datetime import date, timedelta
 from decimal import Decimal
 
-from fastapi import APIRouter, Body, Depends, Query, status
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1.deps import get_page_request
+
 # Dependencia de la base de datos
 from app.application.command.Subscription import SubscriptionCommands
+from app.application.jobs.scheduler import run_once
+from app.application.jobs.Subscriptions import (
+    generate_subscription_orders as generate_subscription_orders_job,
+)
 from app.application.query.Subscription import SubscriptionQueries
+from app.core.config import settings
+from app.domain.schemas.pagination import Page, PageRequest
 from app.domain.schemas.suscriptions import (
     SubscriptionCreate,
+    SubscriptionMetrics,
+    SubscriptionOrdersScheduled,
     SubscriptionPaymentRead,
     SubscriptionRead,
     SubscriptionStatusUpdate,
 )
-from app.infrastructure.database.database import get_session
+from app.infrastructure.database.database import get_read_session, get_session
 
 router = APIRouter()
 
 
-@router.get("/user/{user_id}", response_model=list[SubscriptionRead], status_code=status.HTTP_200_OK)
-async def get_user_subscriptions(user_id: uuid.UUID, db: AsyncSession = Depends(get_session)):
+@router.get("/user/{user_id}", response_model=Page[SubscriptionRead], status_code=status.HTTP_200_OK)
+async def get_user_subscriptions(
+    user_id: uuid.UUID,
+    page: PageRequest = Depends(get_page_request),
+    db: AsyncSession = Depends(get_read_session)
+):
     queries = SubscriptionQueries(db)
-    return await queries.get_user_history(user_id)
+    return await queries.get_user_history(user_id, page)
 
-@router.get("/business/{business_id}", response_model=list[SubscriptionRead], status_code=status.HTTP_200_OK)
+@router.get("/business/{business_id}", response_model=Page[SubscriptionRead], status_code=status.HTTP_200_OK)
 async def get_business_subscriptions(
     business_id: uuid.UUID, 
     active_only: bool = Query(True, description="Filtrar para ver solo suscripciones activas"),
-    db: AsyncSession = Depends(get_session)
+    page: PageRequest = Depends(get_page_request),
+    db: AsyncSession = Depends(get_read_session)
 ):
-    """Lista las membresías de un negocio (Ideal para calcular entregas recurrentes y MRR)."""
+    """Lista las membresías de un negocio, paginadas por cursor. Para el MRR usa /business/{business_id}/metrics."""
     queries = SubscriptionQueries(db)
-    return await queries.get_business_active_subs(business_id, active_only)
+    return await queries.get_business_active_subs(business_id, page, active_only)
+
+@router.get("/business/{business_id}/metrics", response_model=SubscriptionMetrics, status_code=status.HTTP_200_OK)
+async def get_subscription_metrics(business_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)):
+    """MRR, suscripciones activas y canceladas, desglose por estado y cobros recientes del negocio."""
+    queries = SubscriptionQueries(db)
+    return await queries.get_metrics(business_id)
+
+@router.get("/business/{business_id}/due", response_model=list[SubscriptionRead], status_code=status.HTTP_200_OK)
+async def get_business_due_subscriptions(
+    business_id: uuid.UUID,
+    target_date: date | None = Query(None, description="Día de recogida a planificar (por defecto, hoy)"),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """Suscripciones activas del negocio que recogen ese día, con sus productos (planificación diaria)."""
+    queries = SubscriptionQueries(db)
+    return await queries.get_business_due_subscriptions(business_id, target_date or date.today())
 
 @router.get("/{sub_id}", response_model=SubscriptionRead, status_code=status.HTTP_200_OK)
-async def get_subscription(sub_id: uuid.UUID, db: AsyncSession = Depends(get_session)):
+async def get_subscription(sub_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)):
     """Detalle completo de una suscripción particular y sus productos/planes."""
     queries = SubscriptionQueries(db)
     return await queries.get_subscription_details(sub_id)
@@ -49,6 +81,23 @@ async def create_subscription(sub_in: SubscriptionCreate, db: AsyncSession = Dep
     commands = SubscriptionCommands(db)
     return await commands.subscribe(sub_in)
 
+@router.post("/generate-orders", response_model=SubscriptionOrdersScheduled, status_code=status.HTTP_202_ACCEPTED)
+async def generate_subscription_orders(
+    background_tasks: BackgroundTasks,
+    target_date: date | None = Query(None, description="Día de recogida (por defecto, el que toca al job)"),
+):
+    """
+    Lanza a demanda el generador de pedidos recurrentes (el job lo hace periódicamente).
+    Responde de inmediato: la corrida puede tardar minutos y se ejecuta en segundo plano.
+    """
+    if target_date is None:
+        target_date = date.today() + timedelta(days=settings.SUBSCRIPTION_ORDERS_DAYS_AHEAD)
+    SubscriptionCommands.check_generation_date(target_date)
+    background_tasks.add_task(
+        run_once, f"generate_subscription_orders {target_date}", lambda: generate_subscription_orders_job(target_date)
+    )
+    return SubscriptionOrdersScheduled(date=target_date)
+
 @router.patch("/{sub_id}/status", response_model=SubscriptionRead, status_code=status.HTTP_200_OK)
 async def update_subscription_status(
     sub_id: uuid.UUID, 
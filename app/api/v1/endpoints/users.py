@@ -1,14 +1,15 @@
 import uuid
-from collections.abc import Sequence
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1.deps import get_page_request
 from app.application.command.Users import UserCommands
 from app.application.query.Users import UserQueries
+from app.domain.schemas.pagination import Page, PageRequest
 from app.domain.schemas.users import UserCreate, UserRead, UserUpdate
-from app.infrastructure.database.database import get_session
+from app.infrastructure.database.database import get_read_session, get_session
 
 # 1. AQUÍ NACE: Definimos la variable 'router' que luego importaremos
 router = APIRouter()
@@ -21,17 +22,18 @@ async def register(
     command = UserCommands(db)
     return await command.register_user(data)
 
-@router.get("/", response_model=Sequence[UserRead])
+@router.get("/", response_model=Page[UserRead])
 async def list_users(
-    db: AsyncSession = Depends(get_session)
+    page: PageRequest = Depends(get_page_request),
+    db: AsyncSession = Depends(get_read_session)
 ) -> Any:
     query = UserQueries(db)
-    return await query.list_active_users()
+    return await query.list_active_users(page)
 
 @router.get("/{user_id}", response_model=UserRead)
 async def get_user(
     user_id: uuid.UUID, 
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ) -> Any:
     query = UserQueries(db)
     user = await query.get_by_id(user_id)
@@ -1,12 +1,17 @@
 import uuid
+from datetime import date
 from decimal import Decimal
 
 from fastapi import APIRouter, Body, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1.deps import get_page_request
+from app.api.v1.export import ExportFormat, export_response
 from app.application.command.Wallet import WalletCommands
 from app.application.query.Wallet import WalletQueries
+from app.domain.schemas.pagination import Page, PageRequest
 from app.domain.schemas.wallet import (
+    TRANSACTION_EXPORT_FIELDS,
     RechargePlanCreate,
     RechargePlanRead,
     RechargePlanUpdate,
@@ -15,7 +20,7 @@ from app.domain.schemas.wallet import (
 )
 
 # Dependencia de DB
-from app.infrastructure.database.database import get_session
+from app.infrastructure.database.database import get_read_session, get_session
 
 router = APIRouter()
 
@@ -27,17 +32,34 @@ router = APIRouter()
 async def get_wallet_balance(
     user_id: uuid.UUID = Query(...), 
     business_id: uuid.UUID = Query(...), 
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_session)  # Primario: crea el monedero si no existe
 ):
     """Obtiene el saldo disponible de un usuario en un negocio específico."""
     queries = WalletQueries(db)
     return await queries.get_user_balance(user_id, business_id)
 
-@router.get("/{wallet_id}/transactions", response_model=list[TransactionRead], status_code=status.HTTP_200_OK)
-async def get_transactions(wallet_id: uuid.UUID, db: AsyncSession = Depends(get_session)):
+@router.get("/{wallet_id}/transactions", response_model=Page[TransactionRead], status_code=status.HTTP_200_OK)
+async def get_transactions(
+    wallet_id: uuid.UUID,
+    page: PageRequest = Depends(get_page_request),
+    db: AsyncSession = Depends(get_read_session)
+):
     """Obtiene el historial contable de recargas y gastos del monedero."""
     queries = WalletQueries(db)
-    return await queries.get_transaction_history(wallet_id)
+    return await queries.get_transaction_history(wallet_id, page)
+
+@router.get("/{wallet_id}/transactions/export", status_code=status.HTTP_200_OK)
+async def export_transactions(
+    wallet_id: uuid.UUID,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    date_from: date | None = Query(None, description="Desde este día (incluido)"),
+    date_to: date | None = Query(None, description="Hasta este día (incluido)"),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """Exporta el libro mayor del monedero como CSV o NDJSON para contabilidad, transmitido en streaming."""
+    queries = WalletQueries(db)
+    rows = queries.export_transaction_history(wallet_id, date_from, date_to)
+    return export_response(rows, TRANSACTION_EXPORT_FIELDS, export_format, f"wallet-{wallet_id}")
 
 @router.post("/deposit", response_model=WalletRead, status_code=status.HTTP_200_OK)
 async def deposit_funds(
@@ -71,7 +93,7 @@ async def withdraw_funds(
 # ==========================================
 
 @router.get("/plans/business/{business_id}", response_model=list[RechargePlanRead], status_code=status.HTTP_200_OK)
-async def get_recharge_plans(business_id: uuid.UUID, db: AsyncSession = Depends(get_session)):
+async def get_recharge_plans(business_id: uuid.UUID, db: AsyncSession = Depends(get_read_session)):
     """Lista todos los planes de recarga activos configurados por el negocio."""
     queries = WalletQueries(db)
     return await queries.get_active_recharge_plans(business_id)
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Header, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.command.Webhook import WebhookCommands
+from app.domain.schemas.webhooks import WebhookAck
+from app.infrastructure.database.database import get_session
+
+router = APIRouter()
+
+
+@router.post("/stripe", response_model=WebhookAck, status_code=status.HTTP_200_OK)
+async def receive_stripe_webhook(
+    request: Request,
+    stripe_signature: str | None = Header(None, alias="Stripe-Signature"),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Recibe un evento de Stripe: verifica la firma sobre el cuerpo crudo, lo guarda
+    (deduplicado por id de evento) y responde de inmediato. Los workers de webhooks
+    lo aplican a la suscripción en segundo plano, en orden por suscripción.
+    """
+    payload = await request.body()
+    commands = WebhookCommands(db)
+    return await commands.receive_stripe_event(payload, stripe_signature)
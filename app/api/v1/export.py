@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Mapping, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum, StrEnum
+from typing import Any
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+
+# Filas que se acumulan antes de enviar un chunk al cliente
+EXPORT_CHUNK_ROWS = 500
+
+
+class ExportFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def _to_text(value: Any) -> Any:
+    """Convierte los tipos de la DB a valores serializables (Decimal como texto para no perder precisión)."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, UUID | Decimal):
+        return str(value)
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    return value
+
+
+async def _ndjson_chunks(rows: AsyncIterator[Mapping[str, Any]], fields: Sequence[str]) -> AsyncIterator[str]:
+    lines: list[str] = []
+    async for row in rows:
+        lines.append(json.dumps({f: _to_text(row[f]) for f in fields}, ensure_ascii=False))
+        if len(lines) >= EXPORT_CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines.clear()
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+async def _csv_chunks(rows: AsyncIterator[Mapping[str, Any]], fields: Sequence[str]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    count = 0
+    async for row in rows:
+        writer.writerow([_to_text(row[f]) for f in fields])
+        count += 1
+        if count % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def export_response(
+    rows: AsyncIterator[Mapping[str, Any]],
+    fields: Sequence[str],
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """
+    Envía las filas al cliente a medida que llegan del cursor de la DB.
+    La memoria usada es la de un chunk, sin importar el tamaño del historial.
+    """
+    chunks = _csv_chunks(rows, fields) if export_format == ExportFormat.CSV else _ndjson_chunks(rows, fields)
+    return StreamingResponse(
+        chunks,
+        media_type=_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'},
+    )
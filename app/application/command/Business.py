@@ -1,11 +1,13 @@
 import uuid
 
 from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.services.BusinessService import (
     BusinessService,  # <-- USAMOS TU SERVICIO
 )
+from app.application.services.StorefrontService import menu_cache
 from app.domain.models.models import Business
 from app.domain.schemas.business import (
     BusinessCreate,
@@ -13,7 +15,12 @@ from app.domain.schemas.business import (
     BusinessHourUpdate,
     BusinessUpdate,
 )
-from app.infrastructure.repositories.business_repo import BusinessRepository
+from app.infrastructure.database.errors import is_unique_violation
+from app.infrastructure.database.unit_of_work import UnitOfWork
+from app.infrastructure.repositories.business_repo import (
+    BusinessRepository,
+    business_cache,
+)
 
 
 class BusinessCommands:
@@ -25,68 +32,95 @@ class BusinessCommands:
         # Instanciamos el servicio (que por dentro usará su repositorio)
         BusinessRepository(db)
         self.service = BusinessService(db)
+        self.uow = UnitOfWork(db)
 
     async def create_business(self, data: BusinessCreate) -> Business:
         """Command: Registra un negocio nuevo."""
         
-        # 1. Podemos usar el servicio para la validación específica
-        # (Asumiendo que agregaste este método a tu BusinessService)
-        is_available = await self.service.check_slug_availability(data.slug)
-        if not is_available:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="El identificador (slug) del negocio ya está en uso."
-            )
+        async with self.uow:
+            # 1. Podemos usar el servicio para la validación específica
+            # (Asumiendo que agregaste este método a tu BusinessService)
+            is_available = await self.service.check_slug_availability(data.slug)
+            if not is_available:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="El identificador (slug) del negocio ya está en uso."
+                )
             
-        new_business = Business(
-            owner_id=data.owner_id,
-            name=data.name,
-            slug=data.slug,
-            image_url=data.image_url,
-            primary_color=data.primary_color,
-            secondary_color=data.secondary_color
-        )
+            new_business = Business(
+                owner_id=data.owner_id,
+                name=data.name,
+                slug=data.slug,
+                image_url=data.image_url,
+                primary_color=data.primary_color,
+                secondary_color=data.secondary_color
+            )
         
-        # 2. Reutilizamos el create() de tu BaseService heredado
-        return await self.service.create(new_business)
+            # El slug pudo quedar en la caché negativa mientras no existía
+            self.uow.after_commit(lambda: business_cache.invalidate_slug(data.slug))
+
+            # 2. Reutilizamos el create() de tu BaseService heredado.
+            # Dos registros simultáneos del mismo slug: la restricción UNIQUE decide
+            try:
+                return await self.service.create(new_business)
+            except IntegrityError as e:
+                if not is_unique_violation(e):
+                    raise
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="El identificador (slug) del negocio ya está en uso."
+                )
 
     async def update_business(self, business_id: uuid.UUID, update_data: BusinessUpdate) -> Business:
         """Command: Actualiza datos de un negocio."""
-        update_dict = update_data.model_dump(exclude_unset=True)
+        async with self.uow:
+            self.uow.after_commit(lambda: menu_cache.invalidate_business(business_id))
+            self.uow.after_commit(lambda: business_cache.invalidate(business_id))
+            update_dict = update_data.model_dump(exclude_unset=True)
+            if "slug" in update_dict:
+                # El nuevo slug pudo quedar en caché como inexistente
+                new_slug = update_dict["slug"]
+                self.uow.after_commit(lambda: business_cache.invalidate_slug(new_slug))
         
-        try:
-            # Tu BaseService ya hace el get_by_id y levanta ValueError si no existe
-            return await self.service.update(business_id, update_dict)
-        except ValueError as e:
-            # El Command traduce el error de negocio (ValueError) a un error HTTP
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, 
-                detail=str(e)
-            )
+            try:
+                # Tu BaseService ya hace el get_by_id y levanta ValueError si no existe
+                return await self.service.update(business_id, update_dict)
+            except ValueError as e:
+                # El Command traduce el error de negocio (ValueError) a un error HTTP
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, 
+                    detail=str(e)
+                )
 
     async def delete_business(self, business_id: uuid.UUID) -> bool:
         """Command: Elimina un negocio."""
-        try:
-            # Reutilizamos el delete() de tu BaseService
-            return await self.service.delete(business_id)
-        except ValueError as e:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, 
-                detail=str(e)
-            )
+        async with self.uow:
+            self.uow.after_commit(lambda: menu_cache.invalidate_business(business_id))
+            self.uow.after_commit(lambda: business_cache.invalidate(business_id))
+            try:
+                # Reutilizamos el delete() de tu BaseService
+                return await self.service.delete(business_id)
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, 
+                    detail=str(e)
+                )
             
     
     async def add_hour(self, data: BusinessHourCreate):
-        return await self.service.add_business_hour(data.model_dump())
+        async with self.uow:
+            return await self.service.add_business_hour(data.model_dump())
 
     async def update_hour(self, hour_id: uuid.UUID, data: BusinessHourUpdate):
-        try:
-            return await self.service.update_business_hour(hour_id, data.model_dump(exclude_unset=True))
-        except ValueError as e:
-            raise HTTPException(status_code=404, detail=str(e))
+        async with self.uow:
+            try:
+                return await self.service.update_business_hour(hour_id, data.model_dump(exclude_unset=True))
+            except ValueError as e:
+                raise HTTPException(status_code=404, detail=str(e))
 
     async def delete_hour(self, hour_id: uuid.UUID):
-        try:
-            return await self.service.delete_business_hour(hour_id)
-        except ValueError as e:
-            raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
+        async with self.uow:
+            try:
+                return await self.service.delete_business_hour(hour_id)
+            except ValueError as e:
+                raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
@@ -1,12 +1,25 @@
 import uuid
-from datetime import date
+from collections.abc import Sequence
+from datetime import date, timedelta
 
 from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.application.services.CatalogService import CatalogService
 from app.application.services.InventoryService import InventoryService
-from app.domain.models.models import DailyInventory
-from app.domain.schemas.inventory import InventoryCreate, InventoryUpdate
+from app.application.services.StorefrontService import menu_cache
+from app.domain.models.models import DailyInventory, InventoryTemplate
+from app.domain.schemas.inventory import (
+    BulkStockResult,
+    BulkStockUpsert,
+    InventoryCreate,
+    InventoryTemplateSet,
+    InventoryUpdate,
+    MaterializeResult,
+    StockRangeUpsert,
+)
+from app.infrastructure.database.unit_of_work import UnitOfWork
 
 
 class InventoryCommands:
@@ -16,35 +29,104 @@ class InventoryCommands:
     """
     def __init__(self, db: AsyncSession):
         self.service = InventoryService(db)
+        self.catalog_service = CatalogService(db)
+        self.uow = UnitOfWork(db)
 
     async def register_daily_stock(self, data: InventoryCreate) -> DailyInventory:
         """Command: Registra estrictamente el stock inicial. Falla si ya existe."""
-        return await self.service.create_inventory(data)
+        async with self.uow:
+            self.uow.after_commit(lambda: menu_cache.invalidate_entity(data.item_id))
+            return await self.service.create_inventory(data)
 
     async def set_stock(self, item_id: uuid.UUID, target_date: date, quantity: int) -> DailyInventory:
         """
         Command: Establece el stock de forma segura (Upsert). 
         Si no existe lo crea, si existe lo sobrescribe.
         """
-        return await self.service.set_daily_stock(item_id, target_date, quantity)
+        async with self.uow:
+            self.uow.after_commit(lambda: menu_cache.invalidate_entity(item_id))
+            return await self.service.set_daily_stock(item_id, target_date, quantity)
+
+    async def bulk_set_stock(self, data: BulkStockUpsert) -> BulkStockResult:
+        """Command: Upsert masivo de stock (ej. la carga nocturna de todo el menú)."""
+        entries = [(entry.item_id, entry.date, entry.quantity) for entry in data.entries]
+        return await self._bulk_upsert(entries)
+
+    async def set_stock_range(self, data: StockRangeUpsert) -> BulkStockResult:
+        """Command: Misma cantidad para varios productos en todos los días de un rango."""
+        days = (data.date_to - data.date_from).days + 1
+        entries = [
+            (item_id, data.date_from + timedelta(days=offset), data.quantity)
+            for item_id in data.item_ids
+            for offset in range(days)
+        ]
+        return await self._bulk_upsert(entries)
+
+    async def _bulk_upsert(self, entries: list[tuple[uuid.UUID, date, int]]) -> BulkStockResult:
+        item_ids = {item_id for item_id, _, _ in entries}
+        async with self.uow:
+            for item_id in item_ids:
+                self.uow.after_commit(lambda item_id=item_id: menu_cache.invalidate_entity(item_id))
+            try:
+                return await self.service.bulk_set_daily_stock(entries)
+            except IntegrityError:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Alguno de los productos indicados no existe."
+                )
 
     async def update_daily_stock(self, inventory_id: uuid.UUID, update_data: InventoryUpdate) -> DailyInventory:
         """Command: Ajuste parcial de un registro de inventario existente."""
-        update_dict = update_data.model_dump(exclude_unset=True)
-        try:
-            return await self.service.update(inventory_id, update_dict)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, 
-                detail="Registro de inventario no encontrado."
-            )
+        async with self.uow:
+            update_dict = update_data.model_dump(exclude_unset=True)
+            try:
+                inventory = await self.service.update(inventory_id, update_dict)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, 
+                    detail="Registro de inventario no encontrado."
+                )
+            item_id = inventory.item_id
+            self.uow.after_commit(lambda: menu_cache.invalidate_entity(item_id))
+            return inventory
 
     async def delete_daily_stock(self, inventory_id: uuid.UUID) -> bool:
         """Command: Elimina un registro de inventario (soft delete)."""
-        try:
-            return await self.service.delete(inventory_id)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, 
-                detail="Registro de inventario no encontrado."
-            )
\ No newline at end of file
+        async with self.uow:
+            inventory = await self.service.get_by_id(inventory_id)
+            if inventory:
+                item_id = inventory.item_id
+                self.uow.after_commit(lambda: menu_cache.invalidate_entity(item_id))
+            try:
+                return await self.service.delete(inventory_id)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, 
+                    detail="Registro de inventario no encontrado."
+                )
+
+    async def set_templates(self, item_id: uuid.UUID, data: InventoryTemplateSet) -> Sequence[InventoryTemplate]:
+        """
+        Command: Define la producción semanal habitual de un producto.
+        Los días ya materializados no cambian; aplica a los que aún no existen.
+        """
+        quantities = {day.day_of_week: day.quantity for day in data.days}
+        async with self.uow:
+            item = await self.catalog_service.get_item_by_id(item_id)
+            if not item or item.deleted_at is not None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ítem no encontrado.")
+            return await self.service.replace_templates(item_id, quantities)
+
+    async def materialize_templates(self, days_ahead: int) -> MaterializeResult:
+        """
+        Command: Crea el stock de los próximos `days_ahead` días (incluido hoy) según las
+        plantillas semanales. Idempotente: solo rellena los días que faltan.
+        """
+        date_from = date.today()
+        date_to = date_from + timedelta(days=days_ahead - 1)
+        async with self.uow:
+            created = await self.service.materialize_templates(date_from, date_to)
+            if created:
+                # Puede haber creado el stock de hoy de cualquier negocio
+                self.uow.after_commit(menu_cache.clear)
+        return MaterializeResult(date_from=date_from, date_to=date_to, created=created)
@@ -1,4 +1,5 @@
 import uuid
+from collections import defaultdict
 from decimal import Decimal
 
 from fastapi import HTTPException
@@ -7,9 +8,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.application.services.CatalogService import CatalogService
 from app.application.services.InventoryService import InventoryService
 from app.application.services.OrdersService import OrdersService
+from app.application.services.StorefrontService import menu_cache
 from app.application.services.WalletService import WalletService
 from app.domain.models.models import Order, OrderItem, OrderStatus
 from app.domain.schemas.orders import OrderCreate, OrderStatusUpdate
+from app.infrastructure.database.unit_of_work import UnitOfWork
 
 
 class OrderCommands:
@@ -22,73 +25,84 @@ class OrderCommands:
         self.catalog_service = CatalogService(db)
         self.inventory_service = InventoryService(db)
         self.wallet_service = WalletService(db)
+        self.uow = UnitOfWork(db)
 
     
     async def create_order(self, data: OrderCreate) -> Order:
+        """
+        Command: Crea el pedido en una única transacción (UnitOfWork).
+        Carga todos los productos en una consulta, reserva el stock con un único UPDATE
+        condicionado y escribe cabecera, líneas y movimiento del monedero con un
+        solo commit. Si algo falla no queda saldo cobrado sin pedido (ni al revés).
+        """
         # ¡Generamos el ID de la orden por adelantado! 
-        # (Exactamente como lo tenías en tu código original)
         order_id = uuid.uuid4() 
-        
-        total_amount = Decimal("0.0")
-        order_items_list = []
         target_date = data.pickup_slot.date()
 
-        # 1. Validar Catálogo e Inventario
+        # Un mismo producto puede venir en varias líneas del carrito: el stock se valida por el total
+        requested_qty: dict[uuid.UUID, int] = defaultdict(int)
         for entry in data.items:
-            # Validar que exista y obtener precio real
-            item_db = await self.catalog_service.get_item_by_id(entry.item_id)
-            if not item_db:
-                raise HTTPException(status_code=404, detail=f"El producto con ID {entry.item_id} no existe.")
-            
-            # Validar disponibilidad
-            has_stock = await self.inventory_service.check_availability(item_db.id, target_date, entry.quantity)
-            if not has_stock:
-                raise HTTPException(status_code=400, detail=f"Stock insuficiente para '{item_db.name}' el día {target_date}.")
-            
-            total_amount += item_db.price * entry.quantity
-            
-            order_items_list.append(
-                OrderItem(
-                    order_id=order_id, # <-- AQUÍ usamos el ID pre-generado
-                    item_id=item_db.id,
-                    quantity=entry.quantity,
-                    unit_price=item_db.price,
-                    staff_id=entry.staff_id
+            requested_qty[entry.item_id] += entry.quantity
+
+        async with self.uow:
+            # 1. Validar Catálogo (una sola consulta para todos los ítems del carrito)
+            items_db = await self.catalog_service.get_items_by_ids(list(requested_qty), data.business_id)
+            items_by_id = {item.id: item for item in items_db}
+            for item_id in requested_qty:
+                if item_id not in items_by_id:
+                    raise HTTPException(status_code=404, detail=f"El producto con ID {item_id} no existe.")
+
+            # 2. Reservar stock con un UPDATE condicionado (sin lecturas previas ni sobreventa)
+            reservation = await self.inventory_service.reserve_stock(target_date, dict(requested_qty))
+            if not reservation.is_complete:
+                item_name = items_by_id[reservation.failed[0]].name
+                raise HTTPException(status_code=400, detail=f"Stock insuficiente para '{item_name}' el día {target_date}.")
+
+            total_amount = Decimal("0.0")
+            order_items_list = []
+            for entry in data.items:
+                item_db = items_by_id[entry.item_id]
+                total_amount += item_db.price * entry.quantity
+                order_items_list.append(
+                    OrderItem(
+                        order_id=order_id, # <-- AQUÍ usamos el ID pre-generado
+                        item_id=item_db.id,
+                        quantity=entry.quantity,
+                        unit_price=item_db.price,
+                        staff_id=entry.staff_id
+                    )
                 )
-            )
 
-        # 2. Cobrar del Monedero
-        try:
-            await self.wallet_service.deduct_funds(
-                user_id=data.user_id,
+            # 3. Cobrar del Monedero (sin commit: se confirma junto con el pedido)
+            try:
+                await self.wallet_service.stage_withdrawal(
+                    user_id=data.user_id,
+                    business_id=data.business_id,
+                    amount=total_amount,
+                    description=f"Compra de pedido para {target_date}",
+                    reference_id=order_id
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) # "Saldo insuficiente"
+
+            # 4. Construir la Orden y confirmar todo en un único commit
+            new_order = Order(
+                id=order_id, # <-- AQUÍ le asignamos el mismo ID a la cabecera
                 business_id=data.business_id,
-                amount=total_amount,
-                description=f"Compra de pedido para {target_date}"
+                user_id=data.user_id,
+                pickup_slot=data.pickup_slot,
+                total_amount=total_amount,
+                status=OrderStatus.PAID
             )
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e)) # "Saldo insuficiente"
-
-        # 3. Descontar Inventario
-        for entry in data.items:
-            inv_record = await self.inventory_service.get_by_item_and_date(entry.item_id, target_date)
-            if inv_record:
-                new_qty = inv_record.quantity_available - entry.quantity
-                await self.inventory_service.update(inv_record.id, {"quantity_available": new_qty})
+            await self.orders_service.save_full_order(new_order, order_items_list)
+            # El stock del día cambió: el menú público debe reflejarlo
+            self.uow.after_commit(lambda: menu_cache.invalidate_business(data.business_id))
 
-        # 4. Construir y guardar la Orden
-        new_order = Order(
-            id=order_id, # <-- AQUÍ le asignamos el mismo ID a la cabecera
-            business_id=data.business_id,
-            user_id=data.user_id,
-            pickup_slot=data.pickup_slot,
-            total_amount=total_amount,
-            status=OrderStatus.PAID
-        )
-        
+        return new_order
 
-        return await self.orders_service.save_full_order(new_order, order_items_list)
     async def update_status(self, order_id: uuid.UUID, data: OrderStatusUpdate) -> Order:
-        try:
-            return await self.orders_service.update_order_status(order_id, data.status)
-        except ValueError as e:
-            raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
+        async with self.uow:
+            try:
+                return await self.orders_service.update_order_status(order_id, data.status)
+            except ValueError as e:
+                raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
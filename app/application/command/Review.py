@@ -1,13 +1,34 @@
+import uuid
+
 from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.application.services.RatingService import RatingService
 from app.application.services.ReviewService import ReviewService
 from app.domain.models.models import ItemReview, OrderReview, StaffReview
 from app.domain.schemas.reviews import (
+    FullReviewCreate,
+    FullReviewRead,
     ItemReviewCreate,
+    ItemReviewRead,
     OrderReviewCreate,
+    OrderReviewRead,
     StaffReviewCreate,
+    StaffReviewRead,
 )
+from app.infrastructure.database.errors import is_unique_violation
+from app.infrastructure.database.unit_of_work import UnitOfWork
+
+
+def review_conflict(error: IntegrityError, detail: str) -> HTTPException:
+    """Traduce el IntegrityError del flush: duplicado = 409, referencia inválida = 400."""
+    if is_unique_violation(error):
+        return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="La reseña hace referencia a un pedido, producto o staff inexistente."
+    )
 
 
 class ReviewCommands:
@@ -16,24 +37,96 @@ class ReviewCommands:
     """
     def __init__(self, db: AsyncSession):
         self.service = ReviewService(db)
+        self.rating_service = RatingService(db)
+        self.uow = UnitOfWork(db)
 
     async def create_order_review(self, data: OrderReviewCreate) -> OrderReview:
-        """Command: Crea una reseña logística del pedido. Falla si el pedido ya fue reseñado."""
-        try:
-            new_review = OrderReview(**data.model_dump())
-            return await self.service.create_order_review(new_review)
-        except ValueError as e:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, 
-                detail=str(e)
-            )
+        """Command: Crea una reseña logística del pedido. Falla (409) si el pedido ya fue reseñado."""
+        async with self.uow:
+            try:
+                new_review = OrderReview(**data.model_dump())
+                review = await self.service.create_order_review(new_review)
+            except IntegrityError as e:
+                raise review_conflict(e, "Ya existe una reseña general para este pedido.")
+            # Los agregados se actualizan en la misma transacción que la reseña
+            await self.rating_service.record_review(review)
+            return review
 
     async def create_item_review(self, data: ItemReviewCreate) -> ItemReview:
         """Command: Crea una reseña sobre la calidad de un producto."""
-        new_review = ItemReview(**data.model_dump())
-        return await self.service.create_item_review(new_review)
+        async with self.uow:
+            try:
+                new_review = ItemReview(**data.model_dump())
+                review = await self.service.create_item_review(new_review)
+            except IntegrityError as e:
+                raise review_conflict(e, "Este producto ya fue reseñado en este pedido.")
+            await self.rating_service.record_review(review)
+            return review
 
     async def create_staff_review(self, data: StaffReviewCreate) -> StaffReview:
         """Command: Crea una reseña evaluando la atención de un miembro del equipo."""
-        new_review = StaffReview(**data.model_dump())
-        return await self.service.create_staff_review(new_review)
\ No newline at end of file
+        async with self.uow:
+            try:
+                new_review = StaffReview(**data.model_dump())
+                review = await self.service.create_staff_review(new_review)
+            except IntegrityError as e:
+                raise review_conflict(e, "Este miembro del staff ya fue reseñado en este pedido.")
+            await self.rating_service.record_review(review)
+            return review
+
+    async def create_full_review(self, order_id: uuid.UUID, data: FullReviewCreate) -> FullReviewRead:
+        """
+        Command: Reseña del pedido, de sus productos y de su staff en una sola transacción.
+        Valida contra las líneas del pedido (una consulta), inserta todo en un flush y
+        actualiza los agregados con un único upsert. Si algo ya estaba reseñado, 409 y nada se guarda.
+        """
+        async with self.uow:
+            order = await self.service.get_order_with_items(order_id)
+            if not order:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pedido no encontrado.")
+            if order.user_id != data.user_id:
+                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="El pedido no pertenece a este usuario.")
+
+            ordered_items = {line.item_id for line in order.items}
+            assigned_staff = {line.staff_id for line in order.items if line.staff_id}
+            if any(rating.item_id not in ordered_items for rating in data.items):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Solo se pueden calificar productos incluidos en el pedido."
+                )
+            if any(rating.staff_id not in assigned_staff for rating in data.staff):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Solo se puede calificar al staff asignado al pedido."
+                )
+
+            order_review = OrderReview(
+                **data.model_dump(exclude={"items", "staff"}),
+                business_id=order.business_id,
+                order_id=order_id,
+            )
+            item_reviews = [
+                ItemReview(**rating.model_dump(), user_id=data.user_id, order_id=order_id)
+                for rating in data.items
+            ]
+            staff_reviews = [
+                StaffReview(**rating.model_dump(), user_id=data.user_id, order_id=order_id)
+                for rating in data.staff
+            ]
+            reviews = [order_review, *item_reviews, *staff_reviews]
+            try:
+                await self.service.create_reviews(reviews)
+            except IntegrityError as e:
+                raise review_conflict(e, "Este pedido ya tiene reseñas registradas.")
+            await self.rating_service.record_reviews(reviews)
+
+            return FullReviewRead(
+                order=OrderReviewRead.model_validate(order_review),
+                items=[ItemReviewRead.model_validate(review) for review in item_reviews],
+                staff=[StaffReviewRead.model_validate(review) for review in staff_reviews],
+            )
+
+    async def rebuild_rating_aggregates(self) -> int:
+        """Command: Recalcula todos los agregados de calificaciones desde las reseñas."""
+        async with self.uow:
+            return await self.rating_service.rebuild_all()
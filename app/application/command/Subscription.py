@@ -1,22 +1,41 @@
 import uuid
-from datetime import UTC, datetime, timedelta
+from collections import defaultdict
+from datetime import UTC, date, datetime, timedelta
 from decimal import Decimal
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.services.CatalogService import CatalogService
-from app.application.services.SubscriptionsService import SubscriptionService
+from app.application.services.InventoryService import InventoryService
+from app.application.services.OrdersService import OrdersService
+from app.application.services.StorefrontService import menu_cache
+from app.application.services.SubscriptionsService import (
+    SubscriptionService,
+    metrics_cache,
+    past_due_since,
+)
+from app.application.services.WalletService import WalletService
+from app.core.config import settings
 from app.domain.models.models import (
+    Order,
+    OrderItem,
+    OrderStatus,
     Subscription,
     SubscriptionItem,
     SubscriptionPayment,
     SubscriptionStatus,
+    TransactionType,
+    WalletTransaction,
+    weekdays_to_mask,
 )
 from app.domain.schemas.suscriptions import (
     SubscriptionCreate,
+    SubscriptionOrdersResult,
     SubscriptionStatusUpdate,
+    SubscriptionSweepResult,
 )
+from app.infrastructure.database.unit_of_work import UnitOfWork
 
 
 class SubscriptionCommands:
@@ -24,61 +43,272 @@ class SubscriptionCommands:
     def __init__(self, db: AsyncSession):
         self.sub_service = SubscriptionService(db)
         self.catalog_service = CatalogService(db)
+        self.inventory_service = InventoryService(db)
+        self.orders_service = OrdersService(db)
+        self.wallet_service = WalletService(db)
+        self.uow = UnitOfWork(db)
 
     async def subscribe(self, data: SubscriptionCreate) -> Subscription:
         """Command: Crea una nueva suscripción validando los planes en el catálogo."""
-        sub_id = uuid.uuid4()
-        sub_items = []
+        async with self.uow:
+            sub_id = uuid.uuid4()
+            sub_items = []
         
-        # Para el ejemplo, asumimos un ciclo de facturación de 30 días
-        now = datetime.now(UTC)
-        period_end = now + timedelta(days=30)
-
-        for entry in data.items:
-            # Validar que el plan/producto exista
-            item_db = await self.catalog_service.get_item_by_id(entry.item_id)
-            if not item_db:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND, 
-                    detail=f"El plan con ID {entry.item_id} no existe."
-                )
+            # El barrido de fin de periodo (sweep_periods) renueva o vence la suscripción
+            period_end = datetime.utcnow() + timedelta(days=settings.SUBSCRIPTION_PERIOD_DAYS)
+
+            for entry in data.items:
+                # Validar que el plan/producto exista
+                item_db = await self.catalog_service.get_item_by_id(entry.item_id)
+                if not item_db:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND, 
+                        detail=f"El plan con ID {entry.item_id} no existe."
+                    )
             
-            sub_items.append(
-                SubscriptionItem(
-                    subscription_id=sub_id, # Usamos el ID pre-generado
-                    item_id=item_db.id,
-                    quantity=entry.quantity,
-                    unit_price=item_db.price
+                sub_items.append(
+                    SubscriptionItem(
+                        subscription_id=sub_id, # Usamos el ID pre-generado
+                        item_id=item_db.id,
+                        quantity=entry.quantity,
+                        unit_price=item_db.price
+                    )
                 )
-            )
         
-        # Construir cabecera de la suscripción
-        new_sub = Subscription(
-            id=sub_id, # ID pre-generado
-            user_id=data.user_id,
-            business_id=data.business_id,
-            status=SubscriptionStatus.ACTIVE,
-            current_period_end=period_end,
-            frequency_days=(data.frequency_days), # <-- AÑADIDO
-            pickup_time=data.pickup_time
-        )
-
-        return await self.sub_service.create_full_subscription(new_sub, sub_items)
+            # Construir cabecera de la suscripción
+            new_sub = Subscription(
+                id=sub_id, # ID pre-generado
+                user_id=data.user_id,
+                business_id=data.business_id,
+                status=SubscriptionStatus.ACTIVE,
+                current_period_end=period_end,
+                weekday_mask=weekdays_to_mask(data.frequency_days.split(",")),
+                pickup_time=data.pickup_time
+            )
+
+            self.uow.after_commit(lambda: metrics_cache.pop(data.business_id))
+            return await self.sub_service.create_full_subscription(new_sub, sub_items)
 
     async def update_status(self, sub_id: uuid.UUID, data: SubscriptionStatusUpdate) -> Subscription:
         """Command: Actualiza el estado (Ideal para webhooks de Stripe)."""
-        try:
-            return await self.sub_service.update_status(sub_id, data.status, data.current_period_end)
-        except ValueError as e:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        async with self.uow:
+            try:
+                subscription = await self.sub_service.update_status(sub_id, data.status, data.current_period_end)
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+            business_id = subscription.business_id
+            self.uow.after_commit(lambda: metrics_cache.pop(business_id))
+            return subscription
 
     async def register_payment(self, sub_id: uuid.UUID, amount: Decimal, payment_status: str, external_ref: str | None = None) -> SubscriptionPayment:
         """Command: Deja constancia de un intento de cobro recurrente."""
-        payment_data = {
-            "subscription_id": sub_id,
-            "amount": amount,
-            "status": payment_status,
-            "payment_date": datetime.now(UTC),
-            "external_reference": external_ref
-        }
-        return await self.sub_service.record_payment(payment_data)
\ No newline at end of file
+        async with self.uow:
+            payment_data = {
+                "subscription_id": sub_id,
+                "amount": amount,
+                "status": payment_status,
+                "payment_date": datetime.now(UTC),
+                "external_reference": external_ref
+            }
+            return await self.sub_service.record_payment(payment_data)
+
+    @staticmethod
+    def check_generation_date(target_date: date) -> None:
+        """
+        Una corrida deja last_generated_date = target_date y el job solo genera días
+        posteriores: generar por adelantado un día más lejano que el del job haría que
+        este se saltara los días intermedios. Solo se admite hasta hoy + SUBSCRIPTION_ORDERS_DAYS_AHEAD.
+        """
+        latest = date.today() + timedelta(days=settings.SUBSCRIPTION_ORDERS_DAYS_AHEAD)
+        if target_date > latest:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Solo se pueden generar pedidos de suscripción hasta el {latest.isoformat()}."
+            )
+
+    async def generate_orders(self, target_date: date) -> SubscriptionOrdersResult:
+        """
+        Command: Genera los pedidos recurrentes de target_date para todas las suscripciones
+        a las que les toca. Trabaja por tandas de SUBSCRIPTION_ORDERS_CHUNK_SIZE, cada una en
+        su propia transacción, así una corrida grande no mantiene bloqueos largos.
+        Es idempotente: una suscripción con su pedido del día ya no vuelve a aparecer.
+        Solo las suscripciones sin pasarela se cobran del monedero; las de Stripe ya pagan
+        su periodo en la pasarela y su pedido se genera sin descontar saldo.
+        """
+        self.check_generation_date(target_date)
+        result = SubscriptionOrdersResult(date=target_date)
+        after_id: uuid.UUID | None = None
+        while True:
+            last_id = await self._generate_orders_chunk(target_date, after_id, result)
+            if last_id is None:
+                return result
+            after_id = last_id
+
+    async def _generate_orders_chunk(
+        self, target_date: date, after_id: uuid.UUID | None, result: SubscriptionOrdersResult
+    ) -> uuid.UUID | None:
+        """
+        Procesa una tanda en una transacción y acumula en `result`. Devuelve el último id
+        visto (cursor de la siguiente tanda) o None si ya no quedan suscripciones.
+
+        Todo es por conjuntos: una consulta para las suscripciones, una para sus líneas,
+        un SELECT ... FOR UPDATE para el stock y otro para los monederos. El reparto se
+        decide en memoria (cada suscripción recibe todo o nada) y se aplica con un UPDATE
+        de stock, un UPDATE de saldos y un executemany por tabla de inserción.
+        """
+        async with self.uow:
+            subscriptions = await self.sub_service.get_due_subscriptions(
+                target_date, after_id, settings.SUBSCRIPTION_ORDERS_CHUNK_SIZE
+            )
+            if not subscriptions:
+                return None
+
+            lines_by_sub: dict[uuid.UUID, list] = defaultdict(list)
+            for line in await self.sub_service.get_lines_for_subscriptions([sub.id for sub in subscriptions]):
+                lines_by_sub[line.subscription_id].append(line)
+
+            item_ids = sorted({line.item_id for lines in lines_by_sub.values() for line in lines})
+            stock = await self.inventory_service.lock_stock(target_date, item_ids)
+            wallet_keys = sorted({
+                (sub.user_id, sub.business_id) for sub in subscriptions if not sub.stripe_subscription_id
+            })
+            wallets = await self.wallet_service.lock_wallets(wallet_keys)
+            balances = {wallet.id: wallet.balance for wallet in wallets.values()}
+
+            reserved: dict[uuid.UUID, int] = defaultdict(int)
+            orders: list[Order] = []
+            order_items: list[OrderItem] = []
+            charges: list[WalletTransaction] = []
+            generated: list[uuid.UUID] = []
+            businesses: set[uuid.UUID] = set()
+
+            for sub in subscriptions:
+                result.processed += 1
+                lines = lines_by_sub.get(sub.id, [])
+                if not lines:
+                    # Suscripción sin productos vigentes: no hay nada que pedir ese día
+                    generated.append(sub.id)
+                    continue
+
+                requested: dict[uuid.UUID, int] = defaultdict(int)
+                for line in lines:
+                    requested[line.item_id] += line.quantity
+                if any(stock.get(item_id, 0) < quantity for item_id, quantity in requested.items()):
+                    result.skipped_stock += 1
+                    continue
+
+                total_amount = sum((line.unit_price * line.quantity for line in lines), Decimal("0"))
+                # Stripe ya cobra el periodo: descontarlo del monedero sería un doble cobro
+                charge = Decimal("0") if sub.stripe_subscription_id else total_amount
+                wallet = wallets.get((sub.user_id, sub.business_id))
+                if charge > 0 and (wallet is None or balances[wallet.id] < charge):
+                    result.skipped_funds += 1
+                    continue
+
+                # Se asigna el stock y el saldo de esta suscripción
+                for item_id, quantity in requested.items():
+                    stock[item_id] -= quantity
+                    reserved[item_id] += quantity
+
+                order_id = uuid.uuid4()
+                orders.append(Order(
+                    id=order_id,
+                    business_id=sub.business_id,
+                    user_id=sub.user_id,
+                    status=OrderStatus.PAID,
+                    total_amount=total_amount,
+                    subscription_id=sub.id,
+                    is_subscription_order=True,
+                    pickup_slot=datetime.combine(target_date, sub.pickup_time),
+                ))
+                order_items.extend(
+                    OrderItem(order_id=order_id, item_id=line.item_id, quantity=line.quantity, unit_price=line.unit_price)
+                    for line in lines
+                )
+                if charge > 0 and wallet is not None:
+                    balances[wallet.id] -= charge
+                    charges.append(WalletTransaction(
+                        wallet_id=wallet.id,
+                        amount=charge,
+                        type=TransactionType.WITHDRAWAL,
+                        description=f"Pedido de suscripción para {target_date}",
+                        reference_id=order_id,
+                    ))
+                generated.append(sub.id)
+                businesses.add(sub.business_id)
+                result.created += 1
+                result.total_amount += total_amount
+
+            # Las filas de stock y monederos están bloqueadas: los descuentos no pueden fallar
+            reservation = await self.inventory_service.reserve_stock(target_date, dict(reserved))
+            if not reservation.is_complete:
+                raise RuntimeError(f"Stock inconsistente al generar pedidos de suscripción: {reservation.failed}")
+            try:
+                await self.wallet_service.stage_withdrawals(charges)
+            except ValueError as e:
+                raise RuntimeError(f"Saldo inconsistente al generar pedidos de suscripción: {e}")
+            await self.orders_service.save_orders(orders, order_items)
+            await self.sub_service.mark_generated(generated, target_date)
+
+            for business_id in businesses:
+                self.uow.after_commit(lambda business_id=business_id: menu_cache.invalidate_business(business_id))
+            return subscriptions[-1].id
+
+    async def sweep_periods(self, now: datetime | None = None) -> SubscriptionSweepResult:
+        """
+        Command: Procesa las suscripciones cuyo periodo terminó, por tandas de
+        SUBSCRIPTION_SWEEPER_BATCH_SIZE, cada una en su propia transacción:
+
+        - Sin pasarela (sin stripe_subscription_id): el periodo se renueva sumando
+          SUBSCRIPTION_PERIOD_DAYS hasta cubrir `now` (los pedidos se cobran del monedero).
+        - Con Stripe: si SUBSCRIPTION_RENEWAL_BUFFER_HOURS después del vencimiento no se
+          aplicó la renovación (y no hay webhooks suyos pendientes), pasa a PAST_DUE.
+        - En PAST_DUE desde hace más de SUBSCRIPTION_GRACE_DAYS (past_due_since): se cancela.
+
+        Cada suscripción procesada sale del conjunto vencido: las que pasan a PAST_DUE
+        quedan con past_due_since = now y no se cancelan en la misma pasada, así que el
+        bucle termina; varios nodos pueden ejecutarlo a la vez gracias a SKIP LOCKED.
+        """
+        now = now or datetime.utcnow()
+        result = SubscriptionSweepResult()
+        while await self._sweep_batch(now, result):
+            pass
+        return result
+
+    async def _sweep_batch(self, now: datetime, result: SubscriptionSweepResult) -> int:
+        """Procesa una tanda y acumula en `result`; devuelve cuántas suscripciones tomó."""
+        period = timedelta(days=settings.SUBSCRIPTION_PERIOD_DAYS)
+        renewal_cutoff = now - timedelta(hours=settings.SUBSCRIPTION_RENEWAL_BUFFER_HOURS)
+        grace_cutoff = now - timedelta(days=settings.SUBSCRIPTION_GRACE_DAYS)
+        async with self.uow:
+            subscriptions = await self.sub_service.get_expired_subscriptions(
+                now, renewal_cutoff, grace_cutoff, settings.SUBSCRIPTION_SWEEPER_BATCH_SIZE
+            )
+            changes = []
+            businesses: set[uuid.UUID] = set()
+            for sub in subscriptions:
+                result.processed += 1
+                period_end = sub.current_period_end
+                if sub.status == SubscriptionStatus.PAST_DUE:
+                    new_status = SubscriptionStatus.CANCELED
+                    result.canceled += 1
+                elif sub.stripe_subscription_id:
+                    new_status = SubscriptionStatus.PAST_DUE
+                    result.past_due += 1
+                else:
+                    # Periodos completos vencidos + 1: el nuevo fin queda siempre después de `now`
+                    new_status = SubscriptionStatus.ACTIVE
+                    period_end += period * ((now - period_end) // period + 1)
+                    result.renewed += 1
+                changes.append({
+                    "id": sub.id,
+                    "status": new_status,
+                    "current_period_end": period_end,
+                    "past_due_since": past_due_since(sub, new_status, now),
+                })
+                businesses.add(sub.business_id)
+
+            await self.sub_service.apply_period_changes(changes)
+            for business_id in businesses:
+                self.uow.after_commit(lambda business_id=business_id: metrics_cache.pop(business_id))
+            return len(subscriptions)
@@ -0,0 +1,244 @@
+import json
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.services.SubscriptionsService import (
+    SubscriptionService,
+    metrics_cache,
+)
+from app.application.services.WebhookService import WebhookService
+from app.core.config import settings
+from app.core.security.webhooks import verify_stripe_signature
+from app.domain.models.models import (
+    Subscription,
+    SubscriptionStatus,
+    WebhookEvent,
+    WebhookEventStatus,
+)
+from app.domain.schemas.webhooks import WebhookAck, WebhookProcessResult
+from app.infrastructure.database.unit_of_work import UnitOfWork
+
+STRIPE_PROVIDER = "stripe"
+
+# Estado de la suscripción en Stripe -> estado local
+STRIPE_SUBSCRIPTION_STATUSES = {
+    "trialing": SubscriptionStatus.TRIALING,
+    "active": SubscriptionStatus.ACTIVE,
+    "past_due": SubscriptionStatus.PAST_DUE,
+    "unpaid": SubscriptionStatus.PAST_DUE,
+    "canceled": SubscriptionStatus.CANCELED,
+    "incomplete": SubscriptionStatus.INCOMPLETE,
+    "incomplete_expired": SubscriptionStatus.CANCELED,
+}
+SUBSCRIPTION_EVENTS = ("customer.subscription.created", "customer.subscription.updated", "customer.subscription.deleted")
+INVOICE_PAID_EVENTS = ("invoice.paid", "invoice.payment_succeeded")
+INVOICE_FAILED_EVENTS = ("invoice.payment_failed",)
+
+
+def stripe_subject_ref(event_type: str, obj: dict[str, Any]) -> str | None:
+    """Id de la suscripción de Stripe a la que se refiere el evento (clave de orden en la cola)."""
+    if event_type.startswith("customer.subscription."):
+        return obj.get("id")
+    if event_type.startswith("invoice."):
+        # Versiones recientes de la API lo mueven a parent.subscription_details
+        details = (obj.get("parent") or {}).get("subscription_details") or {}
+        return obj.get("subscription") or details.get("subscription")
+    return None
+
+
+def stripe_period_end(obj: dict[str, Any]) -> datetime | None:
+    """Fin del periodo actual de una suscripción de Stripe (en la raíz o en sus items)."""
+    timestamp = obj.get("current_period_end")
+    if timestamp is None:
+        items = (obj.get("items") or {}).get("data") or []
+        timestamp = items[0].get("current_period_end") if items else None
+    return from_timestamp(timestamp) if timestamp is not None else None
+
+
+def stripe_invoice_period_end(invoice: dict[str, Any]) -> datetime | None:
+    """Fin del periodo que paga un invoice: el mayor period.end de sus líneas."""
+    ends = [
+        line["period"]["end"]
+        for line in (invoice.get("lines") or {}).get("data") or []
+        if (line.get("period") or {}).get("end") is not None
+    ]
+    return from_timestamp(max(ends)) if ends else None
+
+
+def from_timestamp(timestamp: int) -> datetime:
+    """Epoch de Stripe -> datetime UTC sin zona, como el resto de columnas de auditoría."""
+    return datetime.fromtimestamp(int(timestamp), UTC).replace(tzinfo=None)
+
+
+class WebhookCommands:
+    """
+    Caso de Uso (SRP) para los webhooks de la pasarela de pagos: la recepción solo
+    verifica y guarda el evento (respuesta inmediata); los workers lo aplican después.
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.webhook_service = WebhookService(db)
+        self.sub_service = SubscriptionService(db)
+        self.uow = UnitOfWork(db)
+
+    async def receive_stripe_event(self, payload: bytes, signature: str | None) -> WebhookAck:
+        """
+        Command: Verifica la firma y guarda el evento crudo con un único INSERT.
+        Un reintento de Stripe (mismo event id) no se guarda dos veces y se responde igual
+        con 200, para que la pasarela deje de reenviarlo.
+        """
+        secret = settings.STRIPE_WEBHOOK_SECRET
+        if not secret:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Webhooks de Stripe no configurados."
+            )
+        try:
+            verify_stripe_signature(payload, signature or "", secret, settings.STRIPE_WEBHOOK_TOLERANCE_SECONDS)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        try:
+            event = json.loads(payload)
+            event_id, event_type = str(event["id"]), str(event["type"])
+            occurred_at = from_timestamp(event["created"])
+            obj = event["data"]["object"]
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Evento mal formado.")
+
+        async with self.uow:
+            created = await self.webhook_service.store_event(WebhookEvent(
+                provider=STRIPE_PROVIDER,
+                event_id=event_id,
+                event_type=event_type,
+                subject_ref=stripe_subject_ref(event_type, obj),
+                occurred_at=occurred_at,
+                payload=event,
+            ))
+        return WebhookAck(event_id=event_id, duplicate=not created)
+
+    async def process_events(self) -> WebhookProcessResult:
+        """
+        Command: Vacía la cola de eventos pendientes por tandas de WEBHOOK_BATCH_SIZE,
+        cada una en su propia transacción. Varios workers (y varios nodos) pueden
+        ejecutarlo a la vez: se reparten los eventos con SKIP LOCKED.
+        """
+        result = WebhookProcessResult()
+        while await self._process_batch(result):
+            pass
+        return result
+
+    async def _process_batch(self, result: WebhookProcessResult) -> int:
+        """
+        Aplica una tanda y acumula en `result`; devuelve cuántos eventos tomó.
+        Cada evento se aplica dentro de un SAVEPOINT: si falla se deshace solo ese
+        evento, se anota el error y se reprograma con espera exponencial.
+        """
+        async with self.uow:
+            now = datetime.utcnow()
+            events = await self.webhook_service.claim_pending(settings.WEBHOOK_BATCH_SIZE, now)
+            for event in events:
+                # Un rollback del savepoint expira lo modificado: se copian antes los datos necesarios
+                event_id, attempts = event.id, event.attempts
+                result.claimed += 1
+                try:
+                    async with self.db.begin_nested():
+                        subscription = await self._apply_stripe_event(event)
+                except Exception as e:
+                    attempts += 1
+                    retry_at = None
+                    if attempts < settings.WEBHOOK_MAX_ATTEMPTS:
+                        retry_at = now + timedelta(seconds=2 ** attempts)
+                        result.retried += 1
+                    else:
+                        result.failed += 1
+                    error = f"{type(e).__name__}: {e}"[:2000]
+                    await self.webhook_service.mark_failed_attempt(event_id, error, now, retry_at)
+                    continue
+
+                if subscription is None:
+                    result.ignored += 1
+                    await self.webhook_service.mark_done(event_id, WebhookEventStatus.IGNORED, now)
+                    continue
+                result.processed += 1
+                await self.webhook_service.mark_done(event_id, WebhookEventStatus.PROCESSED, now)
+                business_id = subscription.business_id
+                self.uow.after_commit(lambda business_id=business_id: metrics_cache.pop(business_id))
+            return len(events)
+
+    async def _apply_stripe_event(self, event: WebhookEvent) -> Subscription | None:
+        """
+        Aplica un evento de Stripe a la suscripción local. Devuelve la suscripción
+        afectada, o None si el evento no aplica (tipo no manejado, suscripción desconocida
+        o evento de suscripción desactualizado).
+
+        Stripe no garantiza el orden de entrega: un evento más viejo que el último aplicado
+        (provider_event_at) ya no cambia el estado. Los cobros de invoices se registran
+        igual (son idempotentes y un cobro exitoso no retrocede).
+        """
+        if event.subject_ref is None:
+            return None
+        subscription = await self.sub_service.get_by_stripe_id(event.subject_ref)
+        if subscription is None:
+            return None
+        obj = event.payload["data"]["object"]
+        last_applied = subscription.provider_event_at
+        is_current = last_applied is None or event.occurred_at >= last_applied
+
+        if event.event_type in SUBSCRIPTION_EVENTS:
+            if event.event_type == "customer.subscription.deleted":
+                new_status = SubscriptionStatus.CANCELED
+            else:
+                new_status = STRIPE_SUBSCRIPTION_STATUSES.get(obj.get("status"))
+            if new_status is None or not is_current:
+                return None
+            # Una cancelación en Stripe es definitiva: un evento del mismo segundo no la revierte
+            if (
+                subscription.status == SubscriptionStatus.CANCELED
+                and new_status != SubscriptionStatus.CANCELED
+                and event.occurred_at == last_applied
+            ):
+                return None
+            await self.sub_service.apply_provider_event(
+                subscription, event.occurred_at, new_status, stripe_period_end(obj)
+            )
+
+        elif event.event_type in INVOICE_PAID_EVENTS:
+            await self._record_invoice(subscription, obj, "succeeded", obj.get("amount_paid"))
+            if is_current:
+                new_status = None
+                if subscription.status in (SubscriptionStatus.PAST_DUE, SubscriptionStatus.INCOMPLETE):
+                    new_status = SubscriptionStatus.ACTIVE
+                # El invoice pagado ya dice hasta cuándo cubre: no depende de customer.subscription.updated
+                period_end = stripe_invoice_period_end(obj)
+                current_end = subscription.current_period_end
+                if period_end is not None and current_end is not None and period_end <= current_end:
+                    period_end = None
+                await self.sub_service.apply_provider_event(subscription, event.occurred_at, new_status, period_end)
+
+        elif event.event_type in INVOICE_FAILED_EVENTS:
+            # Si el invoice ya estaba cobrado (reintento exitoso del mismo segundo), no hay mora
+            recorded = await self._record_invoice(subscription, obj, "failed", obj.get("amount_due"))
+            if recorded and is_current:
+                new_status = None
+                if subscription.status == SubscriptionStatus.ACTIVE:
+                    new_status = SubscriptionStatus.PAST_DUE
+                await self.sub_service.apply_provider_event(subscription, event.occurred_at, new_status)
+
+        else:
+            return None
+        return subscription
+
+    async def _record_invoice(
+        self, subscription: Subscription, invoice: dict[str, Any], payment_status: str, amount_cents: int | None
+    ) -> bool:
+        return await self.sub_service.upsert_invoice_payment({
+            "subscription_id": subscription.id,
+            "stripe_invoice_id": invoice["id"],
+            "amount": Decimal(amount_cents or 0).scaleb(-2),
+            "status": payment_status,
+        })
@@ -0,0 +1,19 @@
+from app.application.command.Inventory import InventoryCommands
+from app.core.config import settings
+from app.domain.schemas.inventory import MaterializeResult
+from app.infrastructure.database.database import async_session
+from app.infrastructure.database.locks import try_advisory_xact_lock
+
+
+async def materialize_inventory_templates() -> MaterializeResult | None:
+    """
+    Job: asegura que existan los DailyInventory de los próximos días según las
+    plantillas semanales, para que las consultas de disponibilidad no encuentren huecos.
+    Cada worker lo programa, pero el advisory lock hace que solo uno lo ejecute a la vez;
+    los demás devuelven None (no se loguea).
+    """
+    async with async_session() as db:
+        # El lock vive en la misma transacción que el INSERT y se libera con su commit
+        if not await try_advisory_xact_lock(db, "materialize_inventory_templates"):
+            return None
+        return await InventoryCommands(db).materialize_templates(settings.INVENTORY_TEMPLATES_DAYS_AHEAD)
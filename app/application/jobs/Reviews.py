@@ -0,0 +1,26 @@
+"""
+Job de backfill de los agregados de calificaciones (RatingAggregate).
+Se ejecuta una vez al desplegar la tabla, o cuando haya que reconciliar los agregados
+con las reseñas (ej. tras borrar reseñas a mano):
+
+    uv run python -m app.application.jobs.Reviews
+"""
+import asyncio
+import logging
+
+from app.application.command.Review import ReviewCommands
+from app.infrastructure.database.database import async_session
+
+logger = logging.getLogger("jobs")
+
+
+async def backfill_rating_aggregates() -> int:
+    """Job: recalcula desde cero todos los agregados de calificaciones."""
+    async with async_session() as db:
+        return await ReviewCommands(db).rebuild_rating_aggregates()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    rows = asyncio.run(backfill_rating_aggregates())
+    logger.info(f"✅ Agregados de calificaciones recalculados: {rows} filas")
@@ -0,0 +1,51 @@
+"""
+Jobs de suscripciones: generación de los pedidos recurrentes y barrido de fin de periodo.
+Corren periódicamente dentro de la app; la generación también se puede lanzar a mano para un día:
+
+    uv run python -m app.application.jobs.Subscriptions [YYYY-MM-DD]
+"""
+import asyncio
+import logging
+import sys
+from datetime import date, timedelta
+
+from app.application.command.Subscription import SubscriptionCommands
+from app.core.config import settings
+from app.domain.schemas.suscriptions import (
+    SubscriptionOrdersResult,
+    SubscriptionSweepResult,
+)
+from app.infrastructure.database.database import async_session
+
+logger = logging.getLogger("jobs")
+
+
+async def generate_subscription_orders(target_date: date | None = None) -> SubscriptionOrdersResult:
+    """
+    Job: genera los pedidos de las suscripciones con recogida en target_date (por defecto
+    dentro de SUBSCRIPTION_ORDERS_DAYS_AHEAD días). Varios workers pueden ejecutarlo a la
+    vez: cada tanda bloquea sus suscripciones con SKIP LOCKED y last_generated_date
+    impide generar dos veces el mismo día.
+    """
+    if target_date is None:
+        target_date = date.today() + timedelta(days=settings.SUBSCRIPTION_ORDERS_DAYS_AHEAD)
+    async with async_session() as db:
+        return await SubscriptionCommands(db).generate_orders(target_date)
+
+
+async def sweep_subscription_periods() -> SubscriptionSweepResult | None:
+    """
+    Job: renueva, vence (PAST_DUE) o cancela las suscripciones cuyo periodo terminó.
+    Cada nodo lo programa; las tandas se reparten con SKIP LOCKED.
+    Devuelve None si no había suscripciones vencidas.
+    """
+    async with async_session() as db:
+        result = await SubscriptionCommands(db).sweep_periods()
+    return result if result.processed else None
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    day = date.fromisoformat(sys.argv[1]) if len(sys.argv) > 1 else None
+    result = asyncio.run(generate_subscription_orders(day))
+    logger.info(f"✅ Pedidos de suscripción: {result.model_dump_json()}")
@@ -0,0 +1,31 @@
+"""
+Workers que aplican los webhooks de la pasarela guardados en la cola (tabla webhookevent).
+Corren periódicamente dentro de la app (WEBHOOK_WORKERS por proceso) y también se puede
+vaciar la cola a mano:
+
+    uv run python -m app.application.jobs.Webhooks
+"""
+import asyncio
+import logging
+
+from app.application.command.Webhook import WebhookCommands
+from app.domain.schemas.webhooks import WebhookProcessResult
+from app.infrastructure.database.database import async_session
+
+logger = logging.getLogger("jobs")
+
+
+async def process_webhook_events() -> WebhookProcessResult | None:
+    """
+    Job: aplica los eventos pendientes hasta vaciar la cola. Devuelve None si no había
+    nada que hacer (así los workers en espera no llenan el log en cada vuelta).
+    """
+    async with async_session() as db:
+        result = await WebhookCommands(db).process_events()
+    return result if result.claimed else None
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    result = asyncio.run(process_webhook_events())
+    logger.info(f"✅ Webhooks: {result.model_dump_json() if result else 'cola vacía'}")
@@ -0,0 +1,53 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger("jobs")
+
+
+@dataclass(frozen=True)
+class PeriodicJob:
+    """Tarea en segundo plano que se ejecuta al arrancar y luego cada `interval_seconds`."""
+    name: str
+    interval_seconds: float
+    run: Callable[[], Awaitable[Any]]
+
+
+async def run_once(name: str, run: Callable[[], Awaitable[Any]]) -> None:
+    """
+    Ejecuta una vuelta de un job y loguea su resultado; un fallo se loguea y no se propaga.
+    Un job que devuelve None (no había trabajo) no se loguea.
+    """
+    try:
+        result = await run()
+        if result is not None:
+            logger.info(f"🕒 Job {name}: {result}")
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        logger.exception(f"❌ Job {name} falló")
+
+
+async def run_periodically(job: PeriodicJob) -> None:
+    """Bucle del job: un fallo se loguea y se reintenta en la siguiente vuelta (ver run_once)."""
+    while True:
+        await run_once(job.name, job.run)
+        await asyncio.sleep(job.interval_seconds)
+
+
+@asynccontextmanager
+async def run_jobs(jobs: Sequence[PeriodicJob]) -> AsyncIterator[None]:
+    """
+    Arranca los jobs como tareas de asyncio durante el ciclo de vida de la app
+    (uso: dentro del lifespan) y los cancela al apagar.
+    """
+    tasks = [asyncio.create_task(run_periodically(job), name=job.name) for job in jobs]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
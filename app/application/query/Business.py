@@ -1,11 +1,18 @@
 import uuid
 from collections.abc import Sequence
+from datetime import date
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.services.BusinessService import BusinessService
+from app.application.services.StorefrontService import (
+    CachedMenu,
+    StorefrontService,
+    menu_cache,
+)
 from app.domain.models.models import Business
+from app.domain.schemas.pagination import Page, PageRequest
 
 
 class BusinessQueries:
@@ -16,6 +23,7 @@ class BusinessQueries:
     def __init__(self, db: AsyncSession):
         # Según la definición de tu BusinessService, este recibe la sesión de DB
         self.service = BusinessService(db)
+        self.storefront_service = StorefrontService(db)
 
     async def get_business(self, business_id: uuid.UUID) -> Business:
         """
@@ -44,11 +52,29 @@ class BusinessQueries:
         """
         return await self.service.get_owner_businesses(owner_id)
 
-    async def list_all_businesses(self) -> Sequence[Business] | None:
+    async def list_all_businesses(self, page: PageRequest) -> Page[Business]:
         """
         Query: Lista todos los negocios del sistema (podría ser útil para un SuperAdmin).
         """
-        return await self.service.list_all()
+        return await self.service.list_page(page)
     
     async def get_business_hours(self, business_id: uuid.UUID):
-        return await self.service.get_business_hours(business_id)
\ No newline at end of file
+        return await self.service.get_business_hours(business_id)
+
+    async def get_storefront_menu(self, slug: str) -> CachedMenu:
+        """
+        Query: Menú completo de la tienda para hoy.
+        Se sirve desde la caché en memoria; solo se consulta la base de datos si no hay
+        copia vigente (primera visita, TTL vencido o invalidación por un Command).
+        """
+        today = date.today()
+        cached = menu_cache.get(slug, today)
+        if cached:
+            return cached
+
+        generation = menu_cache.generation
+        try:
+            menu, entity_ids = await self.storefront_service.build_menu(slug, today)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        return menu_cache.put(slug, today, menu, entity_ids, generation)
@@ -1,12 +1,23 @@
 import uuid
+from collections import defaultdict
 from collections.abc import Sequence
-from datetime import date
+from datetime import date, timedelta
+from decimal import Decimal
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.services.InventoryService import InventoryService
-from app.domain.models.models import DailyInventory
+from app.domain.models.models import DailyInventory, InventoryTemplate
+from app.domain.schemas.inventory import (
+    AvailabilityMatrix,
+    CartLineResult,
+    CartLineStatus,
+    CartValidationRequest,
+    CartValidationResult,
+    ProductionPlan,
+    ProductionPlanLine,
+)
 
 
 class InventoryQueries:
@@ -41,6 +52,66 @@ class InventoryQueries:
         """Query: Lista el historial de stock de un producto."""
         return await self.service.get_history_by_item(item_id)
 
+    async def get_item_templates(self, item_id: uuid.UUID) -> Sequence[InventoryTemplate]:
+        """Query: Plantilla semanal de stock de un producto."""
+        return await self.service.get_templates(item_id)
+
+    async def get_availability_matrix(self, business_id: uuid.UUID, date_from: date, days: int) -> AvailabilityMatrix:
+        """
+        Query: Matriz productos x fechas del stock de un negocio en una sola consulta.
+        Pensada para pantallas de planificación y el selector de fecha de la tienda.
+        """
+        dates = [date_from + timedelta(days=offset) for offset in range(days)]
+        rows = await self.service.get_business_stock_grid(business_id, dates[0], dates[-1])
+
+        column_of = {day: index for index, day in enumerate(dates)}
+        item_ids: list[uuid.UUID] = []
+        item_names: list[str] = []
+        produced: list[list[int | None]] = []
+        available: list[list[int | None]] = []
+        for row in rows:
+            # Las filas llegan ordenadas por producto: una fila nueva de la matriz por cada uno
+            if not item_ids or item_ids[-1] != row["item_id"]:
+                item_ids.append(row["item_id"])
+                item_names.append(row["name"])
+                produced.append([None] * days)
+                available.append([None] * days)
+            if row["date"] is not None:
+                produced[-1][column_of[row["date"]]] = row["quantity_produced"]
+                available[-1][column_of[row["date"]]] = row["quantity_available"]
+
+        return AvailabilityMatrix(
+            business_id=business_id,
+            dates=dates,
+            item_ids=item_ids,
+            item_names=item_names,
+            produced=produced,
+            available=available,
+        )
+
+    async def get_production_plan(self, business_id: uuid.UUID, date_from: date, days: int) -> ProductionPlan:
+        """
+        Query: Demanda por producto y día (pedidos confirmados + suscripciones proyectadas)
+        frente a la producción registrada, calculada en una sola consulta.
+        """
+        date_to = date_from + timedelta(days=days - 1)
+        rows = await self.service.get_production_demand(business_id, date_from, date_to)
+        lines = []
+        for row in rows:
+            required = row["ordered"] + row["projected"]
+            produced = row["produced"]
+            lines.append(ProductionPlanLine(
+                item_id=row["item_id"],
+                item_name=row["name"],
+                date=row["date"],
+                ordered=row["ordered"],
+                projected=row["projected"],
+                required=required,
+                produced=produced,
+                gap=None if produced is None else produced - required,
+            ))
+        return ProductionPlan(business_id=business_id, date_from=date_from, date_to=date_to, lines=lines)
+
     async def check_item_availability(self, item_id: uuid.UUID, target_date: date, requested_qty: int) -> dict:
         """
         Query: Evalúa si un producto puede ser vendido en una fecha según la cantidad solicitada.
@@ -52,4 +123,52 @@ class InventoryQueries:
             "date": target_date,
             "requested_quantity": requested_qty,
             "is_available": is_available
-        }
\ No newline at end of file
+        }
+
+    async def validate_cart(self, cart: CartValidationRequest) -> CartValidationResult:
+        """
+        Query: Valida un carrito completo con una sola consulta, aplicando las mismas
+        reglas que OrderCommands.create_order: el producto debe existir, no estar
+        eliminado y pertenecer al negocio, y el stock del día debe cubrir la suma de
+        todas las líneas de ese producto. El total suma las líneas con producto válido
+        a los precios actuales.
+        """
+        requested_qty: dict[tuple[uuid.UUID, date], int] = defaultdict(int)
+        for line in cart.items:
+            requested_qty[(line.item_id, line.date)] += line.quantity
+
+        snapshot = await self.service.get_cart_snapshot(cart.business_id, list(requested_qty))
+
+        total = Decimal("0.00")
+        lines = []
+        for line in cart.items:
+            key = (line.item_id, line.date)
+            row = snapshot.get(key)
+            if row is None or row["price"] is None:
+                lines.append(CartLineResult(
+                    item_id=line.item_id, date=line.date, quantity=line.quantity,
+                    status=CartLineStatus.NOT_FOUND
+                ))
+                continue
+
+            available = row["quantity_available"]
+            in_stock = available is not None and available >= requested_qty[key]
+            line_total = row["price"] * line.quantity
+            total += line_total
+            lines.append(CartLineResult(
+                item_id=line.item_id,
+                date=line.date,
+                quantity=line.quantity,
+                status=CartLineStatus.OK if in_stock else CartLineStatus.OUT_OF_STOCK,
+                name=row["name"],
+                unit_price=row["price"],
+                line_total=line_total,
+                quantity_available=available,
+            ))
+
+        return CartValidationResult(
+            business_id=cart.business_id,
+            is_valid=all(line.status == CartLineStatus.OK for line in lines),
+            total=total,
+            lines=lines,
+        )
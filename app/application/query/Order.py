@@ -1,11 +1,14 @@
 import uuid
-from collections.abc import Sequence
+from collections.abc import AsyncIterator
+from datetime import date
 
 from fastapi import HTTPException, status
+from sqlalchemy import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.services.OrdersService import OrdersService
 from app.domain.models.models import Order, OrderStatus
+from app.domain.schemas.pagination import Page, PageRequest
 
 
 class OrderQueries:
@@ -26,10 +29,20 @@ class OrderQueries:
             )
         return order
 
-    async def get_business_orders(self, business_id: uuid.UUID, status_filter: OrderStatus | None = None) -> Sequence[Order]:
+    async def get_business_orders(self, business_id: uuid.UUID, page: PageRequest, status_filter: OrderStatus | None = None) -> Page[Order]:
         """Query: Lista los pedidos de un negocio (Ideal para el panel de administración del local)."""
-        return await self.service.get_business_orders(business_id, status_filter)
+        return await self.service.get_business_orders(business_id, page, status_filter)
 
-    async def get_user_orders(self, user_id: uuid.UUID) -> Sequence[Order]:
+    async def get_user_orders(self, user_id: uuid.UUID, page: PageRequest) -> Page[Order]:
         """Query: Lista el historial de compras de un cliente (Ideal para la sección 'Mis Pedidos' del usuario)."""
-        return await self.service.get_user_orders(user_id)
\ No newline at end of file
+        return await self.service.get_user_orders(user_id, page)
+
+    def export_business_orders(
+        self,
+        business_id: uuid.UUID,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        status_filter: OrderStatus | None = None,
+    ) -> AsyncIterator[RowMapping]:
+        """Query: Flujo de pedidos de un negocio para exportar (contabilidad), sin cargarlo todo en memoria."""
+        return self.service.stream_business_orders(business_id, date_from, date_to, status_filter)
@@ -1,10 +1,17 @@
 import uuid
-from collections.abc import Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.application.services.RatingService import STARS, RatingService, average
 from app.application.services.ReviewService import ReviewService
-from app.domain.models.models import ItemReview, OrderReview, StaffReview
+from app.domain.models.models import ItemReview, OrderReview, RatingSubject, StaffReview
+from app.domain.schemas.pagination import PageRequest
+from app.domain.schemas.reviews import (
+    RatingDimensionSummary,
+    RatingSummary,
+    ReviewFeed,
+    ReviewFilter,
+)
 
 
 class ReviewQueries:
@@ -13,15 +20,49 @@ class ReviewQueries:
     """
     def __init__(self, db: AsyncSession):
         self.service = ReviewService(db)
+        self.rating_service = RatingService(db)
 
-    async def get_business_reviews(self, business_id: uuid.UUID) -> Sequence[OrderReview]:
+    async def get_business_reviews(
+        self, business_id: uuid.UUID, page: PageRequest, filters: ReviewFilter | None = None
+    ) -> ReviewFeed[OrderReview]:
         """Query: Lista las reseñas generales que tiene un negocio (logística/atención/ubicación)."""
-        return await self.service.get_business_reviews(business_id)
+        result = await self.service.get_business_reviews(business_id, page, filters)
+        summary = await self.get_rating_summary(RatingSubject.BUSINESS, business_id)
+        return ReviewFeed(items=result.items, next_cursor=result.next_cursor, summary=summary)
 
-    async def get_item_reviews(self, item_id: uuid.UUID) -> Sequence[ItemReview]:
+    async def get_item_reviews(
+        self, item_id: uuid.UUID, page: PageRequest, filters: ReviewFilter | None = None
+    ) -> ReviewFeed[ItemReview]:
         """Query: Lista las reseñas específicas sobre la calidad de un producto del catálogo."""
-        return await self.service.get_item_reviews(item_id)
+        result = await self.service.get_item_reviews(item_id, page, filters)
+        summary = await self.get_rating_summary(RatingSubject.ITEM, item_id)
+        return ReviewFeed(items=result.items, next_cursor=result.next_cursor, summary=summary)
 
-    async def get_staff_reviews(self, staff_id: uuid.UUID) -> Sequence[StaffReview]:
+    async def get_staff_reviews(
+        self, staff_id: uuid.UUID, page: PageRequest, filters: ReviewFilter | None = None
+    ) -> ReviewFeed[StaffReview]:
         """Query: Lista las reseñas directas hacia un profesional (barbero, entrenador, etc)."""
-        return await self.service.get_staff_reviews(staff_id)
\ No newline at end of file
+        result = await self.service.get_staff_reviews(staff_id, page, filters)
+        summary = await self.get_rating_summary(RatingSubject.STAFF, staff_id)
+        return ReviewFeed(items=result.items, next_cursor=result.next_cursor, summary=summary)
+
+    async def get_rating_summary(self, subject_type: RatingSubject, subject_id: uuid.UUID) -> RatingSummary:
+        """
+        Query: Resumen de calificaciones (promedio e histograma por dimensión) leído de
+        los agregados precalculados, sin recorrer las reseñas. Sin reseñas = count 0.
+        """
+        aggregates = await self.rating_service.get_aggregates(subject_type, subject_id)
+        return RatingSummary(
+            subject_type=subject_type,
+            subject_id=subject_id,
+            count=max((aggregate.count for aggregate in aggregates), default=0),
+            dimensions=[
+                RatingDimensionSummary(
+                    dimension=aggregate.dimension,
+                    count=aggregate.count,
+                    average=average(aggregate),
+                    histogram=[getattr(aggregate, f"stars_{n}") for n in STARS],
+                )
+                for aggregate in aggregates
+            ],
+        )
@@ -1,11 +1,27 @@
 import uuid
 from collections.abc import Sequence
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.application.services.SubscriptionsService import SubscriptionService
-from app.domain.models.models import Subscription
+from app.application.services.SubscriptionsService import (
+    PAYMENT_FAILED_STATUSES,
+    PAYMENT_SUCCEEDED_STATUSES,
+    SubscriptionService,
+    metrics_cache,
+)
+from app.core.config import settings
+from app.domain.models.models import Subscription, SubscriptionStatus
+from app.domain.schemas.pagination import Page, PageRequest
+from app.domain.schemas.suscriptions import (
+    SubscriptionMetrics,
+    SubscriptionStatusBreakdown,
+)
+
+# Recogidas por mes de una suscripción con una recogida semanal
+WEEKS_PER_MONTH = Decimal(52) / 12
 
 
 class SubscriptionQueries:
@@ -26,10 +42,67 @@ class SubscriptionQueries:
             )
         return sub
 
-    async def get_user_history(self, user_id: uuid.UUID) -> Sequence[Subscription]:
+    async def get_user_history(self, user_id: uuid.UUID, page: PageRequest) -> Page[Subscription]:
         """Query: Lista todas las membresías (activas, canceladas o pasadas) de un cliente."""
-        return await self.service.get_user_subscriptions(user_id)
+        return await self.service.get_user_subscriptions(user_id, page)
+
+    async def get_business_active_subs(self, business_id: uuid.UUID, page: PageRequest, active_only: bool = True) -> Page[Subscription]:
+        """Query: Lista las membresías de un negocio (Ideal para paneles de administración; el MRR está en get_metrics)."""
+        return await self.service.get_business_subscriptions(business_id, page, active_only)
+
+    async def get_business_due_subscriptions(self, business_id: uuid.UUID, target_date: date) -> Sequence[Subscription]:
+        """Query: Suscripciones activas de un negocio con recogida ese día (planificación diaria)."""
+        return await self.service.get_business_due_subscriptions(business_id, target_date.weekday())
+
+    async def get_metrics(self, business_id: uuid.UUID) -> SubscriptionMetrics:
+        """
+        Query: MRR, activas, canceladas y desglose por estado de un negocio, a partir de
+        dos agregaciones en SQL (suscripciones y cobros). Se cachea por negocio unos
+        segundos (SUBSCRIPTION_METRICS_TTL_SECONDS): los paneles lo refrescan a menudo.
+        """
+        cached = metrics_cache.get(business_id)
+        if cached is not None:
+            return cached
+
+        by_status: dict[SubscriptionStatus, SubscriptionStatusBreakdown] = {}
+        mrr, active_count = Decimal("0"), 0
+        for group in await self.service.get_subscription_value_groups(business_id):
+            pickups_per_week = bin(group.weekday_mask).count("1")
+            monthly_value = Decimal(group.value) * pickups_per_week * WEEKS_PER_MONTH
+            breakdown = by_status.setdefault(
+                group.status,
+                SubscriptionStatusBreakdown(status=group.status, count=0, monthly_value=Decimal("0")),
+            )
+            breakdown.count += group.count
+            breakdown.monthly_value += monthly_value
+            # MRR y activas con la misma definición: ACTIVE y sin pausar (is_active)
+            if group.status == SubscriptionStatus.ACTIVE and group.is_active:
+                mrr += monthly_value
+                active_count += group.count
+
+        window_days = settings.SUBSCRIPTION_METRICS_PAYMENTS_WINDOW_DAYS
+        since = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=window_days)
+        collected, failed = Decimal("0"), 0
+        for payment in await self.service.get_payment_totals(business_id, since):
+            if payment.status in PAYMENT_SUCCEEDED_STATUSES:
+                collected += Decimal(payment.amount)
+            elif payment.status in PAYMENT_FAILED_STATUSES:
+                failed += payment.count
 
-    async def get_business_active_subs(self, business_id: uuid.UUID, active_only: bool = True) -> Sequence[Subscription]:
-        """Query: Lista las membresías de un negocio (Ideal para paneles de administración y calcular ingresos recurrentes)."""
-        return await self.service.get_business_subscriptions(business_id, active_only)
\ No newline at end of file
+        cent = Decimal("0.01")
+        for breakdown in by_status.values():
+            breakdown.monthly_value = breakdown.monthly_value.quantize(cent)
+        churned = by_status.get(SubscriptionStatus.CANCELED)
+        metrics = SubscriptionMetrics(
+            business_id=business_id,
+            mrr=mrr.quantize(cent),
+            active_count=active_count,
+            churned_count=churned.count if churned else 0,
+            by_status=sorted(by_status.values(), key=lambda breakdown: breakdown.status),
+            payments_window_days=window_days,
+            collected_amount=collected.quantize(cent),
+            failed_payments=failed,
+            computed_at=datetime.now(UTC),
+        )
+        metrics_cache.set(business_id, metrics)
+        return metrics
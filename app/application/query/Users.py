@@ -1,9 +1,9 @@
 import uuid
-from collections.abc import Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.models.models import User
+from app.domain.schemas.pagination import Page, PageRequest
 from app.infrastructure.repositories.user_repo import UserRepository
 
 
@@ -23,6 +23,6 @@ class UserQueries:
         """Query: Busca por teléfono."""
         return await self.repo.get_by_phone(phone)
 
-    async def list_active_users(self) -> Sequence[User] | None:
+    async def list_active_users(self, page: PageRequest) -> Page[User]:
         """Query: Lista usuarios que no han sido borrados lógicamente."""
-        return await self.repo.list_all()
\ No newline at end of file
+        return await self.repo.list_page(page)
\ No newline at end of file
@@ -1,10 +1,14 @@
 import uuid
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
+from datetime import date
 
+from sqlalchemy import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.services.WalletService import WalletService
 from app.domain.models.models import RechargePlan, Wallet, WalletTransaction
+from app.domain.schemas.pagination import Page, PageRequest
+from app.infrastructure.database.unit_of_work import UnitOfWork
 
 
 class WalletQueries:
@@ -14,11 +18,22 @@ class WalletQueries:
 
     async def get_user_balance(self, user_id: uuid.UUID, business_id: uuid.UUID) -> Wallet:
         """Query: Obtiene el saldo actual de un usuario en un negocio (o lo crea en 0)."""
-        return await self.service.get_or_create_wallet(user_id, business_id)
+        # Única Query que puede escribir: confirma el monedero recién creado
+        async with UnitOfWork(self.service.db):
+            return await self.service.get_or_create_wallet(user_id, business_id)
 
-    async def get_transaction_history(self, wallet_id: uuid.UUID) -> Sequence[WalletTransaction]:
+    async def get_transaction_history(self, wallet_id: uuid.UUID, page: PageRequest) -> Page[WalletTransaction]:
         """Query: Obtiene el libro mayor de movimientos de un monedero."""
-        return await self.service.get_wallet_transactions(wallet_id)
+        return await self.service.get_wallet_transactions(wallet_id, page)
+
+    def export_transaction_history(
+        self,
+        wallet_id: uuid.UUID,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> AsyncIterator[RowMapping]:
+        """Query: Flujo del libro mayor para exportar (contabilidad), sin cargarlo todo en memoria."""
+        return self.service.stream_wallet_transactions(wallet_id, date_from, date_to)
 
     async def get_active_recharge_plans(self, business_id: uuid.UUID) -> Sequence[RechargePlan]:
         """Query: Lista los planes de recarga disponibles para comprar en un negocio."""
@@ -7,6 +7,7 @@ from app.core.security.SocialAuthService import SocialAuthService
 from app.domain.models.models import User
 from app.domain.schemas.auth import LoginRequest, SocialLoginRequest, Token
 from app.domain.services.service import IAuthService
+from app.infrastructure.database.unit_of_work import UnitOfWork
 from app.infrastructure.repositories.user_repo import UserRepository
 
 
@@ -59,30 +60,31 @@ class AuthService(BaseService[User],IAuthService):
                 detail="No se pudo validar la identidad con el proveedor externo."
             )
 
-        # 2. Buscar si el usuario ya existe mediante su ID social único
-        user = await self.user_repo.get_by_social_id(data.provider, social_data["social_id"])
+        # 2-4. Vincular o registrar al usuario en una sola transacción
+        async with UnitOfWork(self.db):
+            # 2. Buscar si el usuario ya existe mediante su ID social único
+            user = await self.user_repo.get_by_social_id(data.provider, social_data["social_id"])
         
-        # 3. Si no existe por ID social, intentamos vincular por Email (si está disponible)
-        if not user and social_data.get("email"):
-            user = await self.user_repo.get_by_email(social_data["email"])
-            if user:
-                # El usuario ya existía; vinculamos la cuenta social para futuros inicios de sesión
-                setattr(user, f"{data.provider.value}_id", social_data["social_id"])
-                # Actualizamos datos opcionales
-                user.full_name = user.full_name or social_data.get("full_name")
-                user.image_url = user.image_url or social_data.get("image_url")
-                await self.db.commit()
+            # 3. Si no existe por ID social, intentamos vincular por Email (si está disponible)
+            if not user and social_data.get("email"):
+                user = await self.user_repo.get_by_email(social_data["email"])
+                if user:
+                    # El usuario ya existía; vinculamos la cuenta social para futuros inicios de sesión
+                    setattr(user, f"{data.provider.value}_id", social_data["social_id"])
+                    # Actualizamos datos opcionales
+                    user.full_name = user.full_name or social_data.get("full_name")
+                    user.image_url = user.image_url or social_data.get("image_url")
 
-        # 4. Si el usuario sigue sin existir, lo registramos automáticamente (Registro Social)
-        if not user:
-            user = await self.user_repo.create_social_user(
-                provider=data.provider,
-                social_id=social_data["social_id"],
-                email=social_data.get("email") or data.email,
-                full_name=social_data.get("full_name") or data.full_name,
-                phone=data.phone if hasattr(data, 'phone') else None,
-                image_url=social_data.get("image_url"),
-            )
+            # 4. Si el usuario sigue sin existir, lo registramos automáticamente (Registro Social)
+            if not user:
+                user = await self.user_repo.create_social_user(
+                    provider=data.provider,
+                    social_id=social_data["social_id"],
+                    email=social_data.get("email") or data.email,
+                    full_name=social_data.get("full_name") or data.full_name,
+                    phone=data.phone if hasattr(data, 'phone') else None,
+                    image_url=social_data.get("image_url"),
+                )
 
         # 5. Emitir el JWT final de nuestra plataforma
         access_token = create_access_token(subject=user.id)
@@ -3,6 +3,7 @@ from collections.abc import Sequence
 from typing import Any, Generic, TypeVar
 
 from app.domain.repositories.repositories import IBaseRepository
+from app.domain.schemas.pagination import Page, PageRequest
 from app.domain.services.service import IService
 
 ModelType = TypeVar("ModelType")
@@ -21,6 +22,9 @@ class BaseService(IService[ModelType], Generic[ModelType]):
     async def list_all(self) -> Sequence[ModelType] | None:
         return await self.repository.list_all()
 
+    async def list_page(self, page: PageRequest) -> Page[ModelType]:
+        return await self.repository.list_page(page)
+
     async def create(self, data: Any) -> ModelType:
         return await self.repository.create(data)
 
@@ -2,6 +2,7 @@ import uuid
 from collections.abc import Sequence
 
 from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import col, select
 
@@ -9,6 +10,7 @@ from app.application.services.BaseService import BaseService
 from app.domain.models.models import Business, BusinessHour  # Agregamos BusinessHour
 from app.domain.schemas.business import BusinessCreate
 from app.domain.services.service import IBusinessService
+from app.infrastructure.database.errors import is_unique_violation
 from app.infrastructure.repositories.base import BaseRepository  # Importante
 from app.infrastructure.repositories.business_repo import BusinessRepository
 
@@ -46,7 +48,15 @@ class BusinessService(BaseService[Business], IBusinessService):
             primary_color=data.primary_color,
             secondary_color=data.secondary_color
         )
-        return await self.create(new_business)
+        try:
+            return await self.create(new_business)
+        except IntegrityError as e:
+            if not is_unique_violation(e):
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"El identificador '{data.slug}' ya está registrado por otro comercio."
+            )
 
     async def get_owner_businesses(self, owner_id: uuid.UUID) -> Sequence[Business]:
         return await self.business_repo.get_by_owner(owner_id)
@@ -1,11 +1,12 @@
 import uuid
 from collections.abc import Sequence
+from datetime import date
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
+from sqlmodel import col, select
 
 from app.application.services.BaseService import BaseService
-from app.domain.models.models import Category, Item
+from app.domain.models.models import Category, DailyInventory, Item
 from app.domain.schemas.category import CategoryCreate, ItemCreate
 from app.domain.services.service import ICatalogService
 from app.infrastructure.repositories.base import BaseRepository
@@ -75,6 +76,19 @@ class CatalogService(BaseService[Item], ICatalogService):
         """Obtiene el detalle de un ítem por su ID."""
         return await self.get_by_id(item_id) # Heredado de BaseService
 
+    async def get_items_by_ids(self, item_ids: Sequence[uuid.UUID], business_id: uuid.UUID) -> Sequence[Item]:
+        """
+        Carga en una sola consulta todos los ítems vigentes de un negocio solicitados.
+        Los IDs inexistentes, borrados o de otro negocio simplemente no aparecen en el resultado.
+        """
+        statement = select(Item).where(
+            col(Item.id).in_(item_ids),
+            Item.business_id == business_id,
+            Item.deleted_at == None
+        )
+        result = await self.db.execute(statement)
+        return result.scalars().all()
+
     async def get_items_by_business(self, business_id: uuid.UUID) -> Sequence[Item]:
         """Obtiene el listado completo de productos/servicios de un negocio."""
         statement = select(Item).where(
@@ -84,6 +98,27 @@ class CatalogService(BaseService[Item], ICatalogService):
         result = await self.db.execute(statement)
         return result.scalars().all()
 
+    async def get_items_with_stock(
+        self, business_id: uuid.UUID, target_date: date
+    ) -> Sequence[tuple[Item, int | None]]:
+        """
+        Obtiene los productos de un negocio junto con su stock disponible en la fecha
+        indicada, en una sola consulta (LEFT JOIN: sin inventario registrado = None).
+        """
+        statement = (
+            select(Item, DailyInventory.quantity_available)
+            .outerjoin(
+                DailyInventory,
+                (col(DailyInventory.item_id) == Item.id)
+                & (col(DailyInventory.date) == target_date)
+                & (col(DailyInventory.deleted_at).is_(None)),
+            )
+            .where(Item.business_id == business_id, Item.deleted_at == None)
+            .order_by(col(Item.name))
+        )
+        result = await self.db.execute(statement)
+        return [(item, available) for item, available in result.all()]
+
     async def get_items_by_category(self, category_id: uuid.UUID) -> Sequence[Item]:
         """Filtra productos por una categoría específica."""
         statement = select(Item).where(
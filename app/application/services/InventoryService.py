@@ -1,17 +1,62 @@
 import uuid
 from collections.abc import Sequence
-from datetime import date
+from datetime import date, datetime, timedelta
 
 from fastapi import HTTPException, status
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Integer,
+    RowMapping,
+    Uuid,
+    and_,
+    cast,
+    column,
+    func,
+    literal,
+    literal_column,
+    null,
+    or_,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import col, select
 
 from app.application.services.BaseService import BaseService
-from app.domain.models.models import DailyInventory
-from app.domain.schemas.inventory import InventoryCreate
+from app.domain.models.models import (
+    DailyInventory,
+    InventoryTemplate,
+    Item,
+    Order,
+    OrderItem,
+    OrderStatus,
+    Subscription,
+    SubscriptionItem,
+    SubscriptionStatus,
+)
+from app.domain.schemas.inventory import (
+    BulkStockResult,
+    InventoryCreate,
+    StockReservationResult,
+)
 from app.domain.services.service import IInventoryService
 from app.infrastructure.repositories.base import BaseRepository
 
+# Filas por sentencia en los upserts masivos (7 parámetros por fila, asyncpg admite 32767)
+UPSERT_BATCH_ROWS = 1000
+
+# Pedidos que cuentan como demanda firme en la planificación de producción
+PLANNED_ORDER_STATUSES = (
+    OrderStatus.PAID,
+    OrderStatus.CONFIRMED,
+    OrderStatus.PREPARING,
+    OrderStatus.READY,
+    OrderStatus.COLLECTED,
+)
+
 
 class InventoryService(BaseService[DailyInventory], IInventoryService):
     """
@@ -22,6 +67,7 @@ class InventoryService(BaseService[DailyInventory], IInventoryService):
     def __init__(self, db: AsyncSession):
         self.db = db
         self.inventory_repo = BaseRepository(DailyInventory, db)
+        self.template_repo = BaseRepository(InventoryTemplate, db)
         # Inicializamos BaseService para permitir operaciones CRUD sobre el historial de inventario
         super().__init__(self.inventory_repo)
 
@@ -52,6 +98,147 @@ class InventoryService(BaseService[DailyInventory], IInventoryService):
         result = await self.db.execute(statement)
         return result.scalar_one_or_none()
 
+    async def get_by_items_and_date(
+        self, item_ids: Sequence[uuid.UUID], target_date: date, for_update: bool = False
+    ) -> Sequence[DailyInventory]:
+        """
+        Obtiene en una sola consulta el stock de varios productos para un mismo día.
+        Con for_update=True bloquea las filas (en orden de item_id para evitar deadlocks)
+        hasta que termine la transacción en curso.
+        """
+        statement = select(DailyInventory).where(
+            col(DailyInventory.item_id).in_(item_ids),
+            DailyInventory.date == target_date,
+            DailyInventory.deleted_at == None
+        ).order_by(col(DailyInventory.item_id))
+
+        if for_update:
+            statement = statement.with_for_update()
+
+        result = await self.db.execute(statement)
+        return result.scalars().all()
+
+    async def get_business_stock_grid(
+        self, business_id: uuid.UUID, date_from: date, date_to: date
+    ) -> Sequence[RowMapping]:
+        """
+        Stock de todos los productos activos de un negocio entre dos fechas, en una sola
+        consulta (item por ix_item_business_id, inventario por unique_item_stock_per_day).
+        Los productos sin inventario en el rango vuelven una vez con date = None.
+        """
+        statement = (
+            select(
+                col(Item.id).label("item_id"),
+                col(Item.name).label("name"),
+                col(DailyInventory.date).label("date"),
+                col(DailyInventory.quantity_produced).label("quantity_produced"),
+                col(DailyInventory.quantity_available).label("quantity_available"),
+            )
+            .outerjoin(DailyInventory, and_(
+                col(DailyInventory.item_id) == Item.id,
+                col(DailyInventory.date).between(date_from, date_to),
+                col(DailyInventory.deleted_at).is_(None),
+            ))
+            .where(Item.business_id == business_id, Item.deleted_at == None)
+            .order_by(col(Item.name), col(Item.id))
+        )
+        result = await self.db.execute(statement)
+        return result.mappings().all()
+
+    async def get_production_demand(
+        self, business_id: uuid.UUID, date_from: date, date_to: date
+    ) -> Sequence[RowMapping]:
+        """
+        Demanda por (producto, día) de un negocio en una sola consulta, sumando tres fuentes:
+
+            ordered:   líneas de pedidos confirmados con recogida ese día
+            projected: líneas de suscripciones activas que recogen ese día y cuyo pedido
+                       aún no se generó (last_generated_date anterior), para no contarlas dos veces
+            produced:  DailyInventory.quantity_produced (None si no hay inventario)
+
+        Cada fuente se agrega por separado (UNION ALL) y el resultado se reagrupa por
+        (producto, día); solo aparecen los pares con demanda o producción. Los NULL de
+        `produced` van tipados como Integer: Postgres resuelve la unión de dos en dos y un
+        NULL sin tipo se convertiría en text antes de llegar a quantity_produced.
+        """
+        days = func.generate_series(date_from, date_to, timedelta(days=1)).table_valued("day").render_derived(name="d")
+        day = cast(days.c.day, Date)
+        weekday_bit = literal(1).op("<<")(cast(func.extract("isodow", days.c.day), Integer) - 1)
+
+        pickup_day = cast(Order.pickup_slot, Date)
+        ordered = (
+            select(
+                col(OrderItem.item_id).label("item_id"),
+                pickup_day.label("day"),
+                func.sum(OrderItem.quantity).label("ordered"),
+                literal(0).label("projected"),
+                cast(null(), Integer).label("produced"),
+            )
+            .join(Order, col(Order.id) == OrderItem.order_id)
+            .where(
+                Order.business_id == business_id,
+                col(Order.pickup_slot) >= datetime.combine(date_from, datetime.min.time()),
+                col(Order.pickup_slot) < datetime.combine(date_to + timedelta(days=1), datetime.min.time()),
+                col(Order.status).in_(PLANNED_ORDER_STATUSES),
+                Order.deleted_at == None,
+                OrderItem.deleted_at == None,
+            )
+            .group_by(OrderItem.item_id, pickup_day)
+        )
+        projected = (
+            select(
+                col(SubscriptionItem.item_id).label("item_id"),
+                day.label("day"),
+                literal(0).label("ordered"),
+                func.sum(SubscriptionItem.quantity).label("projected"),
+                cast(null(), Integer).label("produced"),
+            )
+            .join(Subscription, col(Subscription.id) == SubscriptionItem.subscription_id)
+            .join(days, col(Subscription.weekday_mask).op("&")(weekday_bit) != 0)
+            .where(
+                Subscription.business_id == business_id,
+                Subscription.is_active == True,
+                Subscription.deleted_at == None,
+                col(Subscription.status).in_([SubscriptionStatus.ACTIVE, SubscriptionStatus.TRIALING]),
+                or_(col(Subscription.last_generated_date).is_(None), col(Subscription.last_generated_date) < day),
+                SubscriptionItem.deleted_at == None,
+            )
+            .group_by(SubscriptionItem.item_id, day)
+        )
+        produced = (
+            select(
+                col(DailyInventory.item_id).label("item_id"),
+                col(DailyInventory.date).label("day"),
+                literal(0).label("ordered"),
+                literal(0).label("projected"),
+                col(DailyInventory.quantity_produced).label("produced"),
+            )
+            .join(Item, col(Item.id) == DailyInventory.item_id)
+            .where(
+                Item.business_id == business_id,
+                Item.deleted_at == None,
+                col(DailyInventory.date).between(date_from, date_to),
+                DailyInventory.deleted_at == None,
+            )
+        )
+        demand = union_all(ordered, projected, produced).subquery("demand")
+
+        statement = (
+            select(
+                demand.c.item_id,
+                col(Item.name).label("name"),
+                demand.c.day.label("date"),
+                cast(func.sum(demand.c.ordered), Integer).label("ordered"),
+                cast(func.sum(demand.c.projected), Integer).label("projected"),
+                func.max(demand.c.produced).label("produced"),
+            )
+            .join(Item, col(Item.id) == demand.c.item_id)
+            .group_by(demand.c.item_id, Item.name, demand.c.day)
+            .order_by(demand.c.day, col(Item.name), demand.c.item_id)
+        )
+        result = await self.db.execute(statement)
+        return result.mappings().all()
+
     async def get_history_by_item(self, item_id: uuid.UUID) -> Sequence[DailyInventory]:
         """
         Obtiene todo el historial de inventario de un producto ordenado por fecha (más reciente primero).
@@ -90,6 +277,54 @@ class InventoryService(BaseService[DailyInventory], IInventoryService):
         )
         return await self.inventory_repo.create(new_inv)
 
+    async def bulk_set_daily_stock(self, entries: Sequence[tuple[uuid.UUID, date, int]]) -> BulkStockResult:
+        """
+        Versión masiva de set_daily_stock: fija producido y disponible de muchos
+        (producto, día) con INSERT ... ON CONFLICT sobre unique_item_stock_per_day,
+        en lotes de UPSERT_BATCH_ROWS filas por sentencia (límite de parámetros de asyncpg):
+
+            INSERT INTO dailyinventory (...) VALUES (...), (...)
+            ON CONFLICT ON CONSTRAINT unique_item_stock_per_day
+            DO UPDATE SET quantity_produced = EXCLUDED..., quantity_available = EXCLUDED...
+            RETURNING (xmax = 0)
+
+        xmax = 0 solo en las filas recién insertadas, lo que permite contar creadas y
+        actualizadas sin consultas previas. Un registro eliminado (soft delete) se reactiva.
+        No hace commit.
+        """
+        # Postgres no permite que un mismo INSERT toque dos veces la misma fila: gana el último
+        latest = {(item_id, target_date): quantity for item_id, target_date, quantity in entries}
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "item_id": item_id,
+                "date": target_date,
+                "quantity_produced": quantity,
+                "quantity_available": quantity,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for (item_id, target_date), quantity in latest.items()
+        ]
+
+        created = 0
+        for start in range(0, len(rows), UPSERT_BATCH_ROWS):
+            statement = insert(DailyInventory).values(rows[start:start + UPSERT_BATCH_ROWS])
+            statement = statement.on_conflict_do_update(
+                constraint="unique_item_stock_per_day",
+                set_={
+                    "quantity_produced": statement.excluded.quantity_produced,
+                    "quantity_available": statement.excluded.quantity_available,
+                    "updated_at": now,
+                    "deleted_at": None,
+                }
+            ).returning(literal_column("xmax = 0").label("inserted"))
+            result = await self.db.execute(statement)
+            created += sum(1 for inserted in result.scalars() if inserted)
+
+        return BulkStockResult(created=created, updated=len(rows) - created)
+
     async def check_availability(self, item_id: uuid.UUID, target_date: date, requested_qty: int) -> bool:
         """
         Verifica si hay suficiente existencia disponible para cubrir una solicitud.
@@ -104,4 +339,213 @@ class InventoryService(BaseService[DailyInventory], IInventoryService):
         if not inventory:
             return False
             
-        return inventory.quantity_available >= requested_qty
\ No newline at end of file
+        return inventory.quantity_available >= requested_qty
+
+    async def get_cart_snapshot(
+        self, business_id: uuid.UUID, keys: Sequence[tuple[uuid.UUID, date]]
+    ) -> dict[tuple[uuid.UUID, date], RowMapping]:
+        """
+        Obtiene en una sola consulta, para cada par (producto, fecha) del carrito, el
+        nombre y precio vigente del producto y su stock disponible ese día:
+
+            SELECT ... FROM (VALUES ...) AS cart(item_id, date)
+            LEFT JOIN item ON item.id = cart.item_id AND item.business_id = :negocio
+            LEFT JOIN dailyinventory ON dailyinventory.item_id = cart.item_id AND date = cart.date
+
+        Los productos eliminados o de otro negocio vuelven con name/price a None.
+        """
+        if not keys:
+            return {}
+
+        cart = values(
+            column("item_id", Uuid),
+            column("date", Date),
+            name="cart"
+        ).data(list(keys))
+
+        statement = (
+            select(
+                cart.c.item_id,
+                cart.c.date,
+                col(Item.name).label("name"),
+                col(Item.price).label("price"),
+                col(DailyInventory.quantity_available).label("quantity_available"),
+            )
+            .select_from(cart)
+            .outerjoin(Item, and_(
+                col(Item.id) == cart.c.item_id,
+                col(Item.business_id) == business_id,
+                col(Item.deleted_at).is_(None),
+            ))
+            .outerjoin(DailyInventory, and_(
+                col(DailyInventory.item_id) == cart.c.item_id,
+                col(DailyInventory.date) == cart.c.date,
+                col(DailyInventory.deleted_at).is_(None),
+            ))
+        )
+        result = await self.db.execute(statement)
+        return {(row["item_id"], row["date"]): row for row in result.mappings()}
+
+    async def reserve_stock(self, target_date: date, quantities: dict[uuid.UUID, int]) -> StockReservationResult:
+        """
+        Descuenta stock de varios productos con un único UPDATE condicionado:
+
+            UPDATE dailyinventory SET quantity_available = quantity_available - v.quantity
+            FROM (VALUES ...) AS v(item_id, quantity)
+            WHERE item_id = v.item_id AND date = :fecha AND quantity_available >= v.quantity
+
+        La comprobación y el descuento ocurren en la misma sentencia, así que dos pedidos
+        concurrentes nunca pueden sobrevender (el segundo espera el bloqueo de la fila y
+        vuelve a evaluar la condición). No hace commit: si la reserva no está completa,
+        el llamador decide si confirma o hace rollback.
+        """
+        if not quantities:
+            return StockReservationResult(date=target_date)
+
+        requested = values(
+            column("item_id", Uuid),
+            column("quantity", Integer),
+            name="requested"
+        ).data(list(quantities.items()))
+
+        statement = (
+            update(DailyInventory)
+            .where(
+                DailyInventory.item_id == requested.c.item_id,
+                DailyInventory.date == target_date,
+                DailyInventory.deleted_at == None,
+                DailyInventory.quantity_available >= requested.c.quantity
+            )
+            .values(quantity_available=DailyInventory.quantity_available - requested.c.quantity)
+            .returning(DailyInventory.item_id)
+            .execution_options(synchronize_session="fetch")
+        )
+        result = await self.db.execute(statement)
+        reserved = set(result.scalars().all())
+
+        return StockReservationResult(
+            date=target_date,
+            reserved=[item_id for item_id in quantities if item_id in reserved],
+            failed=[item_id for item_id in quantities if item_id not in reserved]
+        )
+
+    async def lock_stock(self, target_date: date, item_ids: Sequence[uuid.UUID]) -> dict[uuid.UUID, int]:
+        """
+        Lee y bloquea (SELECT ... FOR UPDATE) el stock de varios productos para un día.
+        Lo usan los procesos por lotes que reparten el stock entre muchos pedidos antes
+        de descontarlo con reserve_stock; el orden por item_id evita interbloqueos.
+        Los productos sin inventario ese día no aparecen en el resultado.
+        """
+        if not item_ids:
+            return {}
+        statement = (
+            select(DailyInventory.item_id, DailyInventory.quantity_available)
+            .where(
+                col(DailyInventory.item_id).in_(item_ids),
+                DailyInventory.date == target_date,
+                DailyInventory.deleted_at == None,
+            )
+            .order_by(col(DailyInventory.item_id))
+            .with_for_update()
+        )
+        result = await self.db.execute(statement)
+        return {item_id: available for item_id, available in result.all()}
+
+    # ==========================================
+    # PLANTILLAS SEMANALES
+    # ==========================================
+
+    async def get_templates(self, item_id: uuid.UUID) -> Sequence[InventoryTemplate]:
+        """Obtiene la plantilla semanal vigente de un producto, ordenada por día."""
+        statement = select(InventoryTemplate).where(
+            InventoryTemplate.item_id == item_id,
+            InventoryTemplate.deleted_at == None
+        ).order_by(col(InventoryTemplate.day_of_week))
+        result = await self.db.execute(statement)
+        return result.scalars().all()
+
+    async def replace_templates(self, item_id: uuid.UUID, quantities: dict[int, int]) -> Sequence[InventoryTemplate]:
+        """
+        Sustituye la plantilla semanal de un producto: hace upsert de los días indicados
+        (ON CONFLICT sobre unique_item_template_per_weekday) y da de baja los demás.
+        No hace commit.
+        """
+        now = datetime.utcnow()
+        if quantities:
+            statement = insert(InventoryTemplate).values([
+                {
+                    "id": uuid.uuid4(),
+                    "item_id": item_id,
+                    "day_of_week": day_of_week,
+                    "quantity": quantity,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for day_of_week, quantity in quantities.items()
+            ])
+            statement = statement.on_conflict_do_update(
+                constraint="unique_item_template_per_weekday",
+                set_={"quantity": statement.excluded.quantity, "updated_at": now, "deleted_at": None}
+            )
+            await self.db.execute(statement)
+
+        await self.db.execute(
+            update(InventoryTemplate)
+            .where(
+                InventoryTemplate.item_id == item_id,
+                col(InventoryTemplate.day_of_week).not_in(list(quantities)),
+                InventoryTemplate.deleted_at == None
+            )
+            .values(deleted_at=now, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        return await self.get_templates(item_id)
+
+    async def materialize_templates(self, date_from: date, date_to: date) -> int:
+        """
+        Crea los DailyInventory que falten en [date_from, date_to] a partir de las
+        plantillas semanales, con una sola sentencia:
+
+            INSERT INTO dailyinventory (...)
+            SELECT gen_random_uuid(), t.item_id, d.day, t.quantity, t.quantity, ...
+            FROM inventorytemplate t
+            JOIN item ON item.id = t.item_id AND item.deleted_at IS NULL
+            JOIN generate_series(:desde, :hasta, '1 day') AS d(day)
+              ON extract(isodow FROM d.day) = t.day_of_week + 1
+            ORDER BY t.item_id, d.day
+            ON CONFLICT ON CONSTRAINT unique_item_stock_per_day DO NOTHING
+
+        Es idempotente: nunca pisa un stock existente (ni uno ajustado a mano ni uno
+        dado de baja). El ORDER BY fija el orden de inserción para que dos ejecuciones
+        concurrentes no se bloqueen mutuamente. Devuelve cuántas filas creó. No hace commit.
+        """
+        days = func.generate_series(date_from, date_to, timedelta(days=1)).table_valued("day").render_derived(name="d")
+        day = cast(days.c.day, Date)
+        now = datetime.utcnow()
+
+        rows = (
+            select(
+                func.gen_random_uuid(),
+                InventoryTemplate.item_id,
+                day,
+                InventoryTemplate.quantity,
+                InventoryTemplate.quantity,
+                literal(now, DateTime),
+                literal(now, DateTime),
+            )
+            .join(Item, and_(col(Item.id) == InventoryTemplate.item_id, col(Item.deleted_at).is_(None)))
+            .join(days, func.extract("isodow", days.c.day) == InventoryTemplate.day_of_week + 1)
+            .where(InventoryTemplate.deleted_at == None)
+            .order_by(col(InventoryTemplate.item_id), day)
+        )
+        statement = (
+            insert(DailyInventory)
+            .from_select(
+                ["id", "item_id", "date", "quantity_produced", "quantity_available", "created_at", "updated_at"],
+                rows,
+            )
+            .on_conflict_do_nothing(constraint="unique_item_stock_per_day")
+            .returning(DailyInventory.id)
+        )
+        result = await self.db.execute(statement)
+        return len(result.scalars().all())
@@ -1,14 +1,24 @@
 import uuid
-from collections.abc import Sequence
+from collections.abc import AsyncIterator
+from datetime import date
 
+from sqlalchemy import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import col, select
 
 from app.application.services.BaseService import BaseService
 from app.domain.models.models import Order, OrderItem, OrderStatus
+from app.domain.schemas.orders import ORDER_EXPORT_FIELDS
+from app.domain.schemas.pagination import Page, PageRequest
 from app.domain.services.service import IOrderService
-from app.infrastructure.repositories.base import BaseRepository
+from app.infrastructure.repositories.base import (
+    BaseRepository,
+    created_between,
+    paginate,
+    stream_rows,
+)
 
 
 class OrdersService(BaseService[Order], IOrderService):
@@ -24,14 +34,22 @@ class OrdersService(BaseService[Order], IOrderService):
 
     async def save_full_order(self, new_order: Order, items: list[OrderItem]) -> Order:
         """
-        Guarda la cabecera del pedido y sus líneas de detalle.
+        Guarda la cabecera del pedido y sus líneas de detalle en un único flush:
+        un INSERT para la cabecera y un executemany para todas las líneas.
+        Las líneas quedan cargadas en Order.items, así la respuesta no vuelve a consultar el pedido.
         """
-        saved_order = await self.order_repo.create(new_order)
-        
-        for item in items:
-            await self.item_repo.create(item)
-            
-        return await self.get_order_with_items(saved_order.id) # type: ignore
+        self.db.add(new_order)
+        await self.item_repo.create_many(items)
+        set_committed_value(new_order, "items", items)
+        return new_order
+
+    async def save_orders(self, orders: list[Order], items: list[OrderItem]) -> None:
+        """
+        Guarda muchos pedidos (ej. los generados por suscripciones) con sus líneas en un
+        único flush: un executemany para las cabeceras y otro para todas las líneas.
+        """
+        await self.order_repo.create_many(orders)
+        await self.item_repo.create_many(items)
 
     async def get_order_with_items(self, order_id: uuid.UUID) -> Order | None:
         statement = select(Order).where(
@@ -47,7 +65,7 @@ class OrdersService(BaseService[Order], IOrderService):
             raise ValueError("Pedido no encontrado.")
         return await self.order_repo.update(order, {"status": new_status})
 
-    async def get_business_orders(self, business_id: uuid.UUID, status_filter: OrderStatus | None = None) -> Sequence[Order]:
+    async def get_business_orders(self, business_id: uuid.UUID, page: PageRequest, status_filter: OrderStatus | None = None) -> Page[Order]:
         statement = select(Order).where(
             Order.business_id == business_id
         ).options(selectinload(Order.items)) # type: ignore
@@ -55,16 +73,29 @@ class OrdersService(BaseService[Order], IOrderService):
         if status_filter:
             statement = statement.where(Order.status == status_filter)
             
-        statement = statement.order_by(col(Order.created_at).desc())
-        result = await self.db.execute(statement)
-        return result.scalars().all()
+        return await paginate(self.db, statement, Order, page)
 
-    async def get_user_orders(self, user_id: uuid.UUID) -> Sequence[Order]:
+    async def get_user_orders(self, user_id: uuid.UUID, page: PageRequest) -> Page[Order]:
         statement = (
             select(Order)
             .where(Order.user_id == user_id)
             .options(selectinload(Order.items)) # type: ignore
-            .order_by(col(Order.created_at).desc())
         )
-        result = await self.db.execute(statement)
-        return result.scalars().all()
\ No newline at end of file
+        return await paginate(self.db, statement, Order, page)
+
+    def stream_business_orders(
+        self,
+        business_id: uuid.UUID,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        status_filter: OrderStatus | None = None,
+    ) -> AsyncIterator[RowMapping]:
+        """Recorre los pedidos de un negocio en orden cronológico para exportarlos."""
+        statement = select(*(col(getattr(Order, f)) for f in ORDER_EXPORT_FIELDS)).where(
+            Order.business_id == business_id
+        )
+        if status_filter:
+            statement = statement.where(Order.status == status_filter)
+        statement = created_between(statement, Order, date_from, date_to)
+        statement = statement.order_by(col(Order.created_at), col(Order.id))
+        return stream_rows(self.db, statement)
\ No newline at end of file
@@ -0,0 +1,176 @@
+import uuid
+from collections.abc import Sequence
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+
+from sqlalchemy import Integer, Numeric, cast, delete, func, literal, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel, col, select
+
+from app.domain.models.models import (
+    ItemReview,
+    OrderReview,
+    RatingAggregate,
+    RatingSubject,
+    Staff,
+    StaffReview,
+)
+
+# Qué sujeto califica cada tipo de reseña y qué columna alimenta cada dimensión
+RATING_SOURCES: dict[type[SQLModel], tuple[RatingSubject, str, dict[str, str]]] = {
+    OrderReview: (RatingSubject.BUSINESS, "business_id", {
+        "attention": "rating_attention",
+        "general": "rating_general",
+        "location": "rating_location",
+        "speed": "rating_speed",
+    }),
+    ItemReview: (RatingSubject.ITEM, "item_id", {"quality": "rating_quality"}),
+    StaffReview: (RatingSubject.STAFF, "staff_id", {"service": "rating_service"}),
+}
+
+STARS = range(1, 6)
+
+
+def average(aggregate: RatingAggregate) -> Decimal | None:
+    if not aggregate.count:
+        return None
+    return (Decimal(aggregate.total) / aggregate.count).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+class RatingService:
+    """
+    Mantiene los agregados de calificaciones (conteo, suma e histograma 1-5 por
+    dimensión) de negocios, productos y staff. Ningún método hace commit: se llaman
+    dentro de la UnitOfWork del Command que crea la reseña.
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record_review(self, review: OrderReview | ItemReview | StaffReview) -> Sequence[RatingAggregate]:
+        """Suma una reseña a los agregados de su sujeto (ver record_reviews)."""
+        return await self.record_reviews([review])
+
+    async def record_reviews(
+        self, reviews: Sequence[OrderReview | ItemReview | StaffReview]
+    ) -> Sequence[RatingAggregate]:
+        """
+        Suma varias reseñas a los agregados de sus sujetos con un único upsert:
+
+            INSERT INTO ratingaggregate VALUES (...), (...)
+            ON CONFLICT (subject_type, subject_id, dimension)
+            DO UPDATE SET count = count + 1, total = total + EXCLUDED.total, stars_N = ...
+
+        Cada (sujeto, dimensión) debe aparecer una sola vez en el lote: Postgres no permite
+        que un mismo INSERT ... ON CONFLICT actualice dos veces la misma fila.
+        Para el staff además actualiza Staff.rating_avg con el nuevo promedio.
+        """
+        now = datetime.utcnow()
+        rows = []
+        staff_ids = []
+        for review in reviews:
+            subject_type, subject_field, dimensions = RATING_SOURCES[type(review)]
+            subject_id = getattr(review, subject_field)
+            if subject_type == RatingSubject.STAFF:
+                staff_ids.append(subject_id)
+            for dimension, field in dimensions.items():
+                stars = getattr(review, field)
+                row = {
+                    "subject_type": subject_type,
+                    "subject_id": subject_id,
+                    "dimension": dimension,
+                    "count": 1,
+                    "total": stars,
+                    "updated_at": now,
+                }
+                row.update({f"stars_{n}": int(stars == n) for n in STARS})
+                rows.append(row)
+        if not rows:
+            return []
+
+        # Orden fijo de claves: dos transacciones concurrentes bloquean las filas en el mismo orden
+        rows.sort(key=lambda row: (row["subject_type"], str(row["subject_id"]), row["dimension"]))
+
+        statement = insert(RatingAggregate).values(rows)
+        counters = ["count", "total", *(f"stars_{n}" for n in STARS)]
+        statement = statement.on_conflict_do_update(
+            index_elements=["subject_type", "subject_id", "dimension"],
+            set_={
+                **{name: getattr(RatingAggregate, name) + statement.excluded[name] for name in counters},
+                "updated_at": now,
+            }
+        ).returning(RatingAggregate).execution_options(populate_existing=True)
+        result = await self.db.execute(statement)
+        aggregates = result.scalars().all()
+
+        if staff_ids:
+            await self._sync_staff_ratings(staff_ids)
+        return aggregates
+
+    async def get_aggregates(self, subject_type: RatingSubject, subject_id: uuid.UUID) -> Sequence[RatingAggregate]:
+        """Lectura O(1) por clave primaria de los agregados de un sujeto."""
+        statement = select(RatingAggregate).where(
+            RatingAggregate.subject_type == subject_type,
+            RatingAggregate.subject_id == subject_id
+        ).order_by(col(RatingAggregate.dimension))
+        result = await self.db.execute(statement)
+        return result.scalars().all()
+
+    async def rebuild_all(self) -> int:
+        """
+        Recalcula todos los agregados desde las reseñas existentes (backfill).
+        Bloquea la tabla de agregados en modo EXCLUSIVE: las reseñas que se creen mientras
+        tanto esperan al commit y se suman después, sin contarse dos veces ni perderse.
+        Devuelve cuántas filas de agregados quedaron.
+        """
+        await self.db.execute(text("LOCK TABLE ratingaggregate IN EXCLUSIVE MODE"))
+        await self.db.execute(delete(RatingAggregate))
+
+        now = datetime.utcnow()
+        created = 0
+        for model, (subject_type, subject_field, dimensions) in RATING_SOURCES.items():
+            subject_column = getattr(model, subject_field)
+            for dimension, field in dimensions.items():
+                stars = getattr(model, field)
+                rows = (
+                    select(
+                        literal(subject_type, RatingAggregate.__table__.c.subject_type.type),
+                        subject_column,
+                        literal(dimension),
+                        func.count(),
+                        cast(func.sum(stars), Integer),
+                        *(func.count().filter(stars == n) for n in STARS),
+                        literal(now),
+                    )
+                    .where(model.deleted_at == None)  # type: ignore[attr-defined]
+                    .group_by(subject_column)
+                )
+                statement = insert(RatingAggregate).from_select(
+                    ["subject_type", "subject_id", "dimension", "count", "total",
+                     *(f"stars_{n}" for n in STARS), "updated_at"],
+                    rows,
+                )
+                result = await self.db.execute(statement)
+                created += result.rowcount
+
+        # Staff.rating_avg queda alineado con el agregado recalculado
+        await self._sync_staff_ratings()
+        return created
+
+    async def _sync_staff_ratings(self, staff_ids: Sequence[uuid.UUID] | None = None) -> None:
+        """
+        Copia el promedio del agregado a Staff.rating_avg (UPDATE ... FROM ratingaggregate).
+        Sin staff_ids alinea a todo el staff.
+        """
+        statement = (
+            update(Staff)
+            .where(
+                RatingAggregate.subject_type == RatingSubject.STAFF,
+                RatingAggregate.subject_id == Staff.id,
+            )
+            .values(rating_avg=func.round(cast(RatingAggregate.total, Numeric) / RatingAggregate.count, 2))
+            .execution_options(synchronize_session=False)
+        )
+        if staff_ids is not None:
+            statement = statement.where(col(Staff.id).in_(staff_ids))
+        await self.db.execute(statement)
@@ -1,12 +1,32 @@
 import uuid
 from collections.abc import Sequence
 
+from sqlalchemy import or_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from sqlmodel import col, select
+from sqlmodel.sql.expression import SelectOfScalar
 
-from app.domain.models.models import ItemReview, OrderReview, StaffReview
+from app.domain.models.models import ItemReview, Order, OrderReview, StaffReview
+from app.domain.schemas.pagination import Page, PageRequest
+from app.domain.schemas.reviews import ReviewFilter
 from app.domain.services.service import IReviewService
-from app.infrastructure.repositories.base import BaseRepository
+from app.infrastructure.repositories.base import BaseRepository, paginate
+
+
+def filter_reviews(statement: SelectOfScalar, rating, comment, filters: ReviewFilter | None) -> SelectOfScalar:
+    """Aplica los filtros del feed sobre la calificación principal y el comentario."""
+    if not filters:
+        return statement
+    if filters.min_rating is not None:
+        statement = statement.where(rating >= filters.min_rating)
+    if filters.max_rating is not None:
+        statement = statement.where(rating <= filters.max_rating)
+    if filters.has_comment is True:
+        statement = statement.where(comment.is_not(None), comment != "")
+    elif filters.has_comment is False:
+        statement = statement.where(or_(comment.is_(None), comment == ""))
+    return statement
 
 
 class ReviewService(IReviewService):
@@ -22,45 +42,53 @@ class ReviewService(IReviewService):
 
     # --- ORDER REVIEWS ---
     async def create_order_review(self, review: OrderReview) -> OrderReview:
-        """Crea la reseña del pedido. Valida la restricción unique=True del order_id."""
-        statement = select(OrderReview).where(OrderReview.order_id == review.order_id)
-        existing = (await self.db.execute(statement)).scalar_one_or_none()
-        if existing:
-            raise ValueError("Ya existe una reseña general para este pedido.")
-            
+        """
+        Crea la reseña del pedido. El duplicado lo detecta la restricción UNIQUE de
+        order_id en el flush (IntegrityError), sin SELECT previo.
+        """
         return await self.order_review_repo.create(review)
 
-    async def get_business_reviews(self, business_id: uuid.UUID) -> Sequence[OrderReview]:
-        statement = (
-            select(OrderReview)
-            .where(OrderReview.business_id == business_id)
-            .order_by(col(OrderReview.created_at).desc())
-        )
+    async def get_business_reviews(
+        self, business_id: uuid.UUID, page: PageRequest, filters: ReviewFilter | None = None
+    ) -> Page[OrderReview]:
+        """Feed por ix_orderreview_business_created; los filtros se evalúan sobre ese recorrido."""
+        statement = select(OrderReview).where(OrderReview.business_id == business_id)
+        statement = filter_reviews(statement, col(OrderReview.rating_general), col(OrderReview.comment), filters)
+        return await paginate(self.db, statement, OrderReview, page)
+
+    # --- RESEÑA COMPLETA ---
+    async def get_order_with_items(self, order_id: uuid.UUID) -> Order | None:
+        """Pedido con sus líneas (productos y staff asignado) en una sola consulta con JOIN."""
+        statement = select(Order).options(joinedload(Order.items)).where(Order.id == order_id)  # type: ignore[arg-type]
         result = await self.db.execute(statement)
-        return result.scalars().all()
+        return result.unique().scalar_one_or_none()
+
+    async def create_reviews(
+        self, reviews: Sequence[OrderReview | ItemReview | StaffReview]
+    ) -> Sequence[OrderReview | ItemReview | StaffReview]:
+        """Inserta varias reseñas en un solo flush. Los duplicados fallan con IntegrityError."""
+        self.db.add_all(reviews)
+        await self.db.flush()
+        return reviews
 
     # --- ITEM REVIEWS ---
     async def create_item_review(self, review: ItemReview) -> ItemReview:
         return await self.item_review_repo.create(review)
 
-    async def get_item_reviews(self, item_id: uuid.UUID) -> Sequence[ItemReview]:
-        statement = (
-            select(ItemReview)
-            .where(ItemReview.item_id == item_id)
-            .order_by(col(ItemReview.created_at).desc())
-        )
-        result = await self.db.execute(statement)
-        return result.scalars().all()
+    async def get_item_reviews(
+        self, item_id: uuid.UUID, page: PageRequest, filters: ReviewFilter | None = None
+    ) -> Page[ItemReview]:
+        statement = select(ItemReview).where(ItemReview.item_id == item_id)
+        statement = filter_reviews(statement, col(ItemReview.rating_quality), col(ItemReview.comment), filters)
+        return await paginate(self.db, statement, ItemReview, page)
 
     # --- STAFF REVIEWS ---
     async def create_staff_review(self, review: StaffReview) -> StaffReview:
         return await self.staff_review_repo.create(review)
 
-    async def get_staff_reviews(self, staff_id: uuid.UUID) -> Sequence[StaffReview]:
-        statement = (
-            select(StaffReview)
-            .where(StaffReview.staff_id == staff_id)
-            .order_by(col(StaffReview.created_at).desc())
-        )
-        result = await self.db.execute(statement)
-        return result.scalars().all()
\ No newline at end of file
+    async def get_staff_reviews(
+        self, staff_id: uuid.UUID, page: PageRequest, filters: ReviewFilter | None = None
+    ) -> Page[StaffReview]:
+        statement = select(StaffReview).where(StaffReview.staff_id == staff_id)
+        statement = filter_reviews(statement, col(StaffReview.rating_service), col(StaffReview.comment), filters)
+        return await paginate(self.db, statement, StaffReview, page)
\ No newline at end of file
@@ -0,0 +1,157 @@
+import hashlib
+import uuid
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.services.CatalogService import CatalogService
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.domain.schemas.business import BusinessRead
+from app.domain.schemas.storefront import MenuCategory, MenuItem, StorefrontMenu
+from app.infrastructure.repositories.business_repo import BusinessRepository
+
+
+@dataclass(frozen=True)
+class CachedMenu:
+    """Menú ya serializado: se sirve tal cual, sin volver a validar ni a generar JSON."""
+    business_id: uuid.UUID
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_menu(cls, menu: StorefrontMenu) -> "CachedMenu":
+        body = menu.model_dump_json().encode()
+        # La versión es el hash del contenido: todos los workers generan el mismo ETag
+        version = hashlib.sha256(body).hexdigest()[:20]
+        return cls(business_id=menu.business.id, body=body, etag=f'"{version}"')
+
+
+class StorefrontMenuCache:
+    """
+    Caché del menú público por (slug, día).
+    Recuerda a qué negocio pertenece cada menú y qué categorías y productos contiene,
+    para que los Commands puedan invalidar conociendo solo el ID de la entidad modificada.
+    Esos índices solo guardan menús vivos: se limpian también cuando una entrada
+    expira o es desalojada, así su tamaño queda acotado por el de la caché.
+    """
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self._menus: TTLCache[tuple[str, date], CachedMenu] = TTLCache(
+            maxsize, ttl_seconds, on_evict=lambda key, _: self._forget(key)
+        )
+        self._keys_by_business: dict[uuid.UUID, set[tuple[str, date]]] = {}
+        self._entities_by_key: dict[tuple[str, date], tuple[uuid.UUID, frozenset[uuid.UUID]]] = {}
+        self._keys_by_entity: dict[uuid.UUID, set[tuple[str, date]]] = {}
+        # Se incrementa en cada invalidación; evita cachear un menú construido antes de una escritura
+        self.generation = 0
+
+    def get(self, slug: str, target_date: date) -> CachedMenu | None:
+        return self._menus.get((slug, target_date))
+
+    def put(
+        self, slug: str, target_date: date, menu: StorefrontMenu, entity_ids: list[uuid.UUID], generation: int
+    ) -> CachedMenu:
+        cached = CachedMenu.from_menu(menu)
+        if generation != self.generation:
+            # Hubo una escritura mientras se construía: se sirve, pero no se guarda
+            return cached
+        key = (slug, target_date)
+        self._forget(key)
+        self._menus.set(key, cached)
+        self._keys_by_business.setdefault(cached.business_id, set()).add(key)
+        self._entities_by_key[key] = (cached.business_id, frozenset(entity_ids))
+        for entity_id in entity_ids:
+            self._keys_by_entity.setdefault(entity_id, set()).add(key)
+        return cached
+
+    def invalidate_business(self, business_id: uuid.UUID) -> None:
+        self.generation += 1
+        for key in list(self._keys_by_business.get(business_id, ())):
+            self._menus.pop(key)
+            self._forget(key)
+
+    def invalidate_entity(self, entity_id: uuid.UUID) -> None:
+        """Invalida los menús del negocio al que pertenece la categoría o el producto indicado."""
+        self.generation += 1
+        businesses = {self._entities_by_key[key][0] for key in self._keys_by_entity.get(entity_id, ())}
+        for business_id in businesses:
+            self.invalidate_business(business_id)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._menus.clear()
+        self._keys_by_business.clear()
+        self._entities_by_key.clear()
+        self._keys_by_entity.clear()
+
+    def _forget(self, key: tuple[str, date]) -> None:
+        """Quita un menú de los índices de invalidación (ya no está en la caché)."""
+        entry = self._entities_by_key.pop(key, None)
+        if entry is None:
+            return
+        business_id, entity_ids = entry
+        keys = self._keys_by_business.get(business_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_business[business_id]
+        for entity_id in entity_ids:
+            entity_keys = self._keys_by_entity.get(entity_id)
+            if entity_keys is not None:
+                entity_keys.discard(key)
+                if not entity_keys:
+                    del self._keys_by_entity[entity_id]
+
+    def stats(self) -> dict[str, int]:
+        return {**self._menus.stats(), "indexed_entities": len(self._keys_by_entity)}
+
+
+menu_cache = StorefrontMenuCache(
+    maxsize=settings.MENU_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.MENU_CACHE_TTL_SECONDS,
+)
+
+
+class StorefrontService:
+    """
+    Construye el documento completo de la tienda (marca, categorías, productos y stock
+    del día) con tres consultas, en lugar de una ronda de peticiones por recurso.
+    """
+    def __init__(self, db: AsyncSession):
+        self.business_repo = BusinessRepository(db)
+        self.catalog_service = CatalogService(db)
+
+    async def build_menu(self, slug: str, target_date: date) -> tuple[StorefrontMenu, list[uuid.UUID]]:
+        """
+        Devuelve el menú y los IDs de las entidades que lo componen (para invalidación).
+        Lanza ValueError si el negocio no existe.
+        """
+        business = await self.business_repo.get_by_slug(slug)
+        if not business or business.deleted_at is not None:
+            raise ValueError("Negocio no encontrado")
+
+        categories = await self.catalog_service.get_categories_by_business(business.id)
+        items_with_stock = await self.catalog_service.get_items_with_stock(business.id, target_date)
+
+        items_by_category: dict[uuid.UUID, list[MenuItem]] = {}
+        for item, available in items_with_stock:
+            menu_item = MenuItem.model_validate(item).model_copy(update={"quantity_available": available})
+            items_by_category.setdefault(item.category_id, []).append(menu_item)
+
+        menu = StorefrontMenu(
+            business=BusinessRead.model_validate(business),
+            date=target_date,
+            categories=[
+                MenuCategory(
+                    id=category.id,
+                    business_id=category.business_id,
+                    name=category.name,
+                    description=category.description,
+                    items=items_by_category.get(category.id, []),
+                )
+                for category in categories
+            ],
+        )
+        entity_ids = [category.id for category in categories] + [item.id for item, _ in items_with_stock]
+        return menu, entity_ids
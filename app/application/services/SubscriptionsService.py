@@ -1,16 +1,63 @@
 import uuid
 from collections.abc import Sequence
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any
 
+from sqlalchemy import ColumnElement, Row, and_, bindparam, exists, func, or_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import col, select
 
 from app.application.services.BaseService import BaseService
-from app.domain.models.models import Subscription, SubscriptionItem, SubscriptionPayment
+from app.application.services.WebhookService import is_pending
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.domain.models.models import (
+    Item,
+    Subscription,
+    SubscriptionItem,
+    SubscriptionPayment,
+    SubscriptionStatus,
+    WebhookEvent,
+    masks_with_weekday,
+)
+from app.domain.schemas.pagination import Page, PageRequest
+from app.domain.schemas.suscriptions import SubscriptionMetrics
 from app.domain.services.service import ISubscriptionService
-from app.infrastructure.repositories.base import BaseRepository
+from app.infrastructure.repositories.base import BaseRepository, paginate
+
+# Estados de SubscriptionPayment (texto libre de la pasarela) que cuentan como cobro / fallo
+PAYMENT_SUCCEEDED_STATUSES = ("succeeded", "paid")
+PAYMENT_FAILED_STATUSES = ("failed",)
+
+# Métricas por negocio: cada worker guarda su copia unos segundos (ver TTLCache)
+metrics_cache: TTLCache[uuid.UUID, SubscriptionMetrics] = TTLCache(
+    maxsize=settings.SUBSCRIPTION_METRICS_MAX_ENTRIES,
+    ttl_seconds=settings.SUBSCRIPTION_METRICS_TTL_SECONDS,
+)
+
+
+def status_in(*statuses: SubscriptionStatus) -> ColumnElement[bool]:
+    """
+    status IN (...) con los valores en línea (no como parámetros), para que el
+    planificador pueda usar los índices parciales por estado también con planes genéricos.
+    """
+    column = col(Subscription.status)
+    return column.in_([bindparam(None, value, type_=column.type, literal_execute=True) for value in statuses])
+
+
+def past_due_since(subscription: Subscription, new_status: str, at: datetime) -> datetime | None:
+    """
+    Valor de past_due_since tras pasar a `new_status` en el momento `at`: la gracia
+    empieza al entrar en PAST_DUE, se conserva mientras siga ahí y se borra al salir.
+    """
+    if new_status != SubscriptionStatus.PAST_DUE:
+        return None
+    if subscription.status == SubscriptionStatus.PAST_DUE and subscription.past_due_since is not None:
+        return subscription.past_due_since
+    return at
 
 
 class SubscriptionService(BaseService[Subscription], ISubscriptionService):
@@ -26,14 +73,14 @@ class SubscriptionService(BaseService[Subscription], ISubscriptionService):
 
     async def create_full_subscription(self, new_subscription: Subscription, items: list[SubscriptionItem]) -> Subscription:
         """
-        Guarda la cabecera de la suscripción y sus detalles atómicamente.
+        Guarda la cabecera de la suscripción y sus detalles en un único flush:
+        un INSERT para la cabecera y un executemany para todas las líneas.
+        Las líneas quedan cargadas en Subscription.items, así la respuesta no vuelve a consultarla.
         """
-        saved_sub = await self.subscription_repo.create(new_subscription)
-        
-        for item in items:
-            await self.item_repo.create(item)
-            
-        return await self.get_subscription_with_items(saved_sub.id) # type: ignore
+        self.db.add(new_subscription)
+        await self.item_repo.create_many(items)
+        set_committed_value(new_subscription, "items", items)
+        return new_subscription
 
     async def get_subscription_with_items(self, subscription_id: uuid.UUID) -> Subscription | None:
         """Obtiene una suscripción incluyendo sus planes/items."""
@@ -52,7 +99,10 @@ class SubscriptionService(BaseService[Subscription], ISubscriptionService):
         if not subscription:
             raise ValueError("Suscripción no encontrada.")
             
-        update_data: dict[str, Any] = {"status": new_status}
+        update_data: dict[str, Any] = {
+            "status": new_status,
+            "past_due_since": past_due_since(subscription, new_status, datetime.utcnow()),
+        }
         if period_end:
             update_data["current_period_end"] = period_end
             
@@ -63,24 +113,284 @@ class SubscriptionService(BaseService[Subscription], ISubscriptionService):
         new_payment = SubscriptionPayment(**payment_data)
         return await self.payment_repo.create(new_payment)
 
-    async def get_user_subscriptions(self, user_id: uuid.UUID) -> Sequence[Subscription]:
-        """Obtiene todas las suscripciones activas o pasadas de un usuario."""
+    async def get_by_stripe_id(self, stripe_subscription_id: str) -> Subscription | None:
+        """Busca la suscripción local que corresponde a una suscripción de Stripe."""
+        statement = select(Subscription).where(Subscription.stripe_subscription_id == stripe_subscription_id)
+        result = await self.db.execute(statement)
+        return result.scalars().first()
+
+    async def apply_provider_event(
+        self,
+        subscription: Subscription,
+        occurred_at: datetime,
+        new_status: SubscriptionStatus | None = None,
+        period_end: datetime | None = None,
+    ) -> Subscription:
+        """
+        Aplica el estado informado por un evento de la pasarela y avanza provider_event_at
+        (nunca hacia atrás). El Command decide antes si el evento sigue vigente.
+        """
+        update_data: dict[str, Any] = {"provider_event_at": max(occurred_at, subscription.provider_event_at or occurred_at)}
+        if new_status is not None:
+            update_data["status"] = new_status
+            update_data["past_due_since"] = past_due_since(subscription, new_status, occurred_at)
+        if period_end is not None:
+            update_data["current_period_end"] = period_end
+        return await self.subscription_repo.update(subscription, update_data)
+
+    async def upsert_invoice_payment(self, payment_data: dict) -> bool:
+        """
+        Registra el cobro de un invoice de Stripe de forma idempotente (un registro por
+        stripe_invoice_id): un reintento del webhook o un "failed" seguido del "succeeded"
+        del mismo invoice actualizan la fila existente. Un cobro ya exitoso es definitivo.
+        Devuelve False si no se escribió nada porque el invoice ya estaba cobrado.
+        """
+        statement = insert(SubscriptionPayment).values(id=uuid.uuid4(), created_at=datetime.utcnow(), **payment_data)
+        statement = statement.on_conflict_do_update(
+            index_elements=["stripe_invoice_id"],
+            set_={
+                "amount": statement.excluded.amount,
+                "status": statement.excluded.status,
+                "updated_at": datetime.utcnow(),
+            },
+            where=col(SubscriptionPayment.status).notin_(PAYMENT_SUCCEEDED_STATUSES),
+        ).returning(SubscriptionPayment.id)
+        result = await self.db.execute(statement)
+        return result.scalar_one_or_none() is not None
+
+    async def get_user_subscriptions(self, user_id: uuid.UUID, page: PageRequest) -> Page[Subscription]:
+        """Obtiene las suscripciones activas o pasadas de un usuario, paginadas."""
         statement = (
             select(Subscription)
             .where(Subscription.user_id == user_id)
             .options(selectinload(Subscription.items)) # type: ignore
-            .order_by(col(Subscription.created_at).desc())
         )
-        result = await self.db.execute(statement)
-        return result.scalars().all()
+        return await paginate(self.db, statement, Subscription, page)
 
-    async def get_business_subscriptions(self, business_id: uuid.UUID, active_only: bool = True) -> Sequence[Subscription]:
-        """Obtiene las suscripciones de un negocio (Ideal para métricas de MRR)."""
+    async def get_business_subscriptions(self, business_id: uuid.UUID, page: PageRequest, active_only: bool = True) -> Page[Subscription]:
+        """Obtiene las suscripciones de un negocio, paginadas (Ideal para paneles de administración)."""
         statement = select(Subscription).where(Subscription.business_id == business_id)
         
         if active_only:
             statement = statement.where(Subscription.status == "active")
             
-        statement = statement.options(selectinload(Subscription.items)).order_by(col(Subscription.created_at).desc()) # type: ignore
+        statement = statement.options(selectinload(Subscription.items)) # type: ignore
+        return await paginate(self.db, statement, Subscription, page)
+
+    # ==========================================
+    # GENERACIÓN DE PEDIDOS RECURRENTES
+    # ==========================================
+    async def get_due_subscriptions(
+        self, target_date: date, after_id: uuid.UUID | None, limit: int
+    ) -> Sequence[Subscription]:
+        """
+        Siguiente tanda (por id) de suscripciones a las que les toca pedido en target_date
+        y aún no lo tienen (last_generated_date anterior). Las filas quedan bloqueadas
+        con FOR UPDATE SKIP LOCKED: otro worker que corra a la vez toma otras.
+        """
+        statement = (
+            select(Subscription)
+            .where(
+                Subscription.is_active == True,
+                col(Subscription.status).in_([SubscriptionStatus.ACTIVE, SubscriptionStatus.TRIALING]),
+                Subscription.deleted_at == None,
+                col(Subscription.weekday_mask).in_(masks_with_weekday(target_date.weekday())),
+                or_(
+                    col(Subscription.last_generated_date).is_(None),
+                    col(Subscription.last_generated_date) < target_date,
+                ),
+            )
+            .order_by(col(Subscription.id))
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if after_id is not None:
+            statement = statement.where(Subscription.id > after_id)
+        result = await self.db.execute(statement)
+        return result.scalars().all()
+
+    async def get_business_due_subscriptions(self, business_id: uuid.UUID, weekday: int) -> Sequence[Subscription]:
+        """
+        Suscripciones activas de un negocio que recogen ese día de la semana (0 = lunes),
+        con sus líneas. El filtro business_id + weekday_mask IN (...) se resuelve con un
+        solo recorrido de ix_subscription_business_weekday (índice parcial de activas).
+        """
+        statement = (
+            select(Subscription)
+            .where(
+                Subscription.business_id == business_id,
+                col(Subscription.weekday_mask).in_(masks_with_weekday(weekday)),
+                Subscription.is_active == True,
+                Subscription.deleted_at == None,
+                col(Subscription.status).in_([SubscriptionStatus.ACTIVE, SubscriptionStatus.TRIALING]),
+            )
+            .order_by(col(Subscription.pickup_time), col(Subscription.id))
+            .options(selectinload(Subscription.items))  # type: ignore
+        )
+        result = await self.db.execute(statement)
+        return result.scalars().all()
+
+    async def get_lines_for_subscriptions(self, subscription_ids: Sequence[uuid.UUID]) -> Sequence[Row]:
+        """
+        Líneas vigentes de varias suscripciones en una consulta por
+        ix_subscriptionitem_subscription_id:
+        (subscription_id, item_id, quantity, unit_price). El precio pactado manda;
+        si no hay, se usa el precio actual del catálogo. Productos borrados no se piden.
+        """
+        statement = (
+            select(
+                SubscriptionItem.subscription_id,
+                SubscriptionItem.item_id,
+                SubscriptionItem.quantity,
+                func.coalesce(SubscriptionItem.unit_price, Item.price).label("unit_price"),
+            )
+            .join(Item, Item.id == SubscriptionItem.item_id)  # type: ignore[arg-type]
+            .where(
+                col(SubscriptionItem.subscription_id).in_(subscription_ids),
+                SubscriptionItem.deleted_at == None,
+                Item.deleted_at == None,
+            )
+        )
+        result = await self.db.execute(statement)
+        return result.all()
+
+    async def mark_generated(self, subscription_ids: Sequence[uuid.UUID], target_date: date) -> None:
+        """Avanza last_generated_date de varias suscripciones con un único UPDATE."""
+        if not subscription_ids:
+            return
+        await self.db.execute(
+            update(Subscription)
+            .where(col(Subscription.id).in_(subscription_ids))
+            .values(last_generated_date=target_date, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+
+    # ==========================================
+    # FIN DE PERIODO Y RENOVACIONES
+    # ==========================================
+    async def get_expired_subscriptions(
+        self, now: datetime, renewal_cutoff: datetime, grace_cutoff: datetime, limit: int
+    ) -> Sequence[Subscription]:
+        """
+        Siguiente tanda de suscripciones cuyo periodo terminó, resuelta con ix_subscription_period_end:
+
+        - activas o en prueba sin pasarela con current_period_end <= now;
+        - activas o en prueba de Stripe vencidas antes de renewal_cutoff (margen para
+          que lleguen los webhooks de la renovación);
+        - en PAST_DUE desde antes de grace_cutoff (past_due_since, por
+          ix_subscription_past_due_since): agotaron la gracia.
+
+        Se omiten las que tienen webhooks pendientes en la cola: el estado que traen
+        manda sobre el barrido. Las filas quedan bloqueadas con FOR UPDATE SKIP LOCKED:
+        varios nodos pueden barrer a la vez sin repetir filas.
+        """
+        has_pending_events = exists().where(
+            is_pending(col(WebhookEvent.status)),
+            WebhookEvent.subject_ref == Subscription.stripe_subscription_id,
+        )
+        statement = (
+            select(Subscription)
+            .where(
+                Subscription.deleted_at == None,
+                or_(
+                    and_(
+                        status_in(SubscriptionStatus.TRIALING, SubscriptionStatus.ACTIVE),
+                        col(Subscription.stripe_subscription_id).is_(None),
+                        col(Subscription.current_period_end) <= now,
+                    ),
+                    and_(
+                        status_in(SubscriptionStatus.TRIALING, SubscriptionStatus.ACTIVE),
+                        col(Subscription.stripe_subscription_id).is_not(None),
+                        col(Subscription.current_period_end) <= renewal_cutoff,
+                    ),
+                    and_(
+                        status_in(SubscriptionStatus.PAST_DUE),
+                        col(Subscription.past_due_since) < grace_cutoff,
+                    ),
+                ),
+                ~has_pending_events,
+            )
+            .order_by(col(Subscription.current_period_end), col(Subscription.id))
+            .limit(limit)
+            .with_for_update(of=Subscription, skip_locked=True)  # type: ignore[arg-type]
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db.execute(statement)
+        return result.scalars().all()
+
+    async def apply_period_changes(self, changes: Sequence[dict[str, Any]]) -> None:
+        """
+        Aplica los nuevos estados / fines de periodo de varias suscripciones con un único
+        executemany (UPDATE por clave primaria). Cada cambio:
+        {"id", "status", "current_period_end", "past_due_since"}.
+        """
+        if not changes:
+            return
+        now = datetime.utcnow()
+        await self.db.execute(update(Subscription), [{**change, "updated_at": now} for change in changes])
+
+    # ==========================================
+    # MÉTRICAS DE INGRESOS RECURRENTES
+    # ==========================================
+    async def get_subscription_value_groups(self, business_id: uuid.UUID) -> Sequence[Row]:
+        """
+        Suscripciones de un negocio agrupadas por (status, is_active, weekday_mask):
+        cuántas hay y cuánto suman sus líneas por recogida. Con a lo sumo
+        estados x 2 x 128 filas, el llamador calcula el valor mensual sin cargar suscripciones.
+        El valor por suscripción se agrega solo sobre las líneas del negocio: Postgres no
+        empuja el filtro exterior dentro de un GROUP BY.
+        """
+        line_value = func.sum(
+            SubscriptionItem.quantity * func.coalesce(SubscriptionItem.unit_price, Item.price)
+        )
+        values_per_subscription = (
+            select(
+                col(SubscriptionItem.subscription_id).label("subscription_id"),
+                line_value.label("value"),
+            )
+            .join(Subscription, col(Subscription.id) == SubscriptionItem.subscription_id)
+            .join(Item, col(Item.id) == SubscriptionItem.item_id)
+            .where(
+                Subscription.business_id == business_id,
+                Subscription.deleted_at == None,
+                SubscriptionItem.deleted_at == None,
+            )
+            .group_by(SubscriptionItem.subscription_id)
+            .subquery("subscription_value")
+        )
+        statement = (
+            select(
+                col(Subscription.status).label("status"),
+                col(Subscription.is_active).label("is_active"),
+                col(Subscription.weekday_mask).label("weekday_mask"),
+                func.count().label("count"),
+                func.coalesce(func.sum(values_per_subscription.c.value), 0).label("value"),
+            )
+            .outerjoin(values_per_subscription, values_per_subscription.c.subscription_id == Subscription.id)
+            .where(Subscription.business_id == business_id, Subscription.deleted_at == None)
+            .group_by(Subscription.status, Subscription.is_active, Subscription.weekday_mask)
+        )
+        result = await self.db.execute(statement)
+        return result.all()
+
+    async def get_payment_totals(self, business_id: uuid.UUID, since: datetime) -> Sequence[Row]:
+        """
+        Cobros de las suscripciones de un negocio desde `since`, agrupados por estado
+        (por suscripción del negocio, ix_subscriptionpayment_subscription_created).
+        """
+        statement = (
+            select(
+                col(SubscriptionPayment.status).label("status"),
+                func.count().label("count"),
+                func.coalesce(func.sum(SubscriptionPayment.amount), 0).label("amount"),
+            )
+            .join(Subscription, col(Subscription.id) == SubscriptionPayment.subscription_id)
+            .where(
+                Subscription.business_id == business_id,
+                col(SubscriptionPayment.created_at) >= since,
+                SubscriptionPayment.deleted_at == None,
+            )
+            .group_by(SubscriptionPayment.status)
+        )
         result = await self.db.execute(statement)
-        return result.scalars().all()
\ No newline at end of file
+        return result.all()
@@ -1,7 +1,9 @@
 import uuid
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
+from datetime import date
 from decimal import Decimal
 
+from sqlalchemy import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import col, select
 
@@ -12,8 +14,15 @@ from app.domain.models.models import (
     Wallet,
     WalletTransaction,
 )
-from app.domain.schemas.wallet import RechargePlanCreate
-from app.infrastructure.repositories.base import BaseRepository
+from app.domain.schemas.pagination import Page, PageRequest
+from app.domain.schemas.wallet import TRANSACTION_EXPORT_FIELDS, RechargePlanCreate
+from app.infrastructure.repositories.base import (
+    BaseRepository,
+    created_between,
+    paginate,
+    stream_rows,
+)
+from app.infrastructure.repositories.wallet_repo import WalletRepository
 
 
 class WalletService(BaseService[Wallet]):
@@ -22,7 +31,7 @@ class WalletService(BaseService[Wallet]):
     """
     def __init__(self, db: AsyncSession):
         self.db = db
-        self.wallet_repo = BaseRepository(Wallet, db)
+        self.wallet_repo = WalletRepository(db)
         self.transaction_repo = BaseRepository(WalletTransaction, db)
         self.plan_repo = BaseRepository(RechargePlan, db)
         
@@ -36,12 +45,7 @@ class WalletService(BaseService[Wallet]):
         """
         Busca el monedero de un usuario en un negocio. Si no existe, lo crea con saldo 0.
         """
-        statement = select(Wallet).where(
-            Wallet.user_id == user_id,
-            Wallet.business_id == business_id
-        )
-        result = await self.db.execute(statement)
-        wallet = result.scalar_one_or_none()
+        wallet = await self.wallet_repo.get_by_user_and_business(user_id, business_id)
         
         if not wallet:
             new_wallet = Wallet(user_id=user_id, business_id=business_id, balance=Decimal("0.0"))
@@ -50,58 +54,102 @@ class WalletService(BaseService[Wallet]):
         return wallet
 
     async def add_funds(self, user_id: uuid.UUID, business_id: uuid.UUID, amount: Decimal, description: str, reference_id: uuid.UUID | None = None) -> Wallet:
-        """Añade saldo a un monedero y registra la transacción (Ej. al comprar una recarga)."""
+        """
+        Añade saldo a un monedero y registra la transacción (Ej. al comprar una recarga).
+        El saldo se suma en la base de datos (upsert) y el movimiento se inserta en la
+        misma transacción: no hay lectura previa del saldo.
+        """
         if amount <= 0:
             raise ValueError("El monto a añadir debe ser mayor a cero.")
-            
-        wallet = await self.get_or_create_wallet(user_id, business_id)
-        
-        # 1. Registrar la transacción
-        tx = WalletTransaction(
-            wallet_id=wallet.id,
-            amount=amount,
-            type=TransactionType.DEPOSIT,
-            description=description,
-            reference_id=reference_id
+
+        # 1. Actualizar el saldo (crea el monedero si es la primera recarga)
+        wallet = await self.wallet_repo.apply_credit(user_id, business_id, amount)
+
+        # 2. Registrar la transacción
+        await self.wallet_repo.add_transaction(
+            WalletTransaction(
+                wallet_id=wallet.id,
+                amount=amount,
+                type=TransactionType.DEPOSIT,
+                description=description,
+                reference_id=reference_id
+            )
         )
-        await self.transaction_repo.create(tx)
-        
-        # 2. Actualizar el saldo
-        new_balance = wallet.balance + amount
-        return await self.wallet_repo.update(wallet, {"balance": new_balance})
+        return wallet
 
     async def deduct_funds(self, user_id: uuid.UUID, business_id: uuid.UUID, amount: Decimal, description: str, reference_id: uuid.UUID | None = None) -> Wallet:
         """Deduce saldo de un monedero (Ej. al pagar un pedido con el monedero)."""
+        return await self.stage_withdrawal(user_id, business_id, amount, description, reference_id)
+
+    async def stage_withdrawal(self, user_id: uuid.UUID, business_id: uuid.UUID, amount: Decimal, description: str, reference_id: uuid.UUID | None = None) -> Wallet:
+        """
+        Descuenta saldo y registra la transacción SIN hacer commit.
+        El descuento es un UPDATE condicionado (balance >= monto) sin SELECT previo, así
+        dos cobros simultáneos nunca dejan el saldo en negativo. Pensado para formar parte
+        de una operación mayor (ej. la creación de un pedido), que confirma la transacción.
+        """
         if amount <= 0:
             raise ValueError("El monto a deducir debe ser mayor a cero.")
-            
-        wallet = await self.get_or_create_wallet(user_id, business_id)
-        
-        if wallet.balance < amount:
+
+        # 1. Actualizar el saldo solo si alcanza
+        wallet = await self.wallet_repo.apply_debit(user_id, business_id, amount)
+        if not wallet:
             raise ValueError("Saldo insuficiente en el monedero.")
-            
-        # 1. Registrar la transacción (como un valor negativo o indicando tipo WITHDRAWAL)
-        tx = WalletTransaction(
-            wallet_id=wallet.id,
-            amount=amount,  # Guardamos el monto en positivo, pero el tipo indica la resta
-            type=TransactionType.WITHDRAWAL,
-            description=description,
-            reference_id=reference_id
+
+        # 2. Registrar la transacción (el monto va en positivo, el tipo WITHDRAWAL indica la resta)
+        await self.wallet_repo.add_transaction(
+            WalletTransaction(
+                wallet_id=wallet.id,
+                amount=amount,
+                type=TransactionType.WITHDRAWAL,
+                description=description,
+                reference_id=reference_id
+            )
         )
-        await self.transaction_repo.create(tx)
-        
-        # 2. Actualizar el saldo
-        new_balance = wallet.balance - amount
-        return await self.wallet_repo.update(wallet, {"balance": new_balance})
+        return wallet
+
+    async def lock_wallets(
+        self, keys: Sequence[tuple[uuid.UUID, uuid.UUID]]
+    ) -> dict[tuple[uuid.UUID, uuid.UUID], Wallet]:
+        """Bloquea los monederos de varios (user_id, business_id) y los indexa por ese par."""
+        wallets = await self.wallet_repo.lock_wallets(keys)
+        return {(wallet.user_id, wallet.business_id): wallet for wallet in wallets}
+
+    async def stage_withdrawals(self, charges: Sequence[WalletTransaction]) -> None:
+        """
+        Versión por lotes de stage_withdrawal: recibe los movimientos (WITHDRAWAL) ya
+        armados, descuenta el total por monedero con un único UPDATE y los inserta en un
+        solo flush. Lanza ValueError si algún monedero no tiene saldo suficiente.
+        """
+        amounts: dict[uuid.UUID, Decimal] = {}
+        for charge in charges:
+            if charge.amount <= 0:
+                raise ValueError("El monto a deducir debe ser mayor a cero.")
+            amounts[charge.wallet_id] = amounts.get(charge.wallet_id, Decimal("0")) + charge.amount
+
+        debited = await self.wallet_repo.apply_debits(amounts)
+        if len(debited) != len(amounts):
+            raise ValueError("Saldo insuficiente en el monedero.")
+        await self.transaction_repo.create_many(charges)
+
+    async def get_wallet_transactions(self, wallet_id: uuid.UUID, page: PageRequest) -> Page[WalletTransaction]:
+        """Obtiene el historial de movimientos de un monedero, paginado por cursor."""
+        statement = select(WalletTransaction).where(WalletTransaction.wallet_id == wallet_id)
+        return await paginate(self.db, statement, WalletTransaction, page)
 
-    async def get_wallet_transactions(self, wallet_id: uuid.UUID) -> Sequence[WalletTransaction]:
-        """Obtiene el historial de movimientos de un monedero."""
-        statement = select(WalletTransaction).where(
+    def stream_wallet_transactions(
+        self,
+        wallet_id: uuid.UUID,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> AsyncIterator[RowMapping]:
+        """Recorre el libro mayor de un monedero en orden cronológico para exportarlo."""
+        statement = select(*(col(getattr(WalletTransaction, f)) for f in TRANSACTION_EXPORT_FIELDS)).where(
             WalletTransaction.wallet_id == wallet_id
-        ).order_by(col(WalletTransaction.created_at).desc())
-        
-        result = await self.db.execute(statement)
-        return result.scalars().all()
+        )
+        statement = created_between(statement, WalletTransaction, date_from, date_to)
+        statement = statement.order_by(col(WalletTransaction.created_at), col(WalletTransaction.id))
+        return stream_rows(self.db, statement)
 
     # ==========================================
     # LÓGICA DE PLANES DE RECARGA (RECHARGE PLANS)
@@ -0,0 +1,102 @@
+import uuid
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import ColumnElement, bindparam, exists, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlmodel import col, select
+
+from app.domain.models.models import WebhookEvent, WebhookEventStatus
+
+
+def is_pending(status_column: ColumnElement) -> ColumnElement[bool]:
+    """
+    status = 'PENDING' con el valor en línea (no como parámetro), para que el planificador
+    pueda usar los índices parciales de la cola también con planes genéricos.
+    """
+    pending = bindparam(None, WebhookEventStatus.PENDING, type_=status_column.type, literal_execute=True)
+    return status_column == pending
+
+
+class WebhookService:
+    """
+    Cola persistente de eventos de la pasarela de pagos (tabla webhookevent).
+    Ningún método hace commit: el Command que los usa delimita la transacción.
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def store_event(self, event: WebhookEvent) -> bool:
+        """
+        Guarda el evento crudo con un único INSERT ... ON CONFLICT DO NOTHING sobre
+        (provider, event_id). Devuelve False si ya existía (reintento de la pasarela).
+        """
+        values = {column.key: getattr(event, column.key) for column in WebhookEvent.__table__.columns}
+        statement = (
+            insert(WebhookEvent)
+            .values(values)
+            .on_conflict_do_nothing(constraint="unique_webhook_event")
+            .returning(WebhookEvent.id)
+        )
+        result = await self.db.execute(statement)
+        return result.scalar_one_or_none() is not None
+
+    async def claim_pending(self, limit: int, now: datetime) -> Sequence[WebhookEvent]:
+        """
+        Toma los siguientes eventos pendientes en orden de ocurrencia, bloqueándolos con
+        FOR UPDATE SKIP LOCKED para que varios workers se repartan la cola.
+        Un evento solo se toma si no hay otro pendiente anterior del mismo sujeto (aunque
+        esté bloqueado por otro worker o esperando reintento): así los eventos de una
+        suscripción que ya están en la cola se aplican en orden, y los de suscripciones
+        distintas en paralelo. El orden es (occurred_at, created_at, id): Stripe da la fecha
+        en segundos y los eventos del mismo segundo se desempatan por orden de llegada.
+        Los que llegan después de que se aplicara uno más nuevo los descarta el Command.
+        """
+        earlier = aliased(WebhookEvent)
+        has_pending_predecessor = exists().where(
+            is_pending(earlier.status),
+            earlier.subject_ref == WebhookEvent.subject_ref,
+            tuple_(earlier.occurred_at, earlier.created_at, earlier.id)
+            < tuple_(WebhookEvent.occurred_at, WebhookEvent.created_at, WebhookEvent.id),
+        )
+        statement = (
+            select(WebhookEvent)
+            .where(
+                is_pending(col(WebhookEvent.status)),
+                col(WebhookEvent.next_attempt_at) <= now,
+                ~has_pending_predecessor,
+            )
+            .order_by(col(WebhookEvent.occurred_at), col(WebhookEvent.created_at), col(WebhookEvent.id))
+            .limit(limit)
+            .with_for_update(of=WebhookEvent, skip_locked=True)  # type: ignore[arg-type]
+            # El worker reutiliza la sesión entre tandas: siempre la fila recién leída
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db.execute(statement)
+        return result.scalars().all()
+
+    async def mark_done(self, event_id: uuid.UUID, status: WebhookEventStatus, now: datetime) -> None:
+        await self.db.execute(
+            update(WebhookEvent)
+            .where(col(WebhookEvent.id) == event_id)
+            .values(status=status, processed_at=now, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def mark_failed_attempt(
+        self, event_id: uuid.UUID, error: str, now: datetime, next_attempt_at: datetime | None
+    ) -> None:
+        """Suma un intento; sin next_attempt_at el evento queda FAILED (no se reintenta)."""
+        values: dict = {"attempts": WebhookEvent.attempts + 1, "last_error": error, "updated_at": now}
+        if next_attempt_at is None:
+            values["status"] = WebhookEventStatus.FAILED
+        else:
+            values["next_attempt_at"] = next_attempt_at
+        await self.db.execute(
+            update(WebhookEvent)
+            .where(col(WebhookEvent.id) == event_id)
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
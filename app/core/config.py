@@ -19,6 +19,67 @@ class Settings(BaseSettings):
     def DATABASE_URL(self) -> str:
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    # Read replicas (opcional): lista JSON de "host" o "host:puerto". Vacía = todo va al primario
+    POSTGRES_REPLICA_SERVERS: list[str] = []
+    # Segundos tras una escritura en los que ese cliente lee del primario (0 = desactivado)
+    READ_YOUR_WRITES_SECONDS: int = 0
+
+    @property
+    def REPLICA_DATABASE_URLS(self) -> list[str]:
+        urls = []
+        for server in self.POSTGRES_REPLICA_SERVERS:
+            host, _, port = server.partition(":")
+            urls.append(f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{host}:{port or self.POSTGRES_PORT}/{self.POSTGRES_DB}")
+        return urls
+
+    # Database Engine / Pool (valores por worker de Granian)
+    DB_ECHO: bool = False  # Loguea cada sentencia SQL (solo para depuración local)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # Segundos esperando una conexión libre antes de fallar
+    DB_POOL_RECYCLE: int = 1800  # Segundos antes de reciclar una conexión (-1 = nunca)
+    DB_POOL_PRE_PING: bool = True
+    # Cachés de sentencias preparadas de asyncpg (poner ambas a 0 detrás de PgBouncer en modo transaction)
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+
+    # Instrumentación SQL por petición (conteo, tiempo en DB, detección de N+1)
+    SQL_INSTRUMENTATION: bool = True
+    SQL_SLOW_QUERY_MS: float = 200.0  # Sentencias más lentas que esto se loguean como warning
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5  # Misma sentencia repetida N veces en una petición = posible N+1
+
+    # Caché en memoria del menú público de cada tienda (por worker de Granian)
+    MENU_CACHE_TTL_SECONDS: int = 300  # Cota de desfase entre workers; cada worker invalida su copia al escribir
+    MENU_CACHE_MAX_ENTRIES: int = 1000
+    # Caché en memoria de negocios por slug / id (la búsqueda más frecuente del sistema)
+    BUSINESS_CACHE_TTL_SECONDS: int = 300
+    BUSINESS_CACHE_NEGATIVE_TTL_SECONDS: int = 30  # Cuánto se recuerda que un slug NO existe
+    BUSINESS_CACHE_MAX_ENTRIES: int = 5000
+
+    # Job que materializa las plantillas semanales de stock en DailyInventory
+    INVENTORY_TEMPLATES_JOB_ENABLED: bool = True
+    INVENTORY_TEMPLATES_DAYS_AHEAD: int = 14  # Días hacia adelante (incluido hoy) que deben existir
+    INVENTORY_TEMPLATES_INTERVAL_SECONDS: int = 3600
+
+    # Job que genera los pedidos recurrentes de las suscripciones
+    SUBSCRIPTION_ORDERS_JOB_ENABLED: bool = True
+    SUBSCRIPTION_ORDERS_DAYS_AHEAD: int = 1  # Los pedidos se generan N días antes de la recogida
+    SUBSCRIPTION_ORDERS_INTERVAL_SECONDS: int = 3600
+    SUBSCRIPTION_ORDERS_CHUNK_SIZE: int = 500  # Suscripciones por transacción
+
+    # Ciclo de facturación y barrido de fin de periodo de las suscripciones
+    SUBSCRIPTION_PERIOD_DAYS: int = 30
+    SUBSCRIPTION_GRACE_DAYS: int = 7  # Días en PAST_DUE (desde que entró) antes de cancelar
+    SUBSCRIPTION_RENEWAL_BUFFER_HOURS: int = 24  # Margen para los webhooks de renovación de Stripe antes de PAST_DUE
+    SUBSCRIPTION_SWEEPER_ENABLED: bool = True
+    SUBSCRIPTION_SWEEPER_INTERVAL_SECONDS: int = 300
+    SUBSCRIPTION_SWEEPER_BATCH_SIZE: int = 500
+
+    # Caché de las métricas de ingresos recurrentes (MRR) por negocio
+    SUBSCRIPTION_METRICS_TTL_SECONDS: int = 60
+    SUBSCRIPTION_METRICS_MAX_ENTRIES: int = 1000
+    SUBSCRIPTION_METRICS_PAYMENTS_WINDOW_DAYS: int = 30
+
     # Security
     SECRET_KEY: str = "super_secret_key_for_jwt_change_in_production"
     ALGORITHM: str = "HS256"
@@ -27,6 +88,14 @@ class Settings(BaseSettings):
     # Stripe
     STRIPE_API_KEY: str | None = None
     STRIPE_WEBHOOK_SECRET: str | None = None
+    STRIPE_WEBHOOK_TOLERANCE_SECONDS: int = 300  # Antigüedad máxima de la firma (anti-replay)
+
+    # Workers que aplican los webhooks guardados (cola en la tabla webhookevent)
+    WEBHOOK_WORKERS_ENABLED: bool = True
+    WEBHOOK_WORKERS: int = 4  # Workers por proceso; reparten la cola con SKIP LOCKED
+    WEBHOOK_POLL_INTERVAL_SECONDS: float = 1.0
+    WEBHOOK_BATCH_SIZE: int = 50
+    WEBHOOK_MAX_ATTEMPTS: int = 8  # Reintentos con espera exponencial antes de marcar FAILED
 
     class Config:
         env_file = ".env"
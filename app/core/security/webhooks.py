@@ -0,0 +1,35 @@
+import hashlib
+import hmac
+import time
+
+
+def verify_stripe_signature(payload: bytes, signature_header: str, secret: str, tolerance_seconds: int = 300) -> None:
+    """
+    Verifica la cabecera Stripe-Signature ("t=<timestamp>,v1=<firma>[,v1=...]"):
+    la firma es el HMAC-SHA256 de "<timestamp>.<cuerpo crudo>" con el secreto del endpoint.
+    Rechaza firmas más viejas que `tolerance_seconds` (ataques de repetición).
+    Lanza ValueError si la firma no es válida.
+    """
+    timestamp: str | None = None
+    signatures: list[str] = []
+    for part in signature_header.split(","):
+        key, _, value = part.strip().partition("=")
+        if key == "t":
+            timestamp = value
+        elif key == "v1":
+            signatures.append(value)
+    if not timestamp or not timestamp.isdigit() or not signatures:
+        raise ValueError("Cabecera de firma mal formada")
+
+    if abs(time.time() - int(timestamp)) > tolerance_seconds:
+        raise ValueError("Firma fuera de la ventana de tolerancia")
+
+    expected = sign_stripe_payload(payload, secret, int(timestamp))
+    if not any(hmac.compare_digest(expected, signature) for signature in signatures):
+        raise ValueError("Firma inválida")
+
+
+def sign_stripe_payload(payload: bytes, secret: str, timestamp: int) -> str:
+    """Firma v1 de Stripe para un cuerpo y un timestamp (también la usa el simulador de carga)."""
+    signed = f"{timestamp}.".encode() + payload
+    return hmac.new(secret.encode(), signed, hashlib.sha256).hexdigest()
@@ -1,10 +1,11 @@
 import uuid
+from collections.abc import Iterable
 from datetime import date, datetime, time
 from decimal import Decimal
 from enum import StrEnum
 from typing import Optional
 
-from sqlalchemy import JSON, Column, Index, Numeric, Text, UniqueConstraint
+from sqlalchemy import JSON, Column, Index, Numeric, Text, UniqueConstraint, text
 from sqlmodel import Field, Relationship, SQLModel
 
 # --- CLASE BASE PARA TRAZABILIDAD Y SOFT DELETE ---
@@ -72,14 +73,46 @@ class SubscriptionStatus(StrEnum):
     CANCELED = "canceled"
     INCOMPLETE = "incomplete"
 
+class WebhookEventStatus(StrEnum):
+    PENDING = "pending"
+    PROCESSED = "processed"
+    IGNORED = "ignored"  # Tipo de evento no manejado o sujeto desconocido
+    FAILED = "failed"    # Agotó los reintentos
+
+class RatingSubject(StrEnum):
+    BUSINESS = "business"
+    ITEM = "item"
+    STAFF = "staff"
+
 class KnowledgeSourceType(StrEnum):
     FILE = "file"
     TEXT = "text"
     WEBSITE = "website"
 
+# Días de recogida de las suscripciones como máscara de bits: bit n = date.weekday() n
+WEEKDAY_CODES = ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+
+def weekdays_to_mask(codes: Iterable[str]) -> int:
+    """("MON", "WED", "FRI") -> 0b0010101. Lanza ValueError ante un código desconocido."""
+    mask = 0
+    for code in codes:
+        mask |= 1 << WEEKDAY_CODES.index(code)
+    return mask
+
+def mask_to_weekdays(mask: int) -> list[str]:
+    return [code for day, code in enumerate(WEEKDAY_CODES) if mask & (1 << day)]
+
+def masks_with_weekday(weekday: int) -> list[int]:
+    """
+    Todas las máscaras posibles que incluyen el día (64 de 128). Filtrar con
+    weekday_mask IN (...) en lugar de weekday_mask & bit <> 0 permite usar el índice btree.
+    """
+    return [mask for mask in range(1 << len(WEEKDAY_CODES)) if mask & (1 << weekday)]
+
 # --- IDENTIDAD Y USUARIOS ---
 
 class User(TimestampModel, table=True):
+    __table_args__ = (Index("ix_user_created_at_id", "created_at", "id"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     phone: str | None = Field(unique=True, index=True)
     email: str | None = Field(default=None, unique=True)
@@ -100,6 +133,7 @@ class User(TimestampModel, table=True):
 # --- NEGOCIO, PERSONAL Y CONFIGURACIÓN DE IA (MCP) ---
 
 class Business(TimestampModel, table=True):
+    __table_args__ = (Index("ix_business_created_at_id", "created_at", "id"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     owner_id: uuid.UUID = Field(foreign_key="user.id")
     name: str
@@ -185,6 +219,7 @@ class Category(TimestampModel, table=True):
     items: list["Item"] = Relationship(back_populates="category")
 
 class Item(TimestampModel, table=True):
+    __table_args__ = (Index("ix_item_business_id", "business_id"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     business_id: uuid.UUID = Field(foreign_key="business.id")
     category_id: uuid.UUID = Field(foreign_key="category.id")
@@ -200,6 +235,7 @@ class Item(TimestampModel, table=True):
     category: Category = Relationship(back_populates="items")
     subscription_items: list["SubscriptionItem"] = Relationship(back_populates="item")
     daily_stocks: list["DailyInventory"] = Relationship(back_populates="item")
+    inventory_templates: list["InventoryTemplate"] = Relationship(back_populates="item")
     reviews: list["ItemReview"] = Relationship(back_populates="item")
 
 class DailyInventory(TimestampModel, table=True):
@@ -213,6 +249,19 @@ class DailyInventory(TimestampModel, table=True):
     
     item: Item = Relationship(back_populates="daily_stocks")
 
+class InventoryTemplate(TimestampModel, table=True):
+    """
+    Producción habitual de un producto para un día de la semana.
+    Un job la materializa en DailyInventory con antelación (solo crea los días que faltan).
+    """
+    __table_args__ = (UniqueConstraint("item_id", "day_of_week", name="unique_item_template_per_weekday"),)
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    item_id: uuid.UUID = Field(foreign_key="item.id")
+    day_of_week: int  # 0=Lunes ... 6=Domingo (igual que BusinessHour)
+    quantity: int
+
+    item: Item = Relationship(back_populates="inventory_templates")
+
 # --- FINANZAS Y MONEDERO ---
 
 class RechargePlan(TimestampModel, table=True):
@@ -239,6 +288,7 @@ class Wallet(TimestampModel, table=True):
 
 class WalletTransaction(TimestampModel, table=True):
     """Libro mayor inmutable para auditoría financiera."""
+    __table_args__ = (Index("ix_wallettransaction_wallet_created", "wallet_id", "created_at", "id"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     wallet_id: uuid.UUID = Field(foreign_key="wallet.id")
     amount: Decimal = Field(sa_column=Column(Numeric(precision=10, scale=2)))
@@ -253,22 +303,53 @@ class WalletTransaction(TimestampModel, table=True):
 
 class Subscription(TimestampModel, table=True):
     """Motor de recurrencia integrado con Stripe Billing."""
+    __table_args__ = (
+        Index("ix_subscription_user_created", "user_id", "created_at", "id"),
+        Index("ix_subscription_business_created", "business_id", "created_at", "id"),
+        # "Suscripciones activas del negocio X que recogen el día D" en un solo recorrido del índice
+        Index(
+            "ix_subscription_business_weekday", "business_id", "weekday_mask",
+            postgresql_where=text("is_active AND deleted_at IS NULL"),
+        ),
+        # Barrido de fin de periodo: solo las suscripciones que aún pueden vencer
+        Index(
+            "ix_subscription_period_end", "current_period_end",
+            postgresql_where=text("status IN ('TRIALING', 'ACTIVE', 'PAST_DUE') AND deleted_at IS NULL"),
+        ),
+        # Fin de la gracia de las suscripciones en PAST_DUE
+        Index(
+            "ix_subscription_past_due_since", "past_due_since",
+            postgresql_where=text("status = 'PAST_DUE' AND deleted_at IS NULL"),
+        ),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="user.id")
     business_id: uuid.UUID = Field(foreign_key="business.id")
     stripe_subscription_id: str | None = Field(default=None, index=True)
     status: SubscriptionStatus = Field(default=SubscriptionStatus.INCOMPLETE)
     current_period_end: datetime | None = None
-    frequency_days: str # ej: "MON,WED,FRI"
+    weekday_mask: int = Field(default=0)  # ej: MON,WED,FRI = 0b0010101 (ver WEEKDAY_CODES)
     pickup_time: time
     is_active: bool = Field(default=True)
     last_generated_date: date | None = None
+    # occurred_at del último evento de la pasarela aplicado: los que lleguen tarde con
+    # una fecha anterior ya no cambian el estado
+    provider_event_at: datetime | None = None
+    # Momento en que entró en PAST_DUE (None en cualquier otro estado): de aquí corre la gracia
+    past_due_since: datetime | None = None
     user: User = Relationship(back_populates="subscriptions")
     business: Business = Relationship(back_populates="subscriptions")
     items: list["SubscriptionItem"] = Relationship(back_populates="subscription")
     payments: list["SubscriptionPayment"] = Relationship(back_populates="subscription")
 
+    @property
+    def frequency_days(self) -> str:
+        """Días de recogida en formato legible, ej. "MON,WED,FRI"."""
+        return ",".join(mask_to_weekdays(self.weekday_mask))
+
 class SubscriptionItem(TimestampModel, table=True):
+    # Líneas de una tanda de suscripciones (subscription_id IN (...)) sin recorrer la tabla
+    __table_args__ = (Index("ix_subscriptionitem_subscription_id", "subscription_id"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     subscription_id: uuid.UUID = Field(foreign_key="subscription.id")
     item_id: uuid.UUID = Field(foreign_key="item.id")
@@ -279,19 +360,57 @@ class SubscriptionItem(TimestampModel, table=True):
 
 class SubscriptionPayment(TimestampModel, table=True):
     """Registro de cada invoice cobrado por Stripe."""
+    # Cobros de las suscripciones de un negocio en una ventana (métricas de ingresos)
+    __table_args__ = (Index("ix_subscriptionpayment_subscription_created", "subscription_id", "created_at"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     subscription_id: uuid.UUID = Field(foreign_key="subscription.id")
-    stripe_invoice_id: str = Field(index=True)
+    stripe_invoice_id: str = Field(index=True, unique=True)  # Un cobro por invoice (los webhooks reintentan)
     amount: Decimal = Field(sa_column=Column(Numeric(precision=10, scale=2)))
     status: str 
     
     subscription: Subscription = Relationship(back_populates="payments")
 
+class WebhookEvent(TimestampModel, table=True):
+    """
+    Evento crudo recibido de la pasarela de pagos. Se guarda tal cual al recibirlo
+    (deduplicado por event_id) y un pool de workers lo aplica después, en orden por
+    suscripción (subject_ref).
+    """
+    __table_args__ = (
+        UniqueConstraint("provider", "event_id", name="unique_webhook_event"),
+        # Cola de pendientes: solo indexa lo que falta procesar
+        Index(
+            "ix_webhookevent_pending", "occurred_at", "created_at", "id",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+        Index(
+            "ix_webhookevent_pending_subject", "subject_ref", "occurred_at",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    provider: str
+    event_id: str
+    event_type: str
+    subject_ref: str | None = None  # ej. id de la suscripción en Stripe
+    occurred_at: datetime           # Momento del evento según la pasarela
+    payload: dict = Field(sa_column=Column(JSON, nullable=False))
+    status: WebhookEventStatus = Field(default=WebhookEventStatus.PENDING)
+    attempts: int = Field(default=0)
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    last_error: str | None = Field(default=None, sa_column=Column(Text))
+    processed_at: datetime | None = None
+
 # --- PEDIDOS Y DETALLES ---
 
 class Order(TimestampModel, table=True):
     """Cabecera de pedido (manual o por suscripción)."""
-    __table_args__ = (Index("ix_order_business_status", "business_id", "status"),)
+    __table_args__ = (
+        Index("ix_order_business_status", "business_id", "status"),
+        # Índices para la paginación por cursor (created_at, id)
+        Index("ix_order_business_created", "business_id", "created_at", "id"),
+        Index("ix_order_user_created", "user_id", "created_at", "id"),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     business_id: uuid.UUID = Field(foreign_key="business.id")
     user_id: uuid.UUID = Field(foreign_key="user.id")
@@ -321,6 +440,7 @@ class OrderItem(TimestampModel, table=True):
 
 class OrderReview(TimestampModel, table=True):
     """Reseña logística del pedido y local."""
+    __table_args__ = (Index("ix_orderreview_business_created", "business_id", "created_at", "id"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     business_id: uuid.UUID = Field(foreign_key="business.id")
     user_id: uuid.UUID = Field(foreign_key="user.id")
@@ -338,6 +458,11 @@ class OrderReview(TimestampModel, table=True):
 
 class ItemReview(TimestampModel, table=True):
     """Reseña de calidad de un producto o servicio específico."""
+    __table_args__ = (
+        Index("ix_itemreview_item_created", "item_id", "created_at", "id"),
+        # Una reseña por producto y pedido
+        UniqueConstraint("order_id", "item_id", name="unique_item_review_per_order"),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     item_id: uuid.UUID = Field(foreign_key="item.id")
     user_id: uuid.UUID = Field(foreign_key="user.id")
@@ -350,6 +475,11 @@ class ItemReview(TimestampModel, table=True):
 
 class StaffReview(TimestampModel, table=True):
     """Reseña del trato recibido por un miembro del staff."""
+    __table_args__ = (
+        Index("ix_staffreview_staff_created", "staff_id", "created_at", "id"),
+        # Una reseña por miembro del staff y pedido
+        UniqueConstraint("order_id", "staff_id", name="unique_staff_review_per_order"),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     staff_id: uuid.UUID = Field(foreign_key="staff.id")
     user_id: uuid.UUID = Field(foreign_key="user.id")
@@ -359,4 +489,22 @@ class StaffReview(TimestampModel, table=True):
     comment: str | None = Field(default=None, sa_column=Column(Text))
     
     staff: Staff = Relationship(back_populates="reviews")
-    
+
+class RatingAggregate(SQLModel, table=True):
+    """
+    Agregado incremental de calificaciones por sujeto (negocio, producto o staff) y
+    dimensión (ej. 'speed'). Se actualiza en la misma transacción que crea la reseña,
+    así los resúmenes se leen en O(1) sin recorrer las reseñas.
+    """
+    subject_type: RatingSubject = Field(primary_key=True)
+    subject_id: uuid.UUID = Field(primary_key=True)
+    dimension: str = Field(primary_key=True)
+    count: int = Field(default=0)
+    total: int = Field(default=0)
+    # Histograma: cuántas reseñas dieron 1, 2, 3, 4 y 5 estrellas
+    stars_1: int = Field(default=0)
+    stars_2: int = Field(default=0)
+    stars_3: int = Field(default=0)
+    stars_4: int = Field(default=0)
+    stars_5: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
@@ -1,6 +1,7 @@
 import uuid
 from abc import ABC, abstractmethod
 from collections.abc import Sequence
+from decimal import Decimal
 from typing import Any, Generic, TypeVar
 
 from app.domain.models.models import (
@@ -10,6 +11,7 @@ from app.domain.models.models import (
     Wallet,
     WalletTransaction,
 )
+from app.domain.schemas.pagination import Page, PageRequest
 
 ModelType = TypeVar("ModelType")
 
@@ -22,6 +24,10 @@ class IBaseRepository(ABC, Generic[ModelType]):
     async def list_all(self) -> Sequence[ModelType] | None:
         pass
     
+    @abstractmethod
+    async def list_page(self, page: PageRequest) -> Page[ModelType]:
+        pass
+    
     @abstractmethod
     async def get(self, id: uuid.UUID) -> ModelType | None:
         pass
@@ -30,6 +36,10 @@ class IBaseRepository(ABC, Generic[ModelType]):
     async def create(self, obj_in: ModelType) -> ModelType:
         pass
 
+    @abstractmethod
+    async def create_many(self, objs_in: Sequence[ModelType]) -> Sequence[ModelType]:
+        pass
+
     @abstractmethod
     async def update(
         self, db_obj: ModelType, obj_in: ModelType | dict[str, Any]
@@ -85,4 +95,26 @@ class IWalletRepository(IBaseRepository[Wallet]):
 
     @abstractmethod
     async def add_transaction(self, transaction: WalletTransaction) -> WalletTransaction:
+        pass
+
+    @abstractmethod
+    async def apply_debit(
+        self, user_id: uuid.UUID, business_id: uuid.UUID, amount: Decimal
+    ) -> Wallet | None:
+        pass
+
+    @abstractmethod
+    async def apply_credit(
+        self, user_id: uuid.UUID, business_id: uuid.UUID, amount: Decimal
+    ) -> Wallet:
+        pass
+
+    @abstractmethod
+    async def lock_wallets(
+        self, keys: Sequence[tuple[uuid.UUID, uuid.UUID]]
+    ) -> Sequence[Wallet]:
+        pass
+
+    @abstractmethod
+    async def apply_debits(self, amounts: dict[uuid.UUID, Decimal]) -> set[uuid.UUID]:
         pass
\ No newline at end of file
@@ -1,7 +1,9 @@
 import uuid
 from datetime import date
+from decimal import Decimal
+from enum import StrEnum
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class InventoryBase(BaseModel):
@@ -26,4 +28,148 @@ class InventoryRead(InventoryBase):
     id: uuid.UUID
     item_id: uuid.UUID
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class StockReservationResult(BaseModel):
+    """
+    Resultado de una reserva de stock en bloque.
+    'reserved' son los productos descontados; 'failed' los que no tenían registro
+    de inventario o cuya existencia no alcanzaba (no se descontó nada de ellos).
+    """
+    date: date
+    reserved: list[uuid.UUID] = []
+    failed: list[uuid.UUID] = []
+
+    @property
+    def is_complete(self) -> bool:
+        return not self.failed
+
+
+# --- CARGA MASIVA DE STOCK ---
+
+# Días máximos que cubre una carga por rango (evita generar millones de filas por error)
+MAX_STOCK_RANGE_DAYS = 92
+
+class StockEntry(BaseModel):
+    item_id: uuid.UUID
+    date: date
+    quantity: int = Field(ge=0)
+
+class BulkStockUpsert(BaseModel):
+    """Stock de muchos (producto, día) en una sola petición. Si se repite un par, gana el último."""
+    entries: list[StockEntry] = Field(min_length=1, max_length=5000)
+
+class StockRangeUpsert(BaseModel):
+    """Misma cantidad para varios productos en todos los días de [date_from, date_to]."""
+    item_ids: list[uuid.UUID] = Field(min_length=1, max_length=500)
+    date_from: date
+    date_to: date
+    quantity: int = Field(ge=0)
+
+    @model_validator(mode="after")
+    def check_range(self) -> "StockRangeUpsert":
+        days = (self.date_to - self.date_from).days + 1
+        if days < 1:
+            raise ValueError("date_to no puede ser anterior a date_from")
+        if days > MAX_STOCK_RANGE_DAYS:
+            raise ValueError(f"El rango no puede superar {MAX_STOCK_RANGE_DAYS} días")
+        return self
+
+class BulkStockResult(BaseModel):
+    created: int
+    updated: int
+
+# --- PLANTILLAS SEMANALES DE STOCK ---
+
+class InventoryTemplateDay(BaseModel):
+    day_of_week: int = Field(ge=0, le=6)  # 0=Lunes ... 6=Domingo
+    quantity: int = Field(ge=0)
+
+class InventoryTemplateSet(BaseModel):
+    """Plantilla semanal completa de un producto: los días omitidos dejan de materializarse."""
+    days: list[InventoryTemplateDay] = Field(max_length=7)
+
+class InventoryTemplateRead(InventoryTemplateDay):
+    id: uuid.UUID
+    item_id: uuid.UUID
+
+    model_config = ConfigDict(from_attributes=True)
+
+class MaterializeResult(BaseModel):
+    date_from: date
+    date_to: date
+    created: int
+
+# --- MATRIZ DE DISPONIBILIDAD (PRODUCTOS x FECHAS) ---
+
+# Días máximos de la matriz (pantallas de planificación y selector de fecha de la tienda)
+MAX_MATRIX_DAYS = 31
+
+class AvailabilityMatrix(BaseModel):
+    """
+    Stock de todos los productos de un negocio en un rango de fechas, en formato
+    columnar para reducir el payload: available[i][j] es el stock del producto
+    item_ids[i] el día dates[j] (None = sin inventario registrado ese día).
+    """
+    business_id: uuid.UUID
+    dates: list[date]
+    item_ids: list[uuid.UUID]
+    item_names: list[str]
+    produced: list[list[int | None]]
+    available: list[list[int | None]]
+
+# --- PLANIFICACIÓN DE PRODUCCIÓN ---
+
+# Días máximos del informe de planificación
+MAX_PLAN_DAYS = 31
+
+class ProductionPlanLine(BaseModel):
+    item_id: uuid.UUID
+    item_name: str
+    date: date
+    ordered: int     # Pedidos confirmados con recogida ese día
+    projected: int   # Suscripciones que recogen ese día y aún no tienen pedido generado
+    required: int    # ordered + projected
+    produced: int | None  # DailyInventory.quantity_produced (None = sin inventario registrado)
+    gap: int | None  # produced - required: negativo = falta producir
+
+class ProductionPlan(BaseModel):
+    """Cuánto hay que producir de cada producto cada día, frente a lo ya planificado."""
+    business_id: uuid.UUID
+    date_from: date
+    date_to: date
+    lines: list[ProductionPlanLine]
+
+# --- VALIDACIÓN DE CARRITO EN BLOQUE ---
+
+class CartLine(BaseModel):
+    item_id: uuid.UUID
+    quantity: int = Field(gt=0)
+    date: date
+
+class CartValidationRequest(BaseModel):
+    """Carrito completo a validar antes del checkout (mismas reglas que create_order)."""
+    business_id: uuid.UUID
+    items: list[CartLine] = Field(min_length=1, max_length=100)
+
+class CartLineStatus(StrEnum):
+    OK = "ok"
+    NOT_FOUND = "not_found"  # No existe, fue eliminado o es de otro negocio
+    OUT_OF_STOCK = "out_of_stock"  # Sin inventario ese día o no alcanza para el total pedido
+
+class CartLineResult(BaseModel):
+    item_id: uuid.UUID
+    date: date
+    quantity: int
+    status: CartLineStatus
+    name: str | None = None
+    unit_price: Decimal | None = None
+    line_total: Decimal | None = None
+    quantity_available: int | None = None
+
+class CartValidationResult(BaseModel):
+    """Resultado por línea y total calculado con los precios actuales del catálogo."""
+    business_id: uuid.UUID
+    is_valid: bool
+    total: Decimal
+    lines: list[CartLineResult]
@@ -53,4 +53,16 @@ class OrderRead(BaseModel):
     # Podemos incluir los items directamente en la respuesta si es útil para el frontend
     items: list[OrderItemRead] = []
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# Columnas de la exportación de pedidos (CSV / NDJSON), en el orden en que se escriben
+ORDER_EXPORT_FIELDS = (
+    "id",
+    "created_at",
+    "user_id",
+    "status",
+    "total_amount",
+    "pickup_slot",
+    "is_subscription_order",
+    "subscription_id",
+)
@@ -0,0 +1,53 @@
+import base64
+import binascii
+import uuid
+from datetime import datetime
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 200
+
+# ==========================================
+# PAGINACIÓN POR CURSOR (KEYSET)
+# ==========================================
+
+class PageRequest(BaseModel):
+    """
+    Petición de una página ordenada por (created_at, id) descendente.
+    after_* es la posición del último elemento de la página anterior (None = primera página).
+    """
+    limit: int = DEFAULT_PAGE_LIMIT
+    after_created_at: datetime | None = None
+    after_id: uuid.UUID | None = None
+
+    @classmethod
+    def from_cursor(cls, limit: int, cursor: str | None) -> "PageRequest":
+        """Construye la petición a partir del cursor opaco. Lanza ValueError si no es válido."""
+        if not cursor:
+            return cls(limit=limit)
+        created_at, id = decode_cursor(cursor)
+        return cls(limit=limit, after_created_at=created_at, after_id=id)
+
+class Page(BaseModel, Generic[T]):  # noqa: UP046
+    """Respuesta paginada: next_cursor es None cuando no hay más resultados."""
+    items: list[T]
+    next_cursor: str | None = None
+
+
+def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+    """Codifica la posición (created_at, id) en un cursor opaco apto para URLs."""
+    raw = f"{created_at.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Operación inversa de encode_cursor. Lanza ValueError si el cursor está mal formado."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id = raw.split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Cursor de paginación inválido.") from e
@@ -1,6 +1,11 @@
 import uuid
+from decimal import Decimal
+from typing import Generic
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.domain.models.models import RatingSubject
+from app.domain.schemas.pagination import Page, T
 
 
 # ==========================================
@@ -46,4 +51,81 @@ class StaffReviewCreate(BaseModel):
 
 class StaffReviewRead(StaffReviewCreate):
     id: uuid.UUID
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# ==========================================
+# 4. RESEÑA COMPLETA DEL PEDIDO (Una sola llamada)
+# ==========================================
+class OrderItemRating(BaseModel):
+    item_id: uuid.UUID
+    rating_quality: int = Field(..., ge=1, le=5)
+    comment: str | None = None
+
+class OrderStaffRating(BaseModel):
+    staff_id: uuid.UUID
+    rating_service: int = Field(..., ge=1, le=5)
+    comment: str | None = None
+
+class FullReviewCreate(BaseModel):
+    """
+    Reseña del pedido, de sus productos y de su staff en una sola petición.
+    El negocio se toma del pedido; productos y staff deben pertenecer a él.
+    """
+    user_id: uuid.UUID
+    rating_attention: int = Field(..., ge=1, le=5)
+    rating_speed: int = Field(..., ge=1, le=5)
+    rating_location: int = Field(..., ge=1, le=5)
+    rating_general: int = Field(..., ge=1, le=5)
+    comment: str | None = None
+    items: list[OrderItemRating] = []
+    staff: list[OrderStaffRating] = []
+
+    @field_validator("items")
+    @classmethod
+    def unique_items(cls, value: list[OrderItemRating]) -> list[OrderItemRating]:
+        if len({rating.item_id for rating in value}) != len(value):
+            raise ValueError("Cada producto solo puede calificarse una vez")
+        return value
+
+    @field_validator("staff")
+    @classmethod
+    def unique_staff(cls, value: list[OrderStaffRating]) -> list[OrderStaffRating]:
+        if len({rating.staff_id for rating in value}) != len(value):
+            raise ValueError("Cada miembro del staff solo puede calificarse una vez")
+        return value
+
+class FullReviewRead(BaseModel):
+    order: OrderReviewRead
+    items: list[ItemReviewRead]
+    staff: list[StaffReviewRead]
+
+# ==========================================
+# 5. RESUMEN DE CALIFICACIONES (Agregados)
+# ==========================================
+class RatingDimensionSummary(BaseModel):
+    dimension: str
+    count: int
+    average: Decimal | None
+    histogram: list[int]  # Reseñas con 1, 2, 3, 4 y 5 estrellas (en ese orden)
+
+class RatingSummary(BaseModel):
+    subject_type: RatingSubject
+    subject_id: uuid.UUID
+    count: int
+    dimensions: list[RatingDimensionSummary]
+
+# ==========================================
+# 6. FEEDS DE RESEÑAS (Filtros + Resumen)
+# ==========================================
+class ReviewFilter(BaseModel):
+    """
+    Filtros de los feeds de reseñas. La calificación se evalúa sobre la dimensión
+    principal de cada tipo: general (pedido), calidad (producto) o servicio (staff).
+    """
+    min_rating: int | None = Field(None, ge=1, le=5)
+    max_rating: int | None = Field(None, ge=1, le=5)
+    has_comment: bool | None = None
+
+class ReviewFeed(Page[T], Generic[T]):  # noqa: UP046
+    """Página de reseñas con el resumen global del sujeto (no depende de los filtros)."""
+    summary: RatingSummary
@@ -0,0 +1,23 @@
+import datetime
+
+from pydantic import BaseModel
+
+from app.domain.schemas.business import BusinessRead
+from app.domain.schemas.category import CategoryRead, ItemRead
+
+
+class MenuItem(ItemRead):
+    """Producto del menú con su disponibilidad del día (None = sin inventario registrado)."""
+    quantity_available: int | None = None
+
+class MenuCategory(CategoryRead):
+    items: list[MenuItem] = []
+
+class StorefrontMenu(BaseModel):
+    """
+    Documento completo de la tienda pública: marca del negocio, categorías,
+    productos y stock del día. Se precalcula y se sirve desde caché con ETag.
+    """
+    business: BusinessRead
+    date: datetime.date
+    categories: list[MenuCategory]
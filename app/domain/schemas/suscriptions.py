@@ -1,8 +1,10 @@
 import uuid
-from datetime import datetime, time
+from datetime import date, datetime, time
 from decimal import Decimal
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
+
+from app.domain.models.models import WEEKDAY_CODES, SubscriptionStatus
 
 # ==========================================
 # DETALLE DE SUSCRIPCIÓN (SubscriptionItem)
@@ -34,11 +36,23 @@ class SubscriptionPaymentRead(BaseModel):
 class SubscriptionCreate(BaseModel):
     user_id: uuid.UUID
     business_id: uuid.UUID
-    frequency_days: str   
+    frequency_days: str  # Días de recogida separados por coma, ej. "MON,WED,FRI"
     pickup_time: time
     current_period_start: datetime
     items: list[SubscriptionItemBase]
 
+    @field_validator("frequency_days")
+    @classmethod
+    def valid_weekdays(cls, value: str) -> str:
+        """Normaliza a códigos en mayúsculas, sin repetidos y en orden de la semana."""
+        codes = {code.strip().upper() for code in value.split(",") if code.strip()}
+        unknown = codes - set(WEEKDAY_CODES)
+        if unknown:
+            raise ValueError(f"Días no válidos: {', '.join(sorted(unknown))}. Usa {', '.join(WEEKDAY_CODES)}")
+        if not codes:
+            raise ValueError("Indica al menos un día de recogida")
+        return ",".join(code for code in WEEKDAY_CODES if code in codes)
+
 class SubscriptionStatusUpdate(BaseModel):
     status: str
     current_period_end: datetime | None = None
@@ -51,7 +65,53 @@ class SubscriptionRead(BaseModel):
     status: str
     current_period_start: datetime
     current_period_end: datetime
-    frequency_days: int
+    frequency_days: str
+    weekday_mask: int
     pickup_time: time
     items: list[SubscriptionItemRead] = []
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SubscriptionOrdersScheduled(BaseModel):
+    """Corrida del generador lanzada en segundo plano (el resultado queda en el log del job)."""
+    date: date
+    status: str = "scheduled"
+
+
+class SubscriptionOrdersResult(BaseModel):
+    """Resumen de una corrida del generador de pedidos recurrentes."""
+    date: date
+    processed: int = 0      # Suscripciones a las que les tocaba pedido
+    created: int = 0        # Pedidos generados
+    skipped_stock: int = 0  # Sin stock suficiente (se reintentan en la siguiente corrida)
+    skipped_funds: int = 0  # Sin pasarela y sin monedero o saldo (se reintentan en la siguiente corrida)
+    total_amount: Decimal = Decimal("0")  # Valor de los pedidos generados (cobrados o no del monedero)
+
+
+class SubscriptionSweepResult(BaseModel):
+    """Resumen de una corrida del barrido de fin de periodo."""
+    processed: int = 0  # Suscripciones con el periodo vencido
+    renewed: int = 0    # Periodo renovado (suscripciones sin pasarela)
+    past_due: int = 0   # Stripe no confirmó la renovación: pasan a PAST_DUE
+    canceled: int = 0   # Agotaron los días de gracia en PAST_DUE
+
+
+class SubscriptionStatusBreakdown(BaseModel):
+    status: SubscriptionStatus
+    count: int
+    monthly_value: Decimal  # Valor mensual equivalente de las suscripciones en ese estado
+
+class SubscriptionMetrics(BaseModel):
+    """
+    Ingresos recurrentes de un negocio. El valor mensual de una suscripción es lo que
+    suman sus líneas por recogida x recogidas por semana x 52/12.
+    """
+    business_id: uuid.UUID
+    mrr: Decimal             # Valor mensual de las suscripciones activas (ver active_count)
+    active_count: int        # Suscripciones que cuentan en el MRR (ACTIVE y is_active)
+    churned_count: int       # Suscripciones canceladas
+    by_status: list[SubscriptionStatusBreakdown]
+    payments_window_days: int
+    collected_amount: Decimal  # Cobros exitosos en la ventana
+    failed_payments: int       # Cobros fallidos en la ventana
+    computed_at: datetime
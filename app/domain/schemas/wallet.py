@@ -66,4 +66,15 @@ class TransactionRead(BaseModel):
     reference_id: uuid.UUID | None = None
     external_reference: str | None = None
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# Columnas de la exportación del libro mayor (CSV / NDJSON), en el orden en que se escriben
+TRANSACTION_EXPORT_FIELDS = (
+    "id",
+    "created_at",
+    "type",
+    "amount",
+    "description",
+    "reference_id",
+    "external_reference",
+)
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+
+class WebhookAck(BaseModel):
+    """Respuesta inmediata a la pasarela: el evento quedó guardado (o ya lo estaba)."""
+    received: bool = True
+    event_id: str
+    duplicate: bool = False  # True si era un reintento de un evento ya recibido
+
+
+class WebhookProcessResult(BaseModel):
+    """Resumen de una pasada de los workers sobre la cola de eventos."""
+    claimed: int = 0    # Eventos tomados de la cola
+    processed: int = 0  # Aplicados a la suscripción
+    ignored: int = 0    # Tipo no manejado o suscripción desconocida
+    retried: int = 0    # Fallaron y se reintentarán más tarde
+    failed: int = 0     # Agotaron WEBHOOK_MAX_ATTEMPTS
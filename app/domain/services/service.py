@@ -21,11 +21,15 @@ from app.domain.models.models import (
     Subscription,
     SubscriptionItem,
     SubscriptionPayment,
+    SubscriptionStatus,
     Wallet,
 )
 from app.domain.schemas.auth import LoginRequest, SocialLoginRequest, Token
 from app.domain.schemas.business import BusinessCreate
 from app.domain.schemas.category import CategoryCreate, ItemCreate
+from app.domain.schemas.inventory import BulkStockResult, StockReservationResult
+from app.domain.schemas.pagination import Page, PageRequest
+from app.domain.schemas.reviews import ReviewFilter
 
 ModelType = TypeVar("ModelType")
 
@@ -43,6 +47,10 @@ class IService(ABC, Generic[ModelType]):
     async def list_all(self) -> Sequence[ModelType] | None:
         pass
 
+    @abstractmethod
+    async def list_page(self, page: PageRequest) -> Page[ModelType]:
+        pass
+
     @abstractmethod
     async def create(self, data: Any) -> ModelType:
         pass
@@ -148,10 +156,25 @@ class IInventoryService(ABC):
         """Establece la cantidad producida/disponible para un día específico."""
         pass
 
+    @abstractmethod
+    async def bulk_set_daily_stock(self, entries: Sequence[tuple[uuid.UUID, date, int]]) -> BulkStockResult:
+        """Fija el stock de muchos (producto, día) en bloque e informa creados/actualizados."""
+        pass
+
     @abstractmethod
     async def check_availability(self, item_id: uuid.UUID, target_date: date, requested_qty: int) -> bool:
         """Verifica si existe stock suficiente antes de procesar una orden."""
         pass
+
+    @abstractmethod
+    async def reserve_stock(self, target_date: date, quantities: dict[uuid.UUID, int]) -> StockReservationResult:
+        """Descuenta stock de varios productos de forma atómica e informa qué líneas fallaron."""
+        pass
+
+    @abstractmethod
+    async def lock_stock(self, target_date: date, item_ids: Sequence[uuid.UUID]) -> dict[uuid.UUID, int]:
+        """Lee y bloquea el stock disponible de varios productos para un día."""
+        pass
 class IOrderService(ABC):
     """
     Contrato para el servicio de Pedidos.
@@ -163,6 +186,11 @@ class IOrderService(ABC):
         """Guarda la cabecera del pedido y sus líneas de detalle atómicamente."""
         pass
 
+    @abstractmethod
+    async def save_orders(self, orders: list[Order], items: list[OrderItem]) -> None:
+        """Guarda muchos pedidos y sus líneas en bloque."""
+        pass
+
     @abstractmethod
     async def get_order_with_items(self, order_id: uuid.UUID) -> Order | None:
         """Obtiene un pedido incluyendo todas sus líneas de detalle (Eager Loading)."""
@@ -174,13 +202,13 @@ class IOrderService(ABC):
         pass
 
     @abstractmethod
-    async def get_business_orders(self, business_id: uuid.UUID, status_filter: OrderStatus | None = None) -> Sequence[Order]:
-        """Obtiene el listado de pedidos de un negocio, filtrable por estado."""
+    async def get_business_orders(self, business_id: uuid.UUID, page: PageRequest, status_filter: OrderStatus | None = None) -> Page[Order]:
+        """Obtiene una página de pedidos de un negocio, filtrable por estado."""
         pass
 
     @abstractmethod
-    async def get_user_orders(self, user_id: uuid.UUID) -> Sequence[Order]:
-        """Obtiene el historial de compras de un usuario."""
+    async def get_user_orders(self, user_id: uuid.UUID, page: PageRequest) -> Page[Order]:
+        """Obtiene una página del historial de compras de un usuario."""
         pass
     
     
@@ -227,14 +255,69 @@ class ISubscriptionService(ABC):
         pass
 
     @abstractmethod
-    async def get_user_subscriptions(self, user_id: uuid.UUID) -> Sequence[Subscription]:
-        """Obtiene todas las suscripciones de un usuario."""
+    async def get_by_stripe_id(self, stripe_subscription_id: str) -> Subscription | None:
+        """Suscripción local asociada a una suscripción de Stripe."""
+        pass
+
+    @abstractmethod
+    async def apply_provider_event(
+        self,
+        subscription: Subscription,
+        occurred_at: datetime,
+        new_status: SubscriptionStatus | None = None,
+        period_end: datetime | None = None,
+    ) -> Subscription:
+        """Aplica el estado informado por la pasarela y avanza la marca del último evento."""
+        pass
+
+    @abstractmethod
+    async def upsert_invoice_payment(self, payment_data: dict) -> bool:
+        """Registra o actualiza el cobro de un invoice (idempotente por stripe_invoice_id)."""
+        pass
+
+    @abstractmethod
+    async def get_user_subscriptions(self, user_id: uuid.UUID, page: PageRequest) -> Page[Subscription]:
+        """Obtiene una página de las suscripciones de un usuario."""
         pass
 
     @abstractmethod
-    async def get_business_subscriptions(self, business_id: uuid.UUID, active_only: bool = True) -> Sequence[Subscription]:
+    async def get_business_subscriptions(self, business_id: uuid.UUID, page: PageRequest, active_only: bool = True) -> Page[Subscription]:
         """Obtiene las suscripciones de un negocio (útil para reportes)."""
         pass
+
+    @abstractmethod
+    async def get_due_subscriptions(
+        self, target_date: date, after_id: uuid.UUID | None, limit: int
+    ) -> Sequence[Subscription]:
+        """Tanda de suscripciones con pedido pendiente para una fecha (bloqueadas)."""
+        pass
+
+    @abstractmethod
+    async def get_business_due_subscriptions(self, business_id: uuid.UUID, weekday: int) -> Sequence[Subscription]:
+        """Suscripciones activas de un negocio con recogida ese día de la semana."""
+        pass
+
+    @abstractmethod
+    async def get_lines_for_subscriptions(self, subscription_ids: Sequence[uuid.UUID]) -> Sequence[Any]:
+        """Líneas (producto, cantidad, precio) de varias suscripciones."""
+        pass
+
+    @abstractmethod
+    async def mark_generated(self, subscription_ids: Sequence[uuid.UUID], target_date: date) -> None:
+        """Marca que las suscripciones ya tienen su pedido de esa fecha."""
+        pass
+
+    @abstractmethod
+    async def get_expired_subscriptions(
+        self, now: datetime, renewal_cutoff: datetime, grace_cutoff: datetime, limit: int
+    ) -> Sequence[Subscription]:
+        """Tanda de suscripciones con el periodo vencido (bloqueadas)."""
+        pass
+
+    @abstractmethod
+    async def apply_period_changes(self, changes: Sequence[dict[str, Any]]) -> None:
+        """Nuevo estado y fin de periodo de varias suscripciones."""
+        pass
     
     
 
@@ -246,7 +329,19 @@ class IReviewService(ABC):
         pass
 
     @abstractmethod
-    async def get_business_reviews(self, business_id: uuid.UUID) -> Sequence[OrderReview]:
+    async def get_business_reviews(
+        self, business_id: uuid.UUID, page: PageRequest, filters: ReviewFilter | None = None
+    ) -> Page[OrderReview]:
+        pass
+
+    @abstractmethod
+    async def get_order_with_items(self, order_id: uuid.UUID) -> Order | None:
+        pass
+
+    @abstractmethod
+    async def create_reviews(
+        self, reviews: Sequence[OrderReview | ItemReview | StaffReview]
+    ) -> Sequence[OrderReview | ItemReview | StaffReview]:
         pass
 
     @abstractmethod
@@ -254,7 +349,9 @@ class IReviewService(ABC):
         pass
 
     @abstractmethod
-    async def get_item_reviews(self, item_id: uuid.UUID) -> Sequence[ItemReview]:
+    async def get_item_reviews(
+        self, item_id: uuid.UUID, page: PageRequest, filters: ReviewFilter | None = None
+    ) -> Page[ItemReview]:
         pass
 
     @abstractmethod
@@ -262,7 +359,9 @@ class IReviewService(ABC):
         pass
 
     @abstractmethod
-    async def get_staff_reviews(self, staff_id: uuid.UUID) -> Sequence[StaffReview]:
+    async def get_staff_reviews(
+        self, staff_id: uuid.UUID, page: PageRequest, filters: ReviewFilter | None = None
+    ) -> Page[StaffReview]:
         pass
     
 
@@ -1,17 +1,48 @@
+import itertools
+import time
 from collections.abc import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlmodel import SQLModel
 
 from app.core.config import settings
+from app.infrastructure.database.instrumentation import install_query_instrumentation
+from app.infrastructure.database.pool import InstrumentedAsyncQueuePool
+
+
+def build_engine(url: str) -> AsyncEngine:
+    """
+    Crea un motor asíncrono con el pool y las cachés de asyncpg definidas en Settings.
+    El pool es por proceso, así que estos valores se dimensionan por worker de Granian.
+    """
+    new_engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        future=True,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        },
+    )
+    if settings.SQL_INSTRUMENTATION:
+        install_query_instrumentation(new_engine)
+    return new_engine
 
 # Motor de base de datos asíncrono para PostgreSQL
 # Se utiliza la URL configurada en los settings
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=True,
-    future=True
-)
+engine = build_engine(settings.DATABASE_URL)
 
 # Constructor de sesiones asíncronas (async_sessionmaker es el estándar para SQLAlchemy 2.0+)
 # Esto resuelve el error de sobrecarga en el __init__
@@ -21,6 +52,17 @@ async_session = async_sessionmaker(
     class_=AsyncSession
 )
 
+# Réplicas de lectura: un engine y un sessionmaker por réplica, repartidos en round-robin
+replica_engines = [build_engine(url) for url in settings.REPLICA_DATABASE_URLS]
+replica_sessions = [
+    async_sessionmaker(bind=replica, expire_on_commit=False, class_=AsyncSession)
+    for replica in replica_engines
+]
+_replica_cycle = itertools.cycle(replica_sessions)
+
+# Cookie con el instante (epoch) hasta el que un cliente debe leer del primario
+READ_YOUR_WRITES_COOKIE = "db_read_primary_until"
+
 async def init_db():
     """Inicializa las tablas en la base de datos (usar solo en desarrollo)"""
     async with engine.begin() as conn:
@@ -34,4 +76,37 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
     Se utiliza AsyncGenerator para indicar que la función usa 'yield'.
     """
     async with async_session() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency para las Queries (solo lectura).
+    Usa una réplica de lectura si hay configuradas; vuelve al primario si no hay réplicas
+    o si el cliente acaba de escribir y sigue dentro de su ventana "read-your-writes".
+    """
+    session_factory = async_session
+    if replica_sessions and not reads_own_writes(request):
+        session_factory = next(_replica_cycle)
+
+    async with session_factory() as session:
+        yield session
+
+def reads_own_writes(request: Request) -> bool:
+    """Indica si la petición está dentro de la ventana read-your-writes de su cliente."""
+    until = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    try:
+        return until is not None and float(until) > time.time()
+    except ValueError:
+        return False
+
+def mark_read_your_writes(response: Response) -> None:
+    """Tras un Command exitoso, fija la ventana en la que ese cliente leerá del primario."""
+    window = settings.READ_YOUR_WRITES_SECONDS
+    if window > 0:
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            str(time.time() + window),
+            max_age=window,
+            httponly=True,
+            samesite="lax",
+        )
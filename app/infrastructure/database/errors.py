@@ -0,0 +1,13 @@
+from sqlalchemy.exc import IntegrityError
+
+# SQLSTATE de Postgres para violación de restricción UNIQUE
+UNIQUE_VIOLATION = "23505"
+
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    """
+    Distingue un duplicado (UNIQUE / PRIMARY KEY) de otras violaciones de integridad
+    (FK, NOT NULL, CHECK). Permite insertar directamente y dejar que la restricción
+    detecte el duplicado, en lugar de hacer un SELECT previo.
+    """
+    return getattr(error.orig, "sqlstate", None) == UNIQUE_VIOLATION
@@ -0,0 +1,104 @@
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class QueryStats:
+    """
+    Métricas SQL acumuladas durante un bloque (normalmente una petición HTTP).
+    Los hooks del engine las alimentan a través de un ContextVar, así cada petición
+    solo ve sus propias sentencias aunque compartan pool y worker.
+    """
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.rows = 0
+        self.slowest_ms = 0.0
+        self.slowest_statement: str | None = None
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, elapsed_ms: float, rowcount: int) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        # asyncpg informa filas también en SELECT; -1 significa "desconocido"
+        if rowcount > 0:
+            self.rows += rowcount
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+        self.statements[statement] += 1
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        """Sentencias idénticas ejecutadas al menos `threshold` veces (síntoma típico de N+1)."""
+        return [(stmt, n) for stmt, n in self.statements.most_common() if n >= threshold]
+
+    def as_log_fields(self) -> dict[str, Any]:
+        return {
+            "db_queries": self.count,
+            "db_time_ms": round(self.total_ms, 2),
+            "db_rows": self.rows,
+            "db_slowest_ms": round(self.slowest_ms, 2),
+        }
+
+    def server_timing(self, total_ms: float | None = None) -> str:
+        """Valor de la cabecera Server-Timing (visible en las DevTools del navegador)."""
+        parts = [f'db;dur={self.total_ms:.2f};desc="{self.count} queries"']
+        if total_ms is not None:
+            parts.append(f"app;dur={total_ms:.2f}")
+        return ", ".join(parts)
+
+
+# Colectores activos en el contexto actual (pueden anidarse: petición + query_budget de un test)
+_collectors: ContextVar[tuple[QueryStats, ...]] = ContextVar("sql_query_collectors", default=())
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Acumula en un QueryStats nuevo todas las sentencias ejecutadas dentro del bloque."""
+    stats = QueryStats()
+    token = _collectors.set((*_collectors.get(), stats))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[QueryStats]:
+    """
+    Helper para tests: falla si el bloque ejecuta más de `max_queries` sentencias.
+    Ej: `with query_budget(4): await client.post("/api/v1/orders/", json=...)`
+    """
+    with track_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        detail = "\n".join(f"  {n}x {stmt}" for stmt, n in stats.statements.most_common(5))
+        raise AssertionError(
+            f"Presupuesto de queries excedido: {stats.count} > {max_queries}\n{detail}"
+        )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None and _collectors.get():
+        context._query_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    rowcount = getattr(cursor, "rowcount", -1) or 0
+    for stats in _collectors.get():
+        stats.record(statement, elapsed_ms, rowcount)
+
+
+def install_query_instrumentation(engine: AsyncEngine) -> None:
+    """Registra los hooks de ejecución en el engine (fuera de un track_queries no hacen nada)."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,12 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def try_advisory_xact_lock(db: AsyncSession, name: str) -> bool:
+    """
+    Intenta tomar un advisory lock de Postgres ligado a la transacción en curso.
+    Devuelve False (sin esperar) si otra sesión ya lo tiene; se libera solo en el
+    commit/rollback. Sirve para que, con varios workers, un job corra una sola vez a la vez.
+    """
+    result = await db.execute(select(func.pg_try_advisory_xact_lock(func.hashtext(name))))
+    return bool(result.scalar())
@@ -0,0 +1,75 @@
+import time
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolWaitStats:
+    """
+    Contadores acumulados de la espera por una conexión del pool.
+    Son por proceso: cada worker de Granian tiene su propio pool y sus propias métricas.
+    """
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, waited: float) -> None:
+        self.checkouts += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "checkout_attempts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_total_ms": round(self.total_wait * 1000, 3),
+            "wait_avg_ms": round(self.total_wait * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+            "wait_max_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Pool asíncrono estándar de SQLAlchemy que además mide cuánto tarda cada checkout
+    (incluida la apertura de conexiones nuevas) y cuenta los timeouts por pool agotado.
+    """
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.wait_stats.timeouts += 1
+            raise
+        finally:
+            self.wait_stats.record(time.perf_counter() - started)
+
+
+def get_pool_stats(engine: AsyncEngine) -> dict[str, Any]:
+    """Foto del estado del pool de un engine: conexiones prestadas, overflow y esperas."""
+    pool = engine.pool
+    stats: dict[str, Any] = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "max_overflow": pool._max_overflow,
+                "timeout_s": pool.timeout(),
+            }
+        )
+
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        stats.update(pool.wait_stats.snapshot())
+
+    return stats
@@ -0,0 +1,44 @@
+from collections.abc import Callable
+from types import TracebackType
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class UnitOfWork:
+    """
+    Delimita la transacción de un caso de uso (un Command).
+    Dentro del bloque los repositorios solo hacen flush; al salir sin errores se hace
+    un único commit, y ante cualquier excepción (incluida HTTPException) un rollback.
+
+    Uso:
+        async with self.uow:
+            ...
+            self.uow.after_commit(lambda: menu_cache.invalidate_business(business_id))
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._after_commit: list[Callable[[], None]] = []
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Registra una acción (ej. invalidar una caché) que solo se ejecuta si el commit
+        tiene éxito. Si hay rollback se descarta.
+        """
+        self._after_commit.append(callback)
+
+    async def __aenter__(self) -> "UnitOfWork":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        callbacks, self._after_commit = self._after_commit, []
+        if exc_type is None:
+            await self.db.commit()
+            for callback in callbacks:
+                callback()
+        else:
+            await self.db.rollback()
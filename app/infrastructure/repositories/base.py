@@ -1,21 +1,80 @@
 import uuid
-from collections.abc import Sequence
-from datetime import datetime
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime, timedelta
 from typing import Any, Generic, TypeVar
 
 from pydantic import BaseModel
+from sqlalchemy import RowMapping, Select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import SQLModel, select
+from sqlmodel import SQLModel, col, select
+from sqlmodel.sql.expression import SelectOfScalar
 
 from app.domain.repositories.repositories import IBaseRepository
+from app.domain.schemas.pagination import Page, PageRequest, encode_cursor
 
 # Definimos el TypeVar para asegurar compatibilidad con Python 3.10 y 3.11
 ModelType = TypeVar("ModelType", bound=SQLModel)
 
+
+async def paginate(
+    db: AsyncSession,
+    statement: SelectOfScalar[ModelType],
+    model: type[ModelType],
+    page: PageRequest,
+) -> Page[ModelType]:
+    """
+    Paginación por cursor (keyset) sobre (created_at, id) descendente.
+    En vez de OFFSET filtra por la posición del último elemento visto, así cada página
+    cuesta lo mismo y usa los índices compuestos (..., created_at, id).
+    Se pide un registro extra para saber si existe una página siguiente.
+    """
+    created_at, id = col(model.created_at), col(model.id)  # type: ignore[attr-defined]
+    if page.after_created_at is not None and page.after_id is not None:
+        statement = statement.where(tuple_(created_at, id) < tuple_(page.after_created_at, page.after_id))
+
+    statement = statement.order_by(created_at.desc(), id.desc()).limit(page.limit + 1)
+    result = await db.execute(statement)
+    rows = list(result.scalars().all())
+
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)  # type: ignore[attr-defined]
+    return Page(items=rows, next_cursor=next_cursor)
+
+
+# Filas que el cursor del servidor entrega por cada viaje a la DB en las exportaciones
+EXPORT_YIELD_PER = 1000
+
+def created_between(
+    statement: Select,
+    model: type[SQLModel],
+    date_from: date | None,
+    date_to: date | None,
+) -> Select:
+    """Filtra por created_at dentro de [date_from, date_to] (ambos días incluidos)."""
+    created_at = col(model.created_at)  # type: ignore[attr-defined]
+    if date_from:
+        statement = statement.where(created_at >= date_from)
+    if date_to:
+        statement = statement.where(created_at < date_to + timedelta(days=1))
+    return statement
+
+async def stream_rows(db: AsyncSession, statement: Select) -> AsyncIterator[RowMapping]:
+    """
+    Recorre el resultado con un cursor del lado del servidor (yield_per).
+    Pensado para SELECT de columnas, no entidades: nada se acumula en el identity map.
+    """
+    result = await db.stream(statement.execution_options(yield_per=EXPORT_YIELD_PER))
+    async for row in result.mappings():
+        yield row
+
 class BaseRepository(IBaseRepository[ModelType], Generic[ModelType]):  # noqa: UP046
     """
     Abstracción genérica para operaciones CRUD comunes.
     Compatible con Python 3.10+ (PEP 484).
+    Las escrituras solo hacen flush: el commit lo hace la UnitOfWork del Command.
     """
     def __init__(self, model: type[ModelType], db: AsyncSession):
         self.model = model
@@ -30,13 +89,28 @@ class BaseRepository(IBaseRepository[ModelType], Generic[ModelType]):  # noqa: U
         result = await self.db.execute(statement)
         # 3. Retornamos los resultados como una lista (scalars)
         return result.scalars().all()
+
+    async def list_page(self, page: PageRequest) -> Page[ModelType]:
+        """Versión paginada por cursor de list_all."""
+        return await paginate(self.db, select(self.model), self.model, page)
     
     
     async def create(self, obj_in: ModelType) -> ModelType:
+        # id, created_at y updated_at se generan en Python, así que tras el flush el
+        # objeto ya está completo y no hace falta un refresh (SELECT extra)
         self.db.add(obj_in)
-        await self.db.commit()
-        await self.db.refresh(obj_in)
+        await self.db.flush()
         return obj_in
+
+    async def create_many(self, objs_in: Sequence[ModelType]) -> Sequence[ModelType]:
+        """
+        Inserta varios registros del mismo modelo en un solo flush.
+        Con los PK generados en Python, SQLAlchemy los agrupa en un único executemany
+        (un viaje a la DB) en vez de un INSERT por fila.
+        """
+        self.db.add_all(objs_in)
+        await self.db.flush()
+        return objs_in
     
     
     async def update(
@@ -61,8 +135,7 @@ class BaseRepository(IBaseRepository[ModelType], Generic[ModelType]):  # noqa: U
                 setattr(db_obj, field, value)
 
         self.db.add(db_obj)
-        await self.db.commit()
-        await self.db.refresh(db_obj)
+        await self.db.flush()
         return db_obj
 
     async def delete(self, id: uuid.UUID) -> bool:
@@ -74,6 +147,6 @@ class BaseRepository(IBaseRepository[ModelType], Generic[ModelType]):  # noqa: U
                 self.db.add(obj)
             else:
                 await self.db.delete(obj)
-            await self.db.commit()
+            await self.db.flush()
             return True
         return False
\ No newline at end of file
@@ -1,29 +1,137 @@
+import copy
 import uuid
 from collections.abc import Sequence
+from typing import Any
 
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
 from sqlmodel import select
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.domain.models.models import Business
 from app.domain.repositories.repositories import IBusinessRepository
 from app.infrastructure.repositories.base import BaseRepository
 
 
+class BusinessLookupCache:
+    """
+    Caché en memoria (por worker) de negocios por id y por slug.
+    Guarda una copia de las columnas, nunca la instancia ORM: cada sesión recibe su
+    propio objeto. También recuerda los slugs/ids inexistentes (caché negativa) con un
+    TTL más corto, para que un slug inválido no golpee la base de datos en cada visita.
+    """
+    def __init__(self, maxsize: int, ttl_seconds: float, negative_ttl_seconds: float):
+        self._by_id: TTLCache[uuid.UUID, dict[str, Any]] = TTLCache(maxsize, ttl_seconds)
+        self._id_by_slug: TTLCache[str, uuid.UUID] = TTLCache(maxsize, ttl_seconds)
+        self._missing: TTLCache[str | uuid.UUID, bool] = TTLCache(maxsize, negative_ttl_seconds)
+        # hits = búsquedas resueltas en memoria (positivas o negativas); misses = fueron a la DB
+        self.hits = 0
+        self.misses = 0
+
+    def get_by_id(self, business_id: uuid.UUID) -> dict[str, Any] | None:
+        return self._count(self._by_id.get(business_id))
+
+    def get_by_slug(self, slug: str) -> dict[str, Any] | None:
+        business_id = self._id_by_slug.get(slug)
+        return self._count(self._by_id.get(business_id) if business_id else None)
+
+    def is_missing(self, key: str | uuid.UUID) -> bool:
+        return self._count(self._missing.get(key)) is not None
+
+    def _count(self, value: Any) -> Any:
+        if value is not None:
+            self.hits += 1
+        return value
+
+    def store(self, business: Business) -> None:
+        self.misses += 1
+        values = {column.key: getattr(business, column.key) for column in Business.__table__.columns}
+        self._by_id.set(business.id, values)
+        self._id_by_slug.set(business.slug, business.id)
+
+    def store_missing(self, key: str | uuid.UUID) -> None:
+        self.misses += 1
+        self._missing.set(key, True)
+
+    def invalidate(self, business_id: uuid.UUID) -> None:
+        values = self._by_id.pop(business_id)
+        if values:
+            self._id_by_slug.pop(values["slug"])
+        self._missing.pop(business_id)
+
+    def invalidate_slug(self, slug: str) -> None:
+        """Olvida un slug (ej. al registrar un negocio que antes no existía)."""
+        self._missing.pop(slug)
+        business_id = self._id_by_slug.pop(slug)
+        if business_id:
+            self._by_id.pop(business_id)
+
+    def clear(self) -> None:
+        self._by_id.clear()
+        self._id_by_slug.clear()
+        self._missing.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._by_id),
+            "hits": self.hits,
+            "misses": self.misses,
+            "negative_size": len(self._missing),
+        }
+
+
+business_cache = BusinessLookupCache(
+    maxsize=settings.BUSINESS_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.BUSINESS_CACHE_TTL_SECONDS,
+    negative_ttl_seconds=settings.BUSINESS_CACHE_NEGATIVE_TTL_SECONDS,
+)
+
+
 class BusinessRepository(BaseRepository[Business], IBusinessRepository):
     """
     Repositorio especializado para la gestión de negocios (tenants).
+    Las búsquedas por id y por slug pasan por business_cache; los Commands que
+    modifican un negocio deben invalidarlo tras el commit.
     """
     def __init__(self, db: AsyncSession):
         super().__init__(Business, db)
 
+    async def get(self, id: uuid.UUID) -> Business | None:
+        # Si ya está en la sesión (quizá con cambios pendientes) manda la sesión
+        in_session = self.db.identity_map.get(identity_key(Business, id))
+        if in_session is not None:
+            return in_session  # type: ignore[return-value]
+
+        values = business_cache.get_by_id(id)
+        if values is not None:
+            return await self._attach(values)
+        if business_cache.is_missing(id):
+            return None
+
+        business = await super().get(id)
+        self._remember(id, business)
+        return business
+
     async def get_by_slug(self, slug: str) -> Business | None:
         """
-        Busca un negocio por su slug único. 
+        Busca un negocio por su slug único.
         Útil para cargar la tienda desde la URL del navegador.
         """
+        values = business_cache.get_by_slug(slug)
+        if values is not None:
+            in_session = self.db.identity_map.get(identity_key(Business, values["id"]))
+            return in_session if in_session is not None else await self._attach(values)  # type: ignore[return-value]
+        if business_cache.is_missing(slug):
+            return None
+
         statement = select(Business).where(Business.slug == slug)
         result = await self.db.execute(statement)
-        return result.scalar_one_or_none()
+        business = result.scalar_one_or_none()
+        self._remember(slug, business)
+        return business
 
     async def get_by_owner(self, owner_id: uuid.UUID) -> Sequence[Business]:
         """
@@ -36,6 +144,25 @@ class BusinessRepository(BaseRepository[Business], IBusinessRepository):
     async def check_slug_availability(self, slug: str) -> bool:
         """
         Verifica si un slug ya está registrado en el sistema.
+        Consulta siempre la base de datos: la caché negativa de otro worker puede no
+        enterarse de un registro reciente.
+        """
+        statement = select(Business.id).where(Business.slug == slug).limit(1)
+        result = await self.db.execute(statement)
+        return result.scalar_one_or_none() is None
+
+    def _remember(self, key: str | uuid.UUID, business: Business | None) -> None:
+        """Guarda el resultado en caché solo si refleja lo confirmado en la base de datos."""
+        if business is None:
+            business_cache.store_missing(key)
+        elif inspect(business).persistent and not inspect(business).modified:
+            business_cache.store(business)
+
+    async def _attach(self, values: dict[str, Any]) -> Business:
+        """
+        Reconstruye el negocio desde la copia en caché y lo incorpora a la sesión como
+        persistente sin emitir SELECT (merge con load=False), igual que si se hubiera leído.
         """
-        business = await self.get_by_slug(slug)
-        return business is None
\ No newline at end of file
+        business = Business(**copy.deepcopy(values))
+        make_transient_to_detached(business)
+        return await self.db.merge(business, load=False)
@@ -1,6 +1,10 @@
 import uuid
 from collections.abc import Sequence
+from datetime import datetime
+from decimal import Decimal
 
+from sqlalchemy import Numeric, Uuid, column, tuple_, update, values
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import col, select
 
@@ -54,4 +58,105 @@ class WalletRepository(BaseRepository[Wallet], IWalletRepository):
         self.db.add(transaction)
         # No hacemos commit aquí porque usualmente esto es parte de una 
         # operación mayor (ej: actualizar el saldo y registrar la carga).
-        return transaction
\ No newline at end of file
+        return transaction
+
+    async def apply_debit(
+        self, user_id: uuid.UUID, business_id: uuid.UUID, amount: Decimal
+    ) -> Wallet | None:
+        """
+        Resta saldo con aritmética en la base de datos y condición de saldo suficiente:
+
+            UPDATE wallet SET balance = balance - :monto
+            WHERE user_id = :u AND business_id = :b AND balance >= :monto RETURNING *
+
+        Sin SELECT previo: dos cargos concurrentes se serializan en el bloqueo de la fila
+        y el segundo vuelve a evaluar la condición. Devuelve None si no existe el monedero
+        o el saldo no alcanza.
+        """
+        statement = (
+            update(Wallet)
+            .where(
+                Wallet.user_id == user_id,
+                Wallet.business_id == business_id,
+                Wallet.balance >= amount
+            )
+            .values(balance=Wallet.balance - amount)
+            .returning(Wallet)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db.execute(statement)
+        return result.scalar_one_or_none()
+
+    async def apply_credit(
+        self, user_id: uuid.UUID, business_id: uuid.UUID, amount: Decimal
+    ) -> Wallet:
+        """
+        Suma saldo creando el monedero si aún no existe, en una sola sentencia:
+
+            INSERT INTO wallet (...) VALUES (..., :monto)
+            ON CONFLICT ON CONSTRAINT unique_wallet_per_business
+            DO UPDATE SET balance = wallet.balance + EXCLUDED.balance RETURNING *
+        """
+        statement = insert(Wallet).values(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            business_id=business_id,
+            balance=amount
+        )
+        statement = statement.on_conflict_do_update(
+            constraint="unique_wallet_per_business",
+            set_={
+                "balance": Wallet.balance + statement.excluded.balance,
+                "updated_at": datetime.utcnow()
+            }
+        ).returning(Wallet).execution_options(populate_existing=True)
+
+        result = await self.db.execute(statement)
+        return result.scalar_one()
+
+    async def lock_wallets(
+        self, keys: Sequence[tuple[uuid.UUID, uuid.UUID]]
+    ) -> Sequence[Wallet]:
+        """
+        Lee y bloquea (SELECT ... FOR UPDATE) los monederos de varios pares
+        (user_id, business_id) en una consulta, en orden de id para evitar interbloqueos.
+        """
+        if not keys:
+            return []
+        statement = (
+            select(Wallet)
+            .where(tuple_(Wallet.user_id, Wallet.business_id).in_(keys))
+            .order_by(col(Wallet.id))
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db.execute(statement)
+        return result.scalars().all()
+
+    async def apply_debits(self, amounts: dict[uuid.UUID, Decimal]) -> set[uuid.UUID]:
+        """
+        Resta saldo a varios monederos con un único UPDATE condicionado:
+
+            UPDATE wallet SET balance = balance - d.amount
+            FROM (VALUES ...) AS d(wallet_id, amount)
+            WHERE wallet.id = d.wallet_id AND balance >= d.amount RETURNING wallet.id
+
+        Devuelve los monederos debitados; los que no alcanzaban quedan intactos.
+        """
+        if not amounts:
+            return set()
+        debits = values(
+            column("wallet_id", Uuid),
+            column("amount", Numeric(10, 2)),
+            name="debits"
+        ).data(list(amounts.items()))
+
+        statement = (
+            update(Wallet)
+            .where(Wallet.id == debits.c.wallet_id, Wallet.balance >= debits.c.amount)
+            .values(balance=Wallet.balance - debits.c.amount, updated_at=datetime.utcnow())
+            .returning(Wallet.id)
+            .execution_options(synchronize_session="fetch")
+        )
+        result = await self.db.execute(statement)
+        return set(result.scalars().all())
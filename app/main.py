@@ -1,4 +1,5 @@
 import logging
+import os
 import time
 from contextlib import asynccontextmanager
 
@@ -18,9 +19,26 @@ from app.api.v1.endpoints import (
     subscription,
     users,
     wallet,
+    webhooks,
 )
+from app.application.jobs.Inventory import materialize_inventory_templates
+from app.application.jobs.scheduler import PeriodicJob, run_jobs
+from app.application.jobs.Subscriptions import (
+    generate_subscription_orders,
+    sweep_subscription_periods,
+)
+from app.application.jobs.Webhooks import process_webhook_events
+from app.application.services.StorefrontService import menu_cache
+from app.application.services.SubscriptionsService import metrics_cache
 from app.core.config import settings
-from app.infrastructure.database.database import engine
+from app.infrastructure.database.database import (
+    engine,
+    mark_read_your_writes,
+    replica_engines,
+)
+from app.infrastructure.database.instrumentation import track_queries
+from app.infrastructure.database.pool import get_pool_stats
+from app.infrastructure.repositories.business_repo import business_cache
 
 # Configuración de logs profesional
 logging.basicConfig(level=logging.INFO)
@@ -41,8 +59,41 @@ async def lifespan(app: FastAPI):
             logger.info("✅ Conexión a PostgreSQL: OK")
     except Exception as e:
         logger.error(f"❌ Fallo en la conexión inicial de DB: {e}")
-    
-    yield
+
+    # Jobs periódicos en segundo plano (cada worker los programa; se coordinan con advisory locks)
+    jobs = []
+    if settings.INVENTORY_TEMPLATES_JOB_ENABLED:
+        jobs.append(PeriodicJob(
+            name="materialize_inventory_templates",
+            interval_seconds=settings.INVENTORY_TEMPLATES_INTERVAL_SECONDS,
+            run=materialize_inventory_templates,
+        ))
+    if settings.SUBSCRIPTION_ORDERS_JOB_ENABLED:
+        jobs.append(PeriodicJob(
+            name="generate_subscription_orders",
+            interval_seconds=settings.SUBSCRIPTION_ORDERS_INTERVAL_SECONDS,
+            run=generate_subscription_orders,
+        ))
+    if settings.SUBSCRIPTION_SWEEPER_ENABLED:
+        jobs.append(PeriodicJob(
+            name="sweep_subscription_periods",
+            interval_seconds=settings.SUBSCRIPTION_SWEEPER_INTERVAL_SECONDS,
+            run=sweep_subscription_periods,
+        ))
+
+    if settings.WEBHOOK_WORKERS_ENABLED:
+        # Pool de workers de webhooks: se reparten la cola con SKIP LOCKED (también entre nodos)
+        jobs.extend(
+            PeriodicJob(
+                name=f"process_webhook_events_{n}",
+                interval_seconds=settings.WEBHOOK_POLL_INTERVAL_SECONDS,
+                run=process_webhook_events,
+            )
+            for n in range(settings.WEBHOOK_WORKERS)
+        )
+
+    async with run_jobs(jobs):
+        yield
     logger.info(f"=== CERRANDO {settings.PROJECT_NAME} ===")
 
 app = FastAPI(
@@ -63,16 +114,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 2. Rastreo y Diagnóstico: Monitorea el rendimiento de cada petición
+# 2. Rastreo y Diagnóstico: Monitorea el rendimiento de cada petición y su uso de la DB
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     start_time = time.time()
     logger.info(f"⬇️ {request.method} {request.url.path}")
     
     try:
-        response = await call_next(request)
+        with track_queries() as db_stats:
+            response = await call_next(request)
         process_time = (time.time() - start_time) * 1000
-        logger.info(f"⬆️ {request.method} {request.url.path} - {response.status_code} ({process_time:.2f}ms)")
+        logger.info(
+            f"⬆️ {request.method} {request.url.path} - {response.status_code} ({process_time:.2f}ms) "
+            f"- {db_stats.count} queries / {db_stats.total_ms:.2f}ms DB",
+            extra={"path": request.url.path, "status_code": response.status_code, **db_stats.as_log_fields()},
+        )
+        if db_stats.slowest_ms >= settings.SQL_SLOW_QUERY_MS:
+            logger.warning(f"🐢 Query lenta ({db_stats.slowest_ms:.2f}ms) en {request.url.path}: {db_stats.slowest_statement}")
+        for statement, times in db_stats.repeated_statements(settings.SQL_N_PLUS_ONE_THRESHOLD):
+            logger.warning(f"⚠️ Posible N+1 en {request.url.path}: {times}x {statement}")
+
+        response.headers["Server-Timing"] = db_stats.server_timing(process_time)
+        response.headers["X-DB-Query-Count"] = str(db_stats.count)
         return response
     except Exception as e:
         logger.error(f"❌ Error crítico en pipeline: {str(e)}")
@@ -81,6 +144,14 @@ async def log_requests(request: Request, call_next):
             content={"detail": "Error interno del servidor"}
         )
 
+# 3. Read-your-writes: tras una escritura exitosa, ese cliente lee del primario un tiempo
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
+    if request.method in ("POST", "PUT", "PATCH", "DELETE") and response.status_code < 400:
+        mark_read_your_writes(response)
+    return response
+
 # --- ENDPOINTS DE SALUD ---
 
 @app.get("/", tags=["Health"])
@@ -110,6 +181,20 @@ async def health_check():
         "timestamp": time.time()
     }
 
+@app.get("/internal/db-pool", tags=["Internal"], include_in_schema=False)
+async def db_pool_stats():
+    """
+    Métricas del pool de conexiones de ESTE worker (cada worker de Granian tiene el suyo).
+    Sirve para dimensionar DB_POOL_SIZE / DB_MAX_OVERFLOW por worker.
+    """
+    return {
+        "worker_pid": os.getpid(),
+        "primary": get_pool_stats(engine),
+        "replicas": [get_pool_stats(replica) for replica in replica_engines],
+        "menu_cache": menu_cache.stats(),
+        "business_cache": business_cache.stats(),
+        "subscription_metrics_cache": metrics_cache.stats(),
+    }
 
 
 api_router = APIRouter()
@@ -185,5 +270,12 @@ api_router.include_router(
     tags=["Base de Conocimiento IA (MCP)"]
 )
 
+# 11. Webhooks de la pasarela de pagos (Stripe)
+api_router.include_router(
+    webhooks.router,
+    prefix="/webhooks",
+    tags=["Webhooks"]
+)
+
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
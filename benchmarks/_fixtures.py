@@ -0,0 +1,68 @@
+"""
+Datos de apoyo compartidos por los benchmarks.
+Crean un negocio aislado (slug aleatorio) en la base configurada en Settings,
+así varias ejecuciones pueden convivir sin limpiar la base de datos.
+"""
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.models.models import (
+    Business,
+    Category,
+    DailyInventory,
+    Item,
+    User,
+    UserRole,
+    Wallet,
+)
+
+
+async def create_business_with_item(
+    db: AsyncSession,
+    stock: int,
+    target_date: date,
+    price: Decimal = Decimal("1.00"),
+) -> tuple[Business, Item]:
+    """Crea dueño, negocio, categoría y un producto con `stock` unidades para `target_date`."""
+    suffix = uuid.uuid4().hex[:8]
+    owner = User(phone=f"bench-{suffix}", role=UserRole.BUSINESS_OWNER)
+    db.add(owner)
+    await db.flush()
+
+    business = Business(owner_id=owner.id, name=f"Bench {suffix}", slug=f"bench-{suffix}")
+    db.add(business)
+    await db.flush()
+
+    category = Category(business_id=business.id, name="Bench")
+    db.add(category)
+    await db.flush()
+
+    item = Item(business_id=business.id, category_id=category.id, name="Bench item", price=price)
+    db.add(item)
+    await db.flush()
+
+    db.add(
+        DailyInventory(
+            item_id=item.id,
+            date=target_date,
+            quantity_produced=stock,
+            quantity_available=stock,
+        )
+    )
+    await db.commit()
+    return business, item
+
+
+async def create_wallet(db: AsyncSession, business_id: uuid.UUID, balance: Decimal) -> Wallet:
+    """Crea un cliente con un monedero precargado en el negocio indicado."""
+    client = User(phone=f"bench-{uuid.uuid4().hex[:8]}", role=UserRole.CLIENT)
+    db.add(client)
+    await db.flush()
+
+    wallet = Wallet(user_id=client.id, business_id=business_id, balance=balance)
+    db.add(wallet)
+    await db.commit()
+    return wallet
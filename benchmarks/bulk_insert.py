@@ -0,0 +1,87 @@
+"""
+Benchmark de inserción de líneas de pedido: una a una vs create_many.
+
+Para carritos de 1, 10 y 100 líneas guarda `--orders` pedidos con cada estrategia:
+- una a una: un INSERT (y un viaje a la DB) por línea, como hacía item_repo.create en bucle
+- create_many: cabecera + todas las líneas en un solo flush (executemany)
+
+Uso (con la base de datos de Settings migrada):
+    uv run python -m benchmarks.bulk_insert --orders 50
+"""
+import argparse
+import asyncio
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.application.services.OrdersService import OrdersService
+from app.core.config import settings
+from app.domain.models.models import Order, OrderItem, OrderStatus
+from app.infrastructure.database.instrumentation import (
+    install_query_instrumentation,
+    track_queries,
+)
+from app.infrastructure.database.unit_of_work import UnitOfWork
+from app.infrastructure.repositories.base import BaseRepository
+from benchmarks._fixtures import create_business_with_item, create_wallet
+
+CART_SIZES = (1, 10, 100)
+
+
+def build_order(business_id, user_id, item_id, lines: int) -> tuple[Order, list[OrderItem]]:
+    order = Order(
+        business_id=business_id,
+        user_id=user_id,
+        pickup_slot=datetime.now(),
+        total_amount=Decimal(lines),
+        status=OrderStatus.PAID,
+    )
+    items = [
+        OrderItem(order_id=order.id, item_id=item_id, quantity=1, unit_price=Decimal("1.00"))
+        for _ in range(lines)
+    ]
+    return order, items
+
+
+async def save_one_by_one(db: AsyncSession, order: Order, items: list[OrderItem]) -> None:
+    repo = BaseRepository(OrderItem, db)
+    db.add(order)
+    for item in items:
+        await repo.create(item)
+
+
+async def save_bulk(db: AsyncSession, order: Order, items: list[OrderItem]) -> None:
+    await OrdersService(db).save_full_order(order, items)
+
+
+async def main(orders: int) -> None:
+    engine = create_async_engine(settings.DATABASE_URL)
+    install_query_instrumentation(engine)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
+    async with session_factory() as db:
+        business, item = await create_business_with_item(db, stock=0, target_date=date.today())
+        wallet = await create_wallet(db, business.id, Decimal("0"))
+
+    print(f"{'líneas':>6} | {'estrategia':<12} | {'ms/pedido':>9} | {'sentencias/pedido':>17}")
+    for lines in CART_SIZES:
+        for name, strategy in (("una a una", save_one_by_one), ("create_many", save_bulk)):
+            with track_queries() as stats:
+                started = time.perf_counter()
+                for _ in range(orders):
+                    order, items = build_order(business.id, wallet.user_id, item.id, lines)
+                    async with session_factory() as db, UnitOfWork(db):
+                        await strategy(db, order, items)
+                elapsed = time.perf_counter() - started
+            print(f"{lines:>6} | {name:<12} | {elapsed * 1000 / orders:>9.2f} | {stats.count / orders:>17.1f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=50, help="Pedidos guardados por combinación")
+    args = parser.parse_args()
+    asyncio.run(main(args.orders))
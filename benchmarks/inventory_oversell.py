@@ -0,0 +1,75 @@
+"""
+Benchmark de concurrencia para InventoryService.reserve_stock.
+
+Lanza muchas reservas simultáneas sobre el MISMO producto y comprueba que nunca
+se vende más de lo producido (cero sobreventa) y que el stock final cuadra con
+las reservas confirmadas.
+
+Uso (con la base de datos de Settings migrada):
+    uv run python -m benchmarks.inventory_oversell --stock 100 --requests 1000 --quantity 1
+"""
+import argparse
+import asyncio
+import time
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.application.services.InventoryService import InventoryService
+from app.core.config import settings
+from app.domain.models.models import DailyInventory
+from benchmarks._fixtures import create_business_with_item
+
+
+async def main(stock: int, requests: int, quantity: int, pool_size: int) -> None:
+    engine = create_async_engine(settings.DATABASE_URL, pool_size=pool_size, max_overflow=0)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+    target_date = date.today()
+
+    async with session_factory() as db:
+        _, item = await create_business_with_item(db, stock, target_date)
+
+    async def reserve() -> bool:
+        async with session_factory() as db:
+            result = await InventoryService(db).reserve_stock(target_date, {item.id: quantity})
+            if result.is_complete:
+                await db.commit()
+            else:
+                await db.rollback()
+            return result.is_complete
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(reserve() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    async with session_factory() as db:
+        record = await InventoryService(db).get_by_item_and_date(item.id, target_date)
+        assert isinstance(record, DailyInventory)
+        remaining = record.quantity_available
+
+    await engine.dispose()
+
+    accepted = sum(outcomes)
+    sold = accepted * quantity
+    expected_accepted = min(requests, stock // quantity)
+
+    print(f"peticiones:        {requests} (x{quantity} uds, pool={pool_size})")
+    print(f"aceptadas:         {accepted} / esperadas {expected_accepted}")
+    print(f"vendidas:          {sold} de {stock}")
+    print(f"stock restante:    {remaining}")
+    print(f"tiempo total:      {elapsed:.2f}s ({requests / elapsed:.0f} req/s)")
+
+    assert remaining >= 0, "Sobreventa: el stock quedó negativo"
+    assert sold + remaining == stock, "El stock final no cuadra con las reservas confirmadas"
+    assert accepted == expected_accepted, "Se rechazaron reservas con stock disponible"
+    print("OK: cero sobreventa")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stock", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--quantity", type=int, default=1)
+    parser.add_argument("--pool-size", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.stock, args.requests, args.quantity, args.pool_size))
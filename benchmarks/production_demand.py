@@ -0,0 +1,114 @@
+"""
+Comprobación de InventoryService.get_production_demand contra la base configurada.
+
+Crea un negocio con un producto con inventario y otro sin él, un pedido pagado y una
+suscripción diaria sobre ambos, y verifica que el reporte de planificación suma bien
+las tres fuentes (pedidos, suscripciones y producción) en cada día del rango. Sirve
+también de prueba de humo del UNION ALL en Postgres, que exige tipos compatibles en
+cada rama.
+
+Uso (con la base de datos de Settings migrada):
+    uv run python -m benchmarks.production_demand --days 14
+"""
+import argparse
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+from datetime import time as dt_time
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.application.services.InventoryService import InventoryService
+from app.core.config import settings
+from app.domain.models.models import (
+    WEEKDAY_CODES,
+    Item,
+    Order,
+    OrderItem,
+    OrderStatus,
+    Subscription,
+    SubscriptionItem,
+    SubscriptionStatus,
+    User,
+    UserRole,
+    weekdays_to_mask,
+)
+from benchmarks._fixtures import create_business_with_item
+
+
+async def main(days: int, stock: int, ordered: int, projected: int) -> None:
+    engine = create_async_engine(settings.DATABASE_URL)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+    date_from = date.today()
+    date_to = date_from + timedelta(days=days - 1)
+
+    async with session_factory() as db:
+        business, stocked = await create_business_with_item(db, stock, date_from)
+        unstocked = Item(
+            business_id=business.id, category_id=stocked.category_id, name="Bench item sin stock", price=Decimal("1.00")
+        )
+        client = User(phone=f"bench-{business.slug}", role=UserRole.CLIENT)
+        db.add_all([unstocked, client])
+        await db.flush()
+
+        order = Order(
+            business_id=business.id,
+            user_id=client.id,
+            status=OrderStatus.PAID,
+            total_amount=Decimal(ordered),
+            pickup_slot=datetime.combine(date_from, dt_time(10, 0)),
+        )
+        subscription = Subscription(
+            user_id=client.id,
+            business_id=business.id,
+            status=SubscriptionStatus.ACTIVE,
+            weekday_mask=weekdays_to_mask(WEEKDAY_CODES),
+            pickup_time=dt_time(10, 0),
+        )
+        db.add_all([order, subscription])
+        await db.flush()
+        db.add_all([
+            OrderItem(order_id=order.id, item_id=stocked.id, quantity=ordered, unit_price=Decimal("1.00")),
+            *(
+                SubscriptionItem(subscription_id=subscription.id, item_id=item.id, quantity=projected)
+                for item in (stocked, unstocked)
+            ),
+        ])
+        await db.commit()
+
+    async with session_factory() as db:
+        started = time.perf_counter()
+        rows = await InventoryService(db).get_production_demand(business.id, date_from, date_to)
+        elapsed = time.perf_counter() - started
+
+    await engine.dispose()
+
+    by_key = {(row["item_id"], row["date"]): row for row in rows}
+    print(f"días:              {days}")
+    print(f"filas:             {len(rows)} / esperadas {2 * days}")
+    print(f"tiempo consulta:   {elapsed * 1000:.1f}ms")
+
+    assert len(rows) == 2 * days, "Faltan o sobran pares (producto, día)"
+    for offset in range(days):
+        day = date_from + timedelta(days=offset)
+        first_day = offset == 0
+        row = by_key[(stocked.id, day)]
+        assert row["ordered"] == (ordered if first_day else 0), f"Pedidos mal sumados el {day}"
+        assert row["projected"] == projected, f"Suscripciones mal proyectadas el {day}"
+        assert row["produced"] == (stock if first_day else None), f"Producción mal leída el {day}"
+        row = by_key[(unstocked.id, day)]
+        assert (row["ordered"], row["projected"], row["produced"]) == (0, projected, None), (
+            f"Producto sin inventario mal agregado el {day}"
+        )
+    print("OK: demanda por producto y día cuadra con pedidos, suscripciones y producción")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--stock", type=int, default=20)
+    parser.add_argument("--ordered", type=int, default=2)
+    parser.add_argument("--projected", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.days, args.stock, args.ordered, args.projected))
@@ -0,0 +1,100 @@
+"""
+Benchmark de contención sobre un único monedero "caliente".
+
+Cientos de cargos (y opcionalmente recargas) concurrentes golpean el MISMO monedero
+a través de WalletService. Al final se comprueba que el saldo nunca quedó negativo,
+que cuadra con los movimientos confirmados y que cada movimiento tiene su asiento
+en el libro mayor (WalletTransaction).
+
+Uso (con la base de datos de Settings migrada):
+    uv run python -m benchmarks.wallet_contention --balance 100 --debits 500 --credits 100
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.application.services.WalletService import WalletService
+from app.core.config import settings
+from app.domain.models.models import TransactionType, Wallet, WalletTransaction
+from app.infrastructure.database.unit_of_work import UnitOfWork
+from benchmarks._fixtures import create_business_with_item, create_wallet
+
+
+async def main(balance: Decimal, debits: int, credits: int, amount: Decimal, pool_size: int) -> None:
+    engine = create_async_engine(settings.DATABASE_URL, pool_size=pool_size, max_overflow=0)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
+    async with session_factory() as db:
+        business, _ = await create_business_with_item(db, stock=0, target_date=date.today())
+        wallet = await create_wallet(db, business.id, balance)
+
+    async def debit() -> bool:
+        async with session_factory() as db:
+            try:
+                async with UnitOfWork(db):
+                    await WalletService(db).deduct_funds(wallet.user_id, business.id, amount, "bench debit")
+                return True
+            except ValueError:
+                return False
+
+    async def credit() -> bool:
+        async with session_factory() as db:
+            async with UnitOfWork(db):
+                await WalletService(db).add_funds(wallet.user_id, business.id, amount, "bench credit")
+            return True
+
+    calls = [debit] * debits + [credit] * credits
+    random.shuffle(calls)
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(call() for call in calls))
+    elapsed = time.perf_counter() - started
+
+    accepted_debits = sum(ok for call, ok in zip(calls, outcomes, strict=True) if call is debit)
+
+    async with session_factory() as db:
+        final_balance = (await db.execute(select(Wallet.balance).where(Wallet.id == wallet.id))).scalar_one()
+        ledger = dict(
+            (
+                await db.execute(
+                    select(WalletTransaction.type, func.count())
+                    .where(WalletTransaction.wallet_id == wallet.id)
+                    .group_by(WalletTransaction.type)
+                )
+            ).all()
+        )
+
+    await engine.dispose()
+
+    expected_balance = balance + amount * credits - amount * accepted_debits
+
+    print(f"peticiones:        {len(calls)} ({debits} cargos, {credits} recargas, pool={pool_size})")
+    print(f"cargos aceptados:  {accepted_debits}")
+    print(f"saldo final:       {final_balance} (esperado {expected_balance})")
+    print(f"libro mayor:       {ledger}")
+    print(f"tiempo total:      {elapsed:.2f}s ({len(calls) / elapsed:.0f} req/s)")
+
+    assert final_balance >= 0, "El saldo quedó negativo"
+    assert final_balance == expected_balance, "El saldo no cuadra con los movimientos confirmados"
+    assert ledger.get(TransactionType.WITHDRAWAL, 0) == accepted_debits, "Faltan asientos de cargo"
+    assert ledger.get(TransactionType.DEPOSIT, 0) == credits, "Faltan asientos de recarga"
+    if not credits:
+        assert accepted_debits == min(debits, int(balance // amount)), "Se rechazaron cargos con saldo disponible"
+    print("OK: sin sobregiros y libro mayor consistente")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--balance", type=Decimal, default=Decimal("100"))
+    parser.add_argument("--debits", type=int, default=500)
+    parser.add_argument("--credits", type=int, default=0)
+    parser.add_argument("--amount", type=Decimal, default=Decimal("1.00"))
+    parser.add_argument("--pool-size", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.balance, args.debits, args.credits, args.amount, args.pool_size))
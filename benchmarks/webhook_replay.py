@@ -0,0 +1,263 @@
+"""
+Simulador de la pasarela de pagos: reproduce ráfagas de webhooks de Stripe firmados.
+
+Crea N suscripciones y, para cada una, la secuencia típica de eventos (cobro fallido,
+cobro exitoso del mismo invoice, suscripción activa y, para una parte, cancelación).
+Las secuencias de distintas suscripciones se intercalan, los eventos del mismo segundo
+llegan en cualquier orden, una fracción se reenvía (como hace Stripe cuando no recibe
+respuesta a tiempo) y otra llega tarde, después de que se aplicaran eventos más nuevos.
+Mide la latencia de recepción y el tiempo hasta que los workers vacían la cola, y
+comprueba que cada evento se guardó una sola vez, que hay un cobro por invoice y que
+cada suscripción terminó en el estado de su evento más nuevo.
+
+Uso (con la base de datos de Settings migrada):
+    uv run python -m benchmarks.webhook_replay --subscriptions 200 --duplicates 0.2 --late 0.1 --workers 4
+
+Contra un servidor en marcha (con el mismo STRIPE_WEBHOOK_SECRET y sus workers activos):
+    uv run python -m benchmarks.webhook_replay --url http://localhost:8000
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+from datetime import date
+from datetime import time as dt_time
+from typing import Any
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.security.webhooks import sign_stripe_payload
+from app.domain.models.models import (
+    Subscription,
+    SubscriptionPayment,
+    SubscriptionStatus,
+    WebhookEvent,
+    WebhookEventStatus,
+)
+from benchmarks._fixtures import create_business_with_item, create_wallet
+
+WEBHOOK_PATH = f"{settings.API_V1_STR}/webhooks/stripe"
+
+
+def build_events(stripe_ids: list[str], cancel_ratio: float, started_at: int) -> tuple[list[list[dict]], dict[str, str]]:
+    """
+    Secuencia de eventos por suscripción y el estado final esperado de cada una.
+    Como en una renovación real, el cobro y la actualización de la suscripción comparten
+    segundo (Stripe da `created` en segundos); la cancelación a veces también.
+    """
+    sequences: list[list[dict[str, Any]]] = []
+    expected: dict[str, str] = {}
+    for stripe_id in stripe_ids:
+        invoice_id = f"in_{uuid.uuid4().hex[:16]}"
+        period_end = started_at + 30 * 86400
+        objects = [
+            (0, "invoice.payment_failed", {"id": invoice_id, "subscription": stripe_id, "amount_due": 1500}),
+            (1, "invoice.paid", {"id": invoice_id, "subscription": stripe_id, "amount_paid": 1500}),
+            (1, "customer.subscription.updated", {"id": stripe_id, "status": "active", "current_period_end": period_end}),
+        ]
+        expected[stripe_id] = SubscriptionStatus.ACTIVE
+        if random.random() < cancel_ratio:
+            objects.append((random.choice((1, 2)), "customer.subscription.deleted", {"id": stripe_id, "status": "canceled"}))
+            expected[stripe_id] = SubscriptionStatus.CANCELED
+        sequences.append([
+            {"id": f"evt_{uuid.uuid4().hex}", "type": event_type, "created": started_at + second, "data": {"object": obj}}
+            for second, event_type, obj in objects
+        ])
+    return sequences, expected
+
+
+def delivery_order(sequences: list[list[dict]], duplicates: float, late: float) -> tuple[list[dict], list[dict]]:
+    """
+    Intercala las secuencias y devuelve dos oleadas de envíos:
+
+    - La primera respeta el orden de cada suscripción salvo entre eventos del mismo
+      segundo, que llegan en cualquier orden. Una fracción de eventos se reenvía un
+      poco más tarde, como los reintentos de la pasarela.
+    - La segunda son los eventos retrasados (fracción `late`): se envían cuando los
+      workers ya aplicaron los más nuevos de su suscripción.
+    """
+    pending = []
+    for sequence in sequences:
+        shuffled = list(sequence)
+        random.shuffle(shuffled)
+        pending.append(sorted(shuffled, key=lambda event: event["created"]))
+    deliveries: list[dict] = []
+    late_deliveries: list[dict] = []
+    while pending:
+        sequence = random.choice(pending)
+        event = sequence.pop(0)
+        if random.random() < late:
+            late_deliveries.append(event)
+        else:
+            deliveries.append(event)
+            if random.random() < duplicates:
+                deliveries.insert(random.randint(len(deliveries) - 1, len(deliveries)), event)
+        if not sequence:
+            pending.remove(sequence)
+    random.shuffle(late_deliveries)
+    return deliveries, late_deliveries
+
+
+async def send(client: httpx.AsyncClient, event: dict, secret: str) -> tuple[float, bool]:
+    """Firma y envía un evento; devuelve la latencia y si el servidor lo marcó como duplicado."""
+    payload = json.dumps(event).encode()
+    timestamp = int(time.time())
+    signature = f"t={timestamp},v1={sign_stripe_payload(payload, secret, timestamp)}"
+    started = time.perf_counter()
+    response = await client.post(
+        WEBHOOK_PATH, content=payload, headers={"Stripe-Signature": signature, "Content-Type": "application/json"}
+    )
+    elapsed = time.perf_counter() - started
+    response.raise_for_status()
+    return elapsed, response.json()["duplicate"]
+
+
+async def drain_in_process(workers: int) -> None:
+    """Modo local: los workers corren aquí mismo hasta que la cola queda vacía."""
+    from app.application.jobs.Webhooks import process_webhook_events
+
+    async def worker() -> None:
+        while await process_webhook_events() is not None:
+            pass
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+
+
+async def main(
+    subscriptions: int, duplicates: float, late: float, cancel_ratio: float, concurrency: int,
+    workers: int, url: str | None, secret: str, timeout: float,
+) -> None:
+    engine = create_async_engine(settings.DATABASE_URL)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
+    async with session_factory() as db:
+        business, _ = await create_business_with_item(db, stock=0, target_date=date.today())
+        wallet = await create_wallet(db, business.id, balance=0)
+        suffix = uuid.uuid4().hex[:8]
+        stripe_ids = [f"sub_bench_{suffix}_{n}" for n in range(subscriptions)]
+        db.add_all(
+            Subscription(
+                user_id=wallet.user_id,
+                business_id=business.id,
+                stripe_subscription_id=stripe_id,
+                status=SubscriptionStatus.INCOMPLETE,
+                weekday_mask=0b0011111,
+                pickup_time=dt_time(8, 0),
+            )
+            for stripe_id in stripe_ids
+        )
+        await db.commit()
+
+    sequences, expected = build_events(stripe_ids, cancel_ratio, int(time.time()))
+    deliveries, late_deliveries = delivery_order(sequences, duplicates, late)
+    unique_events = sum(len(sequence) for sequence in sequences)
+
+    if url:
+        transport = None
+    else:
+        from app.main import app
+        settings.STRIPE_WEBHOOK_SECRET = secret
+        transport = httpx.ASGITransport(app=app)
+        url = "http://bench"
+
+    async def pending_count() -> int:
+        async with session_factory() as db:
+            return (await db.execute(
+                select(func.count()).select_from(WebhookEvent)
+                .where(WebhookEvent.status == WebhookEventStatus.PENDING, WebhookEvent.subject_ref.in_(stripe_ids))
+            )).scalar_one()
+
+    semaphore = asyncio.Semaphore(concurrency)
+    results: list[tuple[float, bool]] = []
+    started = time.perf_counter()
+    intake_elapsed = 0.0
+    async with httpx.AsyncClient(transport=transport, base_url=url, timeout=30) as client:
+        async def limited(event: dict) -> tuple[float, bool]:
+            async with semaphore:
+                return await send(client, event, secret)
+
+        for wave in (deliveries, late_deliveries):
+            wave_started = time.perf_counter()
+            if transport is None:
+                results += await asyncio.gather(*(limited(event) for event in wave))
+            else:
+                # En local los workers aplican la cola mientras siguen llegando eventos
+                intake = asyncio.gather(*(limited(event) for event in wave))
+                wave_results, _ = await asyncio.gather(intake, drain_in_process(workers))
+                results += wave_results
+            intake_elapsed += time.perf_counter() - wave_started
+
+            # Lo que llegó tras la última pasada de los workers; la oleada de eventos
+            # retrasados se envía cuando ya se aplicaron los más nuevos
+            while await pending_count():
+                if time.perf_counter() - started > timeout:
+                    raise TimeoutError("La cola de webhooks no se vació a tiempo")
+                if transport is not None:
+                    await drain_in_process(workers)
+                else:
+                    await asyncio.sleep(0.5)
+        drain_elapsed = time.perf_counter() - started
+
+    async with session_factory() as db:
+        events = dict((await db.execute(
+            select(WebhookEvent.status, func.count())
+            .where(WebhookEvent.subject_ref.in_(stripe_ids))
+            .group_by(WebhookEvent.status)
+        )).all())
+        payments = dict((await db.execute(
+            select(SubscriptionPayment.status, func.count())
+            .join(Subscription, Subscription.id == SubscriptionPayment.subscription_id)
+            .where(Subscription.business_id == business.id)
+            .group_by(SubscriptionPayment.status)
+        )).all())
+        final = dict((await db.execute(
+            select(Subscription.stripe_subscription_id, Subscription.status).where(Subscription.business_id == business.id)
+        )).all())
+
+    await engine.dispose()
+
+    latencies = sorted(elapsed for elapsed, _ in results)
+    acked_duplicates = sum(duplicate for _, duplicate in results)
+    mismatched = [stripe_id for stripe_id, status in expected.items() if final.get(stripe_id) != status]
+
+    print(f"suscripciones:     {subscriptions} (workers={workers if transport else 'servidor'}, concurrencia={concurrency})")
+    print(f"envíos:            {len(results)} ({unique_events} eventos únicos, {acked_duplicates} duplicados, "
+          f"{len(late_deliveries)} retrasados)")
+    print(f"recepción:         {intake_elapsed:.2f}s ({len(results) / intake_elapsed:.0f} req/s)")
+    print(f"latencia ack:      p50={statistics.median(latencies) * 1000:.1f}ms "
+          f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f}ms")
+    print(f"cola vacía en:     {drain_elapsed:.2f}s")
+    print(f"eventos:           {events}")
+    print(f"cobros:            {payments}")
+
+    assert sum(events.values()) == unique_events, "Se guardaron eventos duplicados o se perdieron eventos"
+    assert acked_duplicates == len(results) - unique_events, "Un reenvío no se reconoció como duplicado"
+    # Los eventos de suscripción que llegan después de uno más nuevo quedan IGNORED
+    assert set(events) <= {WebhookEventStatus.PROCESSED, WebhookEventStatus.IGNORED}, "Quedaron eventos sin aplicar"
+    assert payments == {"succeeded": subscriptions}, "Debe haber exactamente un cobro exitoso por invoice"
+    assert not mismatched, f"Suscripciones con estado final incorrecto: {mismatched[:5]}"
+    print("OK: sin duplicados y ningún evento retrasado pisó un estado más nuevo")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscriptions", type=int, default=200)
+    parser.add_argument("--duplicates", type=float, default=0.2, help="Fracción de eventos reenviados")
+    parser.add_argument("--late", type=float, default=0.1, help="Fracción de eventos entregados tarde")
+    parser.add_argument("--cancel-ratio", type=float, default=0.25)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=settings.WEBHOOK_WORKERS)
+    parser.add_argument("--url", default=None, help="Servidor ya en marcha (por defecto, la app en proceso)")
+    parser.add_argument("--secret", default=settings.STRIPE_WEBHOOK_SECRET or "whsec_bench")
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+    asyncio.run(main(
+        args.subscriptions, args.duplicates, args.late, args.cancel_ratio, args.concurrency,
+        args.workers, args.url, args.secret, args.timeout,
+    ))
@@ -0,0 +1,43 @@
+"""Add keyset pagination indexes
+
+Revision ID: 3c5e7a9d2f14
+Revises: 11b0ba1fd5ec
+Create Date: 2026-10-17 10:12:41.508113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c5e7a9d2f14'
+down_revision: Union[str, None] = '11b0ba1fd5ec'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_user_created_at_id', 'user', ['created_at', 'id'], unique=False)
+    op.create_index('ix_business_created_at_id', 'business', ['created_at', 'id'], unique=False)
+    op.create_index('ix_wallettransaction_wallet_created', 'wallettransaction', ['wallet_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_subscription_user_created', 'subscription', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_subscription_business_created', 'subscription', ['business_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_order_business_created', 'order', ['business_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_order_user_created', 'order', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_orderreview_business_created', 'orderreview', ['business_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_itemreview_item_created', 'itemreview', ['item_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_staffreview_staff_created', 'staffreview', ['staff_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_staffreview_staff_created', table_name='staffreview')
+    op.drop_index('ix_itemreview_item_created', table_name='itemreview')
+    op.drop_index('ix_orderreview_business_created', table_name='orderreview')
+    op.drop_index('ix_order_user_created', table_name='order')
+    op.drop_index('ix_order_business_created', table_name='order')
+    op.drop_index('ix_subscription_business_created', table_name='subscription')
+    op.drop_index('ix_subscription_user_created', table_name='subscription')
+    op.drop_index('ix_wallettransaction_wallet_created', table_name='wallettransaction')
+    op.drop_index('ix_business_created_at_id', table_name='business')
+    op.drop_index('ix_user_created_at_id', table_name='user')
@@ -0,0 +1,39 @@
+"""Add inventory templates
+
+Revision ID: 5d8e1f3a7b20
+Revises: 3c5e7a9d2f14
+Create Date: 2026-10-17 12:03:18.227841
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8e1f3a7b20'
+down_revision: Union[str, None] = '3c5e7a9d2f14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('inventorytemplate',
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('item_id', sa.Uuid(), nullable=False),
+    sa.Column('day_of_week', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['item.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('item_id', 'day_of_week', name='unique_item_template_per_weekday')
+    )
+    op.create_index(op.f('ix_inventorytemplate_deleted_at'), 'inventorytemplate', ['deleted_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_inventorytemplate_deleted_at'), table_name='inventorytemplate')
+    op.drop_table('inventorytemplate')
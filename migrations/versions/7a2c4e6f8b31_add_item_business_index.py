@@ -0,0 +1,25 @@
+"""Add item business index
+
+Revision ID: 7a2c4e6f8b31
+Revises: 5d8e1f3a7b20
+Create Date: 2026-10-17 12:48:05.913377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2c4e6f8b31'
+down_revision: Union[str, None] = '5d8e1f3a7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_item_business_id', 'item', ['business_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_item_business_id', table_name='item')
@@ -0,0 +1,41 @@
+"""Add rating aggregates
+
+Revision ID: 8b3d5f7a9c42
+Revises: 7a2c4e6f8b31
+Create Date: 2026-10-17 13:21:47.604215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3d5f7a9c42'
+down_revision: Union[str, None] = '7a2c4e6f8b31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('ratingaggregate',
+    sa.Column('subject_type', sa.Enum('BUSINESS', 'ITEM', 'STAFF', name='ratingsubject'), nullable=False),
+    sa.Column('subject_id', sa.Uuid(), nullable=False),
+    sa.Column('dimension', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('stars_1', sa.Integer(), nullable=False),
+    sa.Column('stars_2', sa.Integer(), nullable=False),
+    sa.Column('stars_3', sa.Integer(), nullable=False),
+    sa.Column('stars_4', sa.Integer(), nullable=False),
+    sa.Column('stars_5', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('subject_type', 'subject_id', 'dimension')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ratingaggregate')
+    sa.Enum(name='ratingsubject').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,72 @@
+"""Add review unique constraints
+
+Revision ID: 9c4e6a8b0d53
+Revises: 8b3d5f7a9c42
+Create Date: 2026-10-17 14:05:12.318604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e6a8b0d53'
+down_revision: Union[str, None] = '8b3d5f7a9c42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (tabla, columna del sujeto, columna de la calificación, RatingSubject, dimensión)
+REVIEW_SOURCES = (
+    ('itemreview', 'item_id', 'rating_quality', 'ITEM', 'quality'),
+    ('staffreview', 'staff_id', 'rating_service', 'STAFF', 'service'),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # La API anterior aceptaba reseñar el mismo producto / staff varias veces por pedido:
+    # se conserva la más reciente por clave (las vigentes antes que las borradas)
+    deleted = 0
+    for table, subject, _, _, _ in REVIEW_SOURCES:
+        deleted += bind.execute(sa.text(f"""
+            DELETE FROM {table} r
+            USING {table} newer
+            WHERE newer.order_id = r.order_id
+              AND newer.{subject} = r.{subject}
+              AND (newer.deleted_at IS NULL, newer.created_at, newer.id)
+                > (r.deleted_at IS NULL, r.created_at, r.id)
+        """)).rowcount
+
+    # Los agregados contaban los duplicados: se recalculan los de productos y staff
+    if deleted:
+        op.execute("DELETE FROM ratingaggregate WHERE subject_type IN ('ITEM', 'STAFF')")
+        for table, subject, rating, subject_type, dimension in REVIEW_SOURCES:
+            op.execute(f"""
+                INSERT INTO ratingaggregate (
+                    subject_type, subject_id, dimension, count, total,
+                    stars_1, stars_2, stars_3, stars_4, stars_5, updated_at
+                )
+                SELECT '{subject_type}'::ratingsubject, {subject}, '{dimension}', count(*), sum({rating}),
+                       count(*) FILTER (WHERE {rating} = 1), count(*) FILTER (WHERE {rating} = 2),
+                       count(*) FILTER (WHERE {rating} = 3), count(*) FILTER (WHERE {rating} = 4),
+                       count(*) FILTER (WHERE {rating} = 5), now() AT TIME ZONE 'utc'
+                FROM {table}
+                WHERE deleted_at IS NULL
+                GROUP BY {subject}
+            """)
+        op.execute("""
+            UPDATE staff SET rating_avg = round(a.total::numeric / a.count, 2)
+            FROM ratingaggregate a
+            WHERE a.subject_type = 'STAFF' AND a.subject_id = staff.id
+        """)
+
+    op.create_unique_constraint('unique_item_review_per_order', 'itemreview', ['order_id', 'item_id'])
+    op.create_unique_constraint('unique_staff_review_per_order', 'staffreview', ['order_id', 'staff_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('unique_staff_review_per_order', 'staffreview', type_='unique')
+    op.drop_constraint('unique_item_review_per_order', 'itemreview', type_='unique')
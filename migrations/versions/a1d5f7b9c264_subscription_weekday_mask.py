@@ -0,0 +1,54 @@
+"""Subscription weekday mask
+
+Revision ID: a1d5f7b9c264
+Revises: 9c4e6a8b0d53
+Create Date: 2026-10-17 15:12:40.227931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1d5f7b9c264'
+down_revision: Union[str, None] = '9c4e6a8b0d53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# bit n = date.weekday() n (0 = lunes), igual que WEEKDAY_CODES en los modelos
+WEEKDAY_CODES = ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+
+
+def upgrade() -> None:
+    op.add_column('subscription', sa.Column('weekday_mask', sa.Integer(), nullable=False, server_default='0'))
+    # "MON, wed,FRI" -> 0b0010101 (tolera espacios y minúsculas; los códigos desconocidos se ignoran)
+    days = "',' || upper(replace(frequency_days, ' ', '')) || ','"
+    mask = " + ".join(
+        f"CASE WHEN {days} LIKE '%,{code},%' THEN {1 << day} ELSE 0 END"
+        for day, code in enumerate(WEEKDAY_CODES)
+    )
+    op.execute(f"UPDATE subscription SET weekday_mask = {mask}")
+    op.alter_column('subscription', 'weekday_mask', server_default=None)
+    op.drop_column('subscription', 'frequency_days')
+    op.create_index(
+        'ix_subscription_business_weekday', 'subscription', ['business_id', 'weekday_mask'],
+        unique=False, postgresql_where=sa.text('is_active AND deleted_at IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_subscription_business_weekday', table_name='subscription',
+        postgresql_where=sa.text('is_active AND deleted_at IS NULL')
+    )
+    op.add_column('subscription', sa.Column('frequency_days', sqlmodel.sql.sqltypes.AutoString(), nullable=False, server_default=''))
+    codes = ", ".join(
+        f"CASE WHEN weekday_mask & {1 << day} <> 0 THEN '{code}' END"
+        for day, code in enumerate(WEEKDAY_CODES)
+    )
+    op.execute(f"UPDATE subscription SET frequency_days = concat_ws(',', {codes})")
+    op.alter_column('subscription', 'frequency_days', server_default=None)
+    op.drop_column('subscription', 'weekday_mask')
@@ -0,0 +1,25 @@
+"""Add subscription item index
+
+Revision ID: a7d1f3b5c820
+Revises: f6c0e2a4b719
+Create Date: 2026-10-19 11:40:52.118903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d1f3b5c820'
+down_revision: Union[str, None] = 'f6c0e2a4b719'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_subscriptionitem_subscription_id', 'subscriptionitem', ['subscription_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_subscriptionitem_subscription_id', table_name='subscriptionitem')
@@ -0,0 +1,64 @@
+"""Add webhook events
+
+Revision ID: b2e6a8c0d375
+Revises: a1d5f7b9c264
+Create Date: 2026-10-17 16:02:18.540716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e6a8c0d375'
+down_revision: Union[str, None] = 'a1d5f7b9c264'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('webhookevent',
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('provider', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('event_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('event_type', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('subject_ref', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('occurred_at', sa.DateTime(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'PROCESSED', 'IGNORED', 'FAILED', name='webhookeventstatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('provider', 'event_id', name='unique_webhook_event')
+    )
+    op.create_index(op.f('ix_webhookevent_deleted_at'), 'webhookevent', ['deleted_at'], unique=False)
+    op.create_index('ix_webhookevent_pending', 'webhookevent', ['occurred_at', 'id'], unique=False, postgresql_where=sa.text("status = 'PENDING'"))
+    op.create_index('ix_webhookevent_pending_subject', 'webhookevent', ['subject_ref', 'occurred_at'], unique=False, postgresql_where=sa.text("status = 'PENDING'"))
+
+    # Los reintentos de los webhooks dejaron cobros duplicados: se conserva el más reciente por invoice
+    op.execute("""
+        DELETE FROM subscriptionpayment p
+        USING subscriptionpayment newer
+        WHERE newer.stripe_invoice_id = p.stripe_invoice_id
+          AND (newer.created_at, newer.id) > (p.created_at, p.id)
+    """)
+    op.drop_index(op.f('ix_subscriptionpayment_stripe_invoice_id'), table_name='subscriptionpayment')
+    op.create_index(op.f('ix_subscriptionpayment_stripe_invoice_id'), 'subscriptionpayment', ['stripe_invoice_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_subscriptionpayment_stripe_invoice_id'), table_name='subscriptionpayment')
+    op.create_index(op.f('ix_subscriptionpayment_stripe_invoice_id'), 'subscriptionpayment', ['stripe_invoice_id'], unique=False)
+    op.drop_index('ix_webhookevent_pending_subject', table_name='webhookevent', postgresql_where=sa.text("status = 'PENDING'"))
+    op.drop_index('ix_webhookevent_pending', table_name='webhookevent', postgresql_where=sa.text("status = 'PENDING'"))
+    op.drop_index(op.f('ix_webhookevent_deleted_at'), table_name='webhookevent')
+    op.drop_table('webhookevent')
+    sa.Enum(name='webhookeventstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,34 @@
+"""Subscription period end index
+
+Revision ID: c3f7b9d1e486
+Revises: b2e6a8c0d375
+Create Date: 2026-10-17 17:20:51.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f7b9d1e486'
+down_revision: Union[str, None] = 'b2e6a8c0d375'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SWEEPABLE = "status IN ('TRIALING', 'ACTIVE', 'PAST_DUE') AND deleted_at IS NULL"
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_subscription_period_end', 'subscription', ['current_period_end'],
+        unique=False, postgresql_where=sa.text(SWEEPABLE)
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_subscription_period_end', table_name='subscription',
+        postgresql_where=sa.text(SWEEPABLE)
+    )
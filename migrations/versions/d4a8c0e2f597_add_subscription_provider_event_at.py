@@ -0,0 +1,39 @@
+"""Subscription provider event watermark
+
+Revision ID: d4a8c0e2f597
+Revises: c3f7b9d1e486
+Create Date: 2026-10-18 10:41:07.602395
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8c0e2f597'
+down_revision: Union[str, None] = 'c3f7b9d1e486'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING = sa.text("status = 'PENDING'")
+
+
+def upgrade() -> None:
+    op.add_column('subscription', sa.Column('provider_event_at', sa.DateTime(), nullable=True))
+    # Los eventos del mismo segundo se desempatan por orden de llegada (created_at)
+    op.drop_index('ix_webhookevent_pending', table_name='webhookevent', postgresql_where=PENDING)
+    op.create_index(
+        'ix_webhookevent_pending', 'webhookevent', ['occurred_at', 'created_at', 'id'],
+        unique=False, postgresql_where=PENDING
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_webhookevent_pending', table_name='webhookevent', postgresql_where=PENDING)
+    op.create_index(
+        'ix_webhookevent_pending', 'webhookevent', ['occurred_at', 'id'],
+        unique=False, postgresql_where=PENDING
+    )
+    op.drop_column('subscription', 'provider_event_at')
@@ -0,0 +1,41 @@
+"""Subscription past due since
+
+Revision ID: e5b9d1f3a608
+Revises: d4a8c0e2f597
+Create Date: 2026-10-19 09:12:44.281530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b9d1f3a608'
+down_revision: Union[str, None] = 'd4a8c0e2f597'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PAST_DUE = "status = 'PAST_DUE' AND deleted_at IS NULL"
+
+
+def upgrade() -> None:
+    op.add_column('subscription', sa.Column('past_due_since', sa.DateTime(), nullable=True))
+    # Las que ya estaban en PAST_DUE cuentan la gracia desde su última modificación
+    op.execute(
+        "UPDATE subscription SET past_due_since = COALESCE(updated_at, created_at) "
+        "WHERE status = 'PAST_DUE'"
+    )
+    op.create_index(
+        'ix_subscription_past_due_since', 'subscription', ['past_due_since'],
+        unique=False, postgresql_where=sa.text(PAST_DUE)
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_subscription_past_due_since', table_name='subscription',
+        postgresql_where=sa.text(PAST_DUE)
+    )
+    op.drop_column('subscription', 'past_due_since')
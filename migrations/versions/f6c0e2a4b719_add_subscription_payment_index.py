@@ -0,0 +1,28 @@
+"""Add subscription payment index
+
+Revision ID: f6c0e2a4b719
+Revises: e5b9d1f3a608
+Create Date: 2026-10-19 11:03:27.540862
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6c0e2a4b719'
+down_revision: Union[str, None] = 'e5b9d1f3a608'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_subscriptionpayment_subscription_created', 'subscriptionpayment',
+        ['subscription_id', 'created_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_subscriptionpayment_subscription_created', table_name='subscriptionpayment')